@@ -0,0 +1,88 @@
+"""Helpers shared by the benchmark scripts."""
+
+import argparse
+import csv
+import time
+from collections.abc import Callable, Iterable, Sized
+from pathlib import Path
+
+from lunchsync_sg.parsers.spec import NumberedRows, SpecParser
+
+FIXTURES = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def parse_args(description: str) -> argparse.Namespace:
+    """Parse the options every benchmark takes."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--rows", type=int, default=100_000, help="Rows per synthetic export")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the best is kept")
+    return parser.parse_args()
+
+
+def synthetic_export(fixture: str, header: str, rows: int, body: list[str] | None = None) -> str:
+    """
+    Build a large export by repeating the transaction rows of a fixture.
+
+    Args:
+        fixture: Fixture file name
+        header: Start of the table header line
+        rows: Number of transaction rows wanted
+        body: Rows to repeat instead of the fixture's own
+
+    Returns:
+        Export content with the fixture's header lines
+    """
+    lines = (FIXTURES / fixture).read_text(encoding="utf-8-sig").splitlines(keepends=True)
+    start = next(i for i, line in enumerate(lines) if line.startswith(header)) + 1
+    if body is None:
+        body = [line for line in lines[start:] if line.strip()]
+    repeated = (body * (rows // len(body) + 1))[:rows]
+    return "".join(lines[:start] + repeated)
+
+
+def per_line_reader(parser_class: type[SpecParser]) -> type[SpecParser]:
+    """
+    Derive a parser that builds a csv reader for every line, the old DBS reader.
+
+    A quoted field spanning lines is cut into two broken rows.
+    """
+
+    def _tokenize(self: SpecParser, lines: Iterable[str], start: int) -> NumberedRows:
+        for number, line in enumerate(lines, start):
+            line = line.removesuffix("\n")
+            try:
+                yield number, next(csv.reader([line]), [])
+            except csv.Error as e:
+                self._quarantine(number, f"Unreadable CSV: {e}", line)
+
+    return type(f"{parser_class.__name__}PerLine", (parser_class,), {"_tokenize": _tokenize})
+
+
+def comma_split(parser_class: type[SpecParser]) -> type[SpecParser]:
+    """
+    Derive a parser that splits lines on every comma, the old OCBC credit reader.
+
+    Quoted commas in merchants or amounts shift the columns after them.
+    """
+
+    def _tokenize(self: SpecParser, lines: Iterable[str], start: int) -> NumberedRows:
+        for number, line in enumerate(lines, start):
+            yield number, line.removesuffix("\n").split(",")
+
+    return type(f"{parser_class.__name__}Split", (parser_class,), {"_tokenize": _tokenize})
+
+
+def best_rate(run: Callable[[], Sized], repeat: int) -> tuple[float, int]:
+    """
+    Time a run several times.
+
+    Returns:
+        (best rows per second, rows produced)
+    """
+    best = float("inf")
+    rows = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = len(run())
+        best = min(best, time.perf_counter() - start)
+    return rows / best, rows
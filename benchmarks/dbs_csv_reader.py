@@ -0,0 +1,51 @@
+"""
+Compare the streaming csv reader with the old per-line reader on DBS exports.
+
+Builds large synthetic exports from the DBS fixtures and reports rows per
+second for both readers: tokenizing the table alone, a full parse into
+transactions and a columnar batch parse. Both must give the same output.
+
+Usage:
+    python benchmarks/dbs_csv_reader.py [--rows N] [--repeat N]
+"""
+
+import io
+
+from common import best_rate, parse_args, per_line_reader, synthetic_export
+
+from lunchsync_sg.models import Transaction
+from lunchsync_sg.parsers.dbs import DBSCreditParser, DBSSavingsParser
+from lunchsync_sg.parsers.spec import SpecParser
+
+CASES = (
+    (DBSSavingsParser, "dbs_savings.csv"),
+    (DBSCreditParser, "dbs_credit_1.csv"),
+)
+
+
+def measure(label: str, parser: SpecParser, content: str, repeat: int) -> list[Transaction]:
+    """Print the rates of one parser on one export and return its transactions."""
+    tokenize, _ = best_rate(lambda: list(parser._table_lines(io.StringIO(content))), repeat)
+    parse, rows = best_rate(lambda: parser.parse_lines(io.StringIO(content)), repeat)
+    batch, _ = best_rate(lambda: parser.parse_batch(content), repeat)
+    print(
+        f"{label:9} {rows:8} rows  tokenize {tokenize:10,.0f}/s"
+        f"  parse {parse:10,.0f}/s  batch {batch:10,.0f}/s"
+    )
+    return parser.parse(content)
+
+
+def main() -> None:
+    args = parse_args(__doc__.splitlines()[1])
+    for parser_class, fixture in CASES:
+        content = synthetic_export(fixture, '"Transaction Date', args.rows)
+        # Pending card rows are skipped, so settle them to keep every row parsed
+        content = content.replace("Pending", "Settled")
+        print(fixture)
+        per_line = measure("per-line", per_line_reader(parser_class)(), content, args.repeat)
+        streaming = measure("csv", parser_class(), content, args.repeat)
+        assert per_line == streaming, "readers disagree"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare the csv reader with the old plain comma split on OCBC credit card exports.
+
+Builds a large synthetic export from the OCBC credit fixture and reports rows
+per second for both readers: tokenizing the table alone, a full parse into
+transactions and a columnar batch parse. It then parses a small export whose
+merchants and amounts hold quoted commas, which only the csv reader reads
+correctly.
+
+Usage:
+    python benchmarks/ocbc_credit_reader.py [--rows N] [--repeat N]
+"""
+
+import io
+from decimal import Decimal
+
+from common import best_rate, comma_split, parse_args, synthetic_export
+
+from lunchsync_sg.models import Transaction
+from lunchsync_sg.parsers.ocbc import OCBCCreditParser
+from lunchsync_sg.parsers.spec import SpecParser
+
+FIXTURE = "ocbc_credit_2.csv"
+HEADER = "Transaction date,Description,Withdrawals"
+QUOTED_ROWS = [
+    '22/01/2026,"CAFE, TOWN          SINGAPORE     SGP","1,234.50",\n',
+    '19/01/2026,PAYMENT BY GIRO,,"2,000.00"\n',
+]
+
+
+def measure(label: str, parser: SpecParser, content: str, repeat: int) -> list[Transaction]:
+    """Print the rates of one parser on one export and return its transactions."""
+    tokenize, _ = best_rate(lambda: list(parser._table_lines(io.StringIO(content))), repeat)
+    parse, rows = best_rate(lambda: parser.parse_lines(io.StringIO(content)), repeat)
+    batch, _ = best_rate(lambda: parser.parse_batch(content), repeat)
+    print(
+        f"{label:9} {rows:8} rows  tokenize {tokenize:10,.0f}/s"
+        f"  parse {parse:10,.0f}/s  batch {batch:10,.0f}/s"
+    )
+    return parser.parse(content)
+
+
+def main() -> None:
+    args = parse_args(__doc__.splitlines()[1])
+    parsers = {"split": comma_split(OCBCCreditParser)(), "csv": OCBCCreditParser()}
+
+    content = synthetic_export(FIXTURE, HEADER, args.rows)
+    print(FIXTURE)
+    results = [measure(label, parser, content, args.repeat) for label, parser in parsers.items()]
+    assert results[0] == results[1], "readers disagree"
+
+    quoted = synthetic_export(FIXTURE, HEADER, len(QUOTED_ROWS), QUOTED_ROWS)
+    print("quoted commas")
+    for label, parser in parsers.items():
+        amounts = [str(tx.amount) for tx in parser.parse(quoted)]
+        failed = len(parser.diagnostics.failed)
+        print(f"{label:9} amounts {amounts}  failed rows {failed}")
+    expected = [Decimal("-1234.50"), Decimal("2000.00")]
+    assert [tx.amount for tx in parsers["csv"].parse(quoted)] == expected, "csv misread"
+
+
+if __name__ == "__main__":
+    main()
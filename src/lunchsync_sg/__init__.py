@@ -1,8 +1,8 @@
 """LunchSync SG - Convert bank exports to unified format."""
 
 from lunchsync_sg.lunchmoney import LunchMoneyClient
-from lunchsync_sg.models import Transaction
+from lunchsync_sg.models import Transaction, TransactionColumns
 from lunchsync_sg.normalizer import BankNormalizer
 
 __version__ = "0.1.0"
-__all__ = ["BankNormalizer", "LunchMoneyClient", "Transaction"]
+__all__ = ["BankNormalizer", "LunchMoneyClient", "Transaction", "TransactionColumns"]
@@ -0,0 +1,172 @@
+"""On-disk cache of spreadsheet rows converted from Excel statements."""
+
+import hashlib
+import json
+import os
+import tempfile
+from datetime import date
+from pathlib import Path
+from typing import Any
+
+from lunchsync_sg.utils import Cell
+
+# Default size budget for the cache directory
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Bump when the entry layout changes so old entries are ignored
+CACHE_VERSION = 1
+
+# Suffix of entry files, so other files in the directory (such as the
+# manifest) are never counted, evicted or cleared as entries
+ENTRY_SUFFIX = ".rows.json"
+
+
+def file_digest(filepath: Path) -> str:
+    """Return the SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _encode_cell(cell: Cell) -> Any:
+    """Convert a cell to a JSON value, tagging dates."""
+    if isinstance(cell, date):
+        return {"d": cell.isoformat()}
+    return cell
+
+
+def _decode_cell(value: Any) -> Cell:
+    """Convert a JSON value back to a cell."""
+    if isinstance(value, dict):
+        return date.fromisoformat(value["d"])
+    return value  # type: ignore[no-any-return]
+
+
+class ConversionCache:
+    """
+    Cache of typed rows for Excel files, keyed by source path.
+
+    An entry is valid while the source's size and mtime are unchanged. If
+    either changed, the content hash decides, so a touched but identical
+    file is still served from cache. Entries are evicted least recently
+    used first once the directory exceeds its size budget.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        """
+        Initialize cache.
+
+        Args:
+            cache_dir: Directory holding cache entries
+            max_bytes: Size budget for all entries together
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, filepath: Path) -> Path:
+        """Get the entry file for a source path."""
+        key = hashlib.sha256(str(filepath.resolve()).encode()).hexdigest()
+        return self.cache_dir / f"{key}{ENTRY_SUFFIX}"
+
+    def _entry_paths(self) -> list[Path]:
+        """List the entry files in the cache directory."""
+        return list(self.cache_dir.glob(f"*{ENTRY_SUFFIX}"))
+
+    def get(self, filepath: Path) -> list[list[Cell]] | None:
+        """
+        Get cached rows for a file if its content has not changed.
+
+        Args:
+            filepath: Source Excel file
+
+        Returns:
+            Cached rows, or None on a miss
+        """
+        entry_path = self._entry_path(filepath)
+        try:
+            stat = filepath.stat()
+            with open(entry_path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        try:
+            if entry["version"] != CACHE_VERSION:
+                return None
+
+            if (entry["size"], entry["mtime_ns"]) != (stat.st_size, stat.st_mtime_ns):
+                if entry["sha256"] != file_digest(filepath):
+                    entry_path.unlink(missing_ok=True)
+                    return None
+                # Same content under a new mtime: refresh the entry's stat fields
+                entry["size"], entry["mtime_ns"] = stat.st_size, stat.st_mtime_ns
+                self._write(entry_path, entry)
+            else:
+                # Mark as recently used for LRU eviction
+                os.utime(entry_path)
+
+            return [[_decode_cell(value) for value in row] for row in entry["rows"]]
+        except (OSError, KeyError, TypeError, ValueError):
+            return None
+
+    def put(self, filepath: Path, rows: list[list[Cell]]) -> None:
+        """
+        Store converted rows for a file and evict old entries if over budget.
+
+        Args:
+            filepath: Source Excel file
+            rows: Rows converted from the file
+        """
+        try:
+            stat = filepath.stat()
+            entry = {
+                "version": CACHE_VERSION,
+                "path": str(filepath.resolve()),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": file_digest(filepath),
+                "rows": [[_encode_cell(cell) for cell in row] for row in rows],
+            }
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._write(self._entry_path(filepath), entry)
+        except OSError:
+            # The cache is an optimisation; never fail a run because of it
+            return
+
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete least recently used entries until the cache fits its budget."""
+        entries: list[tuple[float, int, Path]] = []
+        try:
+            for entry_path in self._entry_paths():
+                stat = entry_path.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry_path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry_path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            entry_path.unlink(missing_ok=True)
+            total -= size
+
+    def clear(self) -> None:
+        """Delete all cache entries, leaving other files in the directory alone."""
+        for entry_path in self._entry_paths():
+            entry_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _write(entry_path: Path, entry: dict[str, Any]) -> None:
+        """Write an entry atomically so concurrent readers never see a partial file."""
+        fd, tmp_name = tempfile.mkstemp(dir=entry_path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, separators=(",", ":"))
+            os.replace(tmp_name, entry_path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
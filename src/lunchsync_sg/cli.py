@@ -6,15 +6,19 @@ import sys
 from pathlib import Path
 from typing import Any
 
+from lunchsync_sg.cache import DEFAULT_MAX_BYTES, ConversionCache
 from lunchsync_sg.config import (
     config_exists,
+    get_cache_dir,
     get_lunchmoney_account_mapping,
     get_lunchmoney_api_key,
     load_config,
 )
-from lunchsync_sg.models import Transaction
+from lunchsync_sg.manifest import MANIFEST_FILENAME, Manifest
+from lunchsync_sg.models import Transaction, TransactionColumns
 from lunchsync_sg.normalizer import BankNormalizer
 from lunchsync_sg.parsers import ParserRegistry
+from lunchsync_sg.utils import STDIN, iter_input_files
 
 
 def main() -> int:
@@ -29,6 +33,7 @@ Examples:
   lunchsync-sg ~/Downloads/ --upload-lunchmoney
   lunchsync-sg ~/Downloads/ --upload-lunchmoney --dry-run
   lunchsync-sg --list-parsers
+  gpg --decrypt dbs.csv.gpg | lunchsync-sg - -o transactions.csv
 
 Supported banks:
   - OCBC (Credit Card, 360 Account)
@@ -42,7 +47,7 @@ Supported banks:
     parser.add_argument(
         "inputs",
         nargs="*",
-        help="Input files or directories",
+        help="Input files, directories or archives ('-' reads from stdin)",
     )
     parser.add_argument(
         "-o",
@@ -71,6 +76,73 @@ Supported banks:
         action="store_true",
         help="Don't sort by date",
     )
+    parser.add_argument(
+        "-r",
+        "--recursive",
+        action="store_true",
+        help="Search input directories recursively",
+    )
+    parser.add_argument(
+        "--max-depth",
+        type=int,
+        help="Maximum directory depth to search (implies --recursive)",
+    )
+    parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Only process files matching this glob (repeatable)",
+    )
+    parser.add_argument(
+        "--exclude",
+        action="append",
+        default=[],
+        metavar="GLOB",
+        help="Skip files and directories matching this glob (repeatable)",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for parsing files (default: 1)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        metavar="SECONDS",
+        help="Abort parsing a file after this many seconds; files are then "
+        "parsed in isolated worker processes",
+    )
+    parser.add_argument(
+        "--max-memory",
+        type=int,
+        metavar="MB",
+        help="Abort parsing a file that needs more memory than this; files are "
+        "then parsed in isolated worker processes",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Directory for cached Excel conversions (default: ~/.cache/lunchsync-sg)",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=DEFAULT_MAX_BYTES // (1024 * 1024),
+        help="Maximum size of the conversion cache in MB (default: 256)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Don't cache converted Excel files or parse results between runs",
+    )
+    parser.add_argument(
+        "--full-rescan",
+        action="store_true",
+        help="Parse every input again, even if unchanged since the last run",
+    )
     parser.add_argument(
         "--config",
         type=Path,
@@ -184,42 +256,95 @@ Supported banks:
         parser.print_help()
         return 1
 
-    # Collect files
-    files: list[Path] = []
+    # Collect inputs; files under directories are discovered while parsing
+    existing: list[Path] = []
     for inp in args.inputs:
         path = Path(inp)
-        if path.is_dir():
-            for ext in [".csv", ".xls", ".xlsx"]:
-                files.extend(path.glob(f"*{ext}"))
-                files.extend(path.glob(f"*{ext.upper()}"))
-        elif path.exists():
-            files.append(path)
+        if path == STDIN or path.exists():
+            existing.append(path)
         else:
             print(f"Warning: {inp} not found", file=sys.stderr)
 
-    if not files:
-        print("Error: No valid input files found", file=sys.stderr)
-        return 1
+    if args.max_depth is not None:
+        max_depth: int | None = args.max_depth
+    else:
+        max_depth = None if args.recursive else 0
+
+    files = iter_input_files(
+        existing,
+        include=args.include,
+        exclude=args.exclude,
+        max_depth=max_depth,
+    )
 
     # Process files
+    cache = None
+    manifest = None
+    if not args.no_cache:
+        cache_dir = args.cache_dir or get_cache_dir()
+        cache = ConversionCache(cache_dir, max_bytes=args.cache_size * 1024 * 1024)
+        manifest_path = cache_dir / MANIFEST_FILENAME
+        if args.full_rescan:
+            manifest = Manifest(manifest_path, config)
+        else:
+            manifest = Manifest.load(manifest_path, config)
+
     normalizer = BankNormalizer(
         deduplicate=not args.no_dedup,
         sort_descending=not args.no_sort,
         config=config,
+        jobs=args.jobs,
+        cache=cache,
+        manifest=manifest,
+        timeout=args.timeout,
+        memory_limit=args.max_memory * 1024 * 1024 if args.max_memory else None,
     )
 
-    transactions = normalizer.process_files(files)
+    transactions: list[Transaction] = []
+    columns: TransactionColumns | None = None
+    if args.full or args.upload_lunchmoney:
+        transactions = normalizer.process_files(files)
+    else:
+        # Plain CSV output only needs four fields, so skip building transactions
+        columns = normalizer.process_columns(files)
+    found = len(transactions) if columns is None else len(columns)
+
+    if normalizer.files_processed == 0:
+        print("Error: No valid input files found", file=sys.stderr)
+        return 1
 
     # Report results
     if args.verbose:
+        for duplicate, original in normalizer.duplicate_files:
+            print(f"Skipped {duplicate.name}: identical to {original.name}", file=sys.stderr)
         for filepath, error in normalizer.errors:
-            print(f"Warning: {filepath.name}: {error}", file=sys.stderr)
-
-    print(f"Processed {len(files)} files", file=sys.stderr)
-    print(f"Found {len(transactions)} transactions", file=sys.stderr)
+            # Archive members are reported as archive!member
+            archive, sep, member = str(filepath).partition("!")
+            print(f"Warning: {Path(archive).name}{sep}{member}: {error}", file=sys.stderr)
+        for filepath, parser_name, others in normalizer.ambiguous_files:
+            print(
+                f"Warning: {filepath.name}: parsed with {parser_name}, but "
+                f"{', '.join(others)} matched as well",
+                file=sys.stderr,
+            )
+        for filepath, row_error in normalizer.failed_rows:
+            print(f"Warning: {filepath.name}:{row_error.line}: {row_error.error}", file=sys.stderr)
+        if normalizer.rows_skipped:
+            reasons = ", ".join(f"{n} {r}" for r, n in sorted(normalizer.rows_skipped.items()))
+            print(f"Read {normalizer.rows_seen} rows, skipped {reasons}", file=sys.stderr)
+
+    print(f"Processed {normalizer.files_processed} files", file=sys.stderr)
+    if normalizer.files_unchanged > 0:
+        print(f"Reused {normalizer.files_unchanged} unchanged files", file=sys.stderr)
+    if normalizer.duplicate_files:
+        print(f"Collapsed {len(normalizer.duplicate_files)} identical input files",
+              file=sys.stderr)
+    print(f"Found {found} transactions", file=sys.stderr)
     if normalizer.pending_skipped > 0:
         print(f"Skipped {normalizer.pending_skipped} pending transactions", file=sys.stderr)
 
+    if normalizer.failed_rows:
+        print(f"Quarantined {len(normalizer.failed_rows)} unreadable rows", file=sys.stderr)
     if normalizer.errors:
         print(f"Errors: {len(normalizer.errors)} files failed", file=sys.stderr)
 
@@ -319,12 +444,14 @@ Supported banks:
     output_path = Path(args.output)
     delimiter = "\t" if args.format == "tsv" else ","
 
-    if args.full:
+    if columns is not None:
+        normalizer.write_columns(columns, output_path, delimiter)
+    elif args.full:
         normalizer.write_full_csv(transactions, output_path, delimiter)
     else:
         normalizer.write_csv(transactions, output_path, delimiter)
 
-    print(f"Wrote {len(transactions)} transactions to {output_path}", file=sys.stderr)
+    print(f"Wrote {found} transactions to {output_path}", file=sys.stderr)
 
     return 0
 
@@ -17,6 +17,12 @@ def get_config_dir() -> Path:
     return Path(xdg_config_home) / "lunchsync-sg"
 
 
+def get_cache_dir() -> Path:
+    """Get the cache directory path (XDG compliant)."""
+    xdg_cache_home = os.getenv("XDG_CACHE_HOME", str(Path.home() / ".cache"))
+    return Path(xdg_cache_home) / "lunchsync-sg"
+
+
 def get_config_path() -> Path:
     """Get the default config file path."""
     return get_config_dir() / CONFIG_FILENAME
@@ -0,0 +1,243 @@
+"""Running parses in isolated worker processes with a time and memory budget."""
+
+import multiprocessing
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Executor, Future
+from contextlib import suppress
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from multiprocessing.process import BaseProcess
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from multiprocessing.context import ForkServerContext, SpawnContext
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None  # type: ignore[assignment]
+
+
+@dataclass
+class _Running:
+    """A call in progress in its own worker process."""
+
+    future: Future[Any]
+    process: BaseProcess
+    deadline: float | None
+
+
+def _limit_memory(limit: int) -> None:
+    """Cap the address space of the current process."""
+    assert resource is not None
+    _, hard = resource.getrlimit(resource.RLIMIT_AS)
+    if hard != resource.RLIM_INFINITY:
+        limit = min(limit, hard)
+    resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _work(
+    conn: Connection,
+    memory_limit: int | None,
+    fn: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> None:
+    """Run one call in a worker process and send back its result or exception."""
+    if memory_limit is not None:
+        _limit_memory(memory_limit)
+    try:
+        message: tuple[bool, Any] = (True, fn(*args, **kwargs))
+    except MemoryError:
+        message = (False, MemoryError(f"Exceeded the memory budget of {memory_limit} bytes"))
+    except BaseException as e:
+        message = (False, e)
+    try:
+        conn.send(message)
+    except Exception as e:
+        # The result or exception could not be pickled
+        conn.send((False, RuntimeError(f"Could not return result from worker: {e}")))
+    finally:
+        conn.close()
+
+
+def _context() -> "ForkServerContext | SpawnContext":
+    """Get a start method that is safe from a threaded parent and cheap per worker."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["lunchsync_sg.normalizer"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+class IsolatedExecutor(Executor):
+    """
+    Executor running every call in a fresh worker process within a budget.
+
+    Unlike a process pool, a call that overruns its timeout is killed with
+    its worker, and the memory limit caps the worker's address space, so a
+    pathological input costs at most its budget and cannot take other
+    calls down with it. Calls over budget fail with TimeoutError or
+    MemoryError; a worker that dies fails its call with RuntimeError.
+
+        with IsolatedExecutor(max_workers=4, timeout=30) as executor:
+            future = executor.submit(parse_input, path)
+            outcomes = future.result()
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 1,
+        timeout: float | None = None,
+        memory_limit: int | None = None,
+    ) -> None:
+        """
+        Initialize the executor; workers are started as calls are submitted.
+
+        Args:
+            max_workers: Number of calls run at the same time
+            timeout: Wall-clock seconds each call may run, or None for no limit
+            memory_limit: Bytes of address space each worker may use, or None
+
+        Raises:
+            ValueError: If a memory limit is given where it cannot be enforced
+        """
+        if memory_limit is not None and resource is None:
+            raise ValueError("Memory limits need the resource module, which this platform lacks")
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.memory_limit = memory_limit
+        self._context = _context()
+        self._queue: deque[tuple[Future[Any], Callable[..., Any], tuple[Any, ...], dict[str, Any]]]
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._wakeup_reader, self._wakeup_writer = multiprocessing.Pipe(duplex=False)
+        self._thread: threading.Thread | None = None
+        self._shutdown = False
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future[Any]:
+        """
+        Schedule a call in its own worker process.
+
+        The function and its arguments must be picklable.
+
+        Args:
+            fn: Module-level function to call
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+
+        Returns:
+            Future for the call's result
+        """
+        future: Future[Any] = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self._queue.append((future, fn, args, kwargs))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._manage, daemon=True)
+                self._thread.start()
+        self._wakeup_writer.send_bytes(b"")
+        return future
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        """
+        Stop accepting calls, then let the submitted ones finish.
+
+        Args:
+            wait: Block until every call has finished
+            cancel_futures: Cancel calls that have not started yet
+        """
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while self._queue:
+                    self._queue.popleft()[0].cancel()
+            thread = self._thread
+        # The manager closes its end once it has finished
+        with suppress(OSError):
+            self._wakeup_writer.send_bytes(b"")
+        if wait and thread is not None:
+            thread.join()
+
+    def _start(
+        self,
+        future: Future[Any],
+        fn: Callable[..., Any],
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+    ) -> tuple[Connection, _Running]:
+        """Start a worker process for one call."""
+        reader, writer = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_work, args=(writer, self.memory_limit, fn, args, kwargs), daemon=True
+        )
+        process.start()
+        writer.close()
+        deadline = None if self.timeout is None else time.monotonic() + self.timeout
+        return reader, _Running(future, process, deadline)
+
+    def _manage(self) -> None:
+        """Start queued calls as workers free up, and collect or kill them."""
+        running: dict[Connection, _Running] = {}
+        while True:
+            with self._lock:
+                while self._queue and len(running) < self.max_workers:
+                    future, fn, args, kwargs = self._queue.popleft()
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        reader, call = self._start(future, fn, args, kwargs)
+                    except Exception as e:
+                        # e.g. arguments that cannot be pickled
+                        future.set_exception(e)
+                        continue
+                    running[reader] = call
+                if not running and not self._queue and self._shutdown:
+                    break
+
+            deadlines = [c.deadline for c in running.values() if c.deadline is not None]
+            timeout = max(0.0, min(deadlines) - time.monotonic()) if deadlines else None
+            ready = wait([self._wakeup_reader, *running], timeout)
+
+            for conn in ready:
+                if conn is self._wakeup_reader:
+                    self._wakeup_reader.recv_bytes()
+                    continue
+                assert isinstance(conn, Connection)
+                self._finish(conn, running.pop(conn))
+
+            now = time.monotonic()
+            for conn, call in list(running.items()):
+                if call.deadline is not None and call.deadline <= now:
+                    del running[conn]
+                    call.process.kill()
+                    call.process.join()
+                    conn.close()
+                    call.future.set_exception(
+                        TimeoutError(f"Parse timed out after {self.timeout:g}s")
+                    )
+
+        self._wakeup_reader.close()
+
+    def _finish(self, conn: Connection, call: _Running) -> None:
+        """Hand a finished worker's result or exception to its future."""
+        try:
+            ok, value = conn.recv()
+        except (EOFError, OSError):
+            call.process.join()
+            code = call.process.exitcode
+            call.future.set_exception(
+                RuntimeError(f"Worker exited unexpectedly (exit code {code})")
+            )
+        else:
+            call.process.join()
+            if ok:
+                call.future.set_result(value)
+            else:
+                call.future.set_exception(value)
+        finally:
+            conn.close()
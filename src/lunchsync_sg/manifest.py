@@ -0,0 +1,320 @@
+"""Manifest of previously parsed inputs, used to skip unchanged files."""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from datetime import date
+from decimal import Decimal
+from functools import cache
+from importlib.metadata import entry_points
+from pathlib import Path
+from typing import Any
+
+from lunchsync_sg.cache import file_digest
+from lunchsync_sg.models import Transaction, TransactionColumns
+from lunchsync_sg.parsers.base import ParserRegistry, RowDiagnostics
+
+# Default manifest filename inside the cache directory
+MANIFEST_FILENAME = "manifest.json"
+
+# Bump when the entry layout or parser output changes so old manifests are ignored
+MANIFEST_VERSION = 3
+
+# Errors from decoding a damaged or hand-edited entry
+_DECODE_ERRORS = (ValueError, KeyError, TypeError, IndexError, ArithmeticError)
+
+
+def config_digest(config: dict[str, Any] | None) -> str:
+    """Return a digest of the config, which decides account names in parser output."""
+    return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()
+
+
+@cache
+def parser_digest() -> str:
+    """
+    Return a digest of the code that decides parser output.
+
+    Covers the source of this package and the installed parser plugins, so
+    files recorded before a parser changed are parsed again.
+    """
+    digest = hashlib.sha256()
+    package = Path(__file__).parent
+    for source in sorted(package.rglob("*.py")):
+        digest.update(source.relative_to(package).as_posix().encode())
+        digest.update(source.read_bytes())
+    for entry_point in sorted(
+        entry_points(group=ParserRegistry.PLUGIN_GROUP), key=lambda ep: ep.name
+    ):
+        dist = entry_point.dist
+        version = f"{dist.name} {dist.version}" if dist is not None else ""
+        digest.update(f"{entry_point.name}={entry_point.value} {version}".encode())
+    return digest.hexdigest()
+
+
+def _encode_columns(columns: TransactionColumns) -> dict[str, Any]:
+    """Convert columns to compact JSON lists; account names are stored once."""
+    names: dict[str, int] = {}
+    return {
+        "dates": [d.isoformat() for d in columns.dates],
+        "descriptions": columns.descriptions,
+        "amounts": [str(amount) for amount in columns.amounts],
+        "account_index": [names.setdefault(name, len(names)) for name in columns.accounts],
+        "account_names": list(names),
+    }
+
+
+def _decode_columns(data: dict[str, Any]) -> TransactionColumns:
+    """Convert JSON lists back to columns."""
+    names = data["account_names"]
+    columns = TransactionColumns(
+        dates=[date.fromisoformat(d) for d in data["dates"]],
+        descriptions=[str(desc) for desc in data["descriptions"]],
+        amounts=[Decimal(amount) for amount in data["amounts"]],
+        accounts=[names[i] for i in data["account_index"]],
+    )
+    if not len(columns) == len(columns.descriptions) == len(columns.amounts) == len(
+        columns.accounts
+    ):
+        raise ValueError("Columns differ in length")
+    return columns
+
+
+@dataclass
+class ManifestEntry:
+    """
+    Fingerprint and parse result of one input file.
+
+    Only the fields of plain CSV output are kept, as columns, along with
+    the row counts of the parse. Files with quarantined rows are never
+    recorded, so there are no row errors to keep.
+    """
+
+    size: int
+    mtime_ns: int
+    sha256: str
+    parser: str
+    columns: TransactionColumns = field(default_factory=TransactionColumns)
+    pending_skipped: int = 0
+    diagnostics: RowDiagnostics = field(default_factory=RowDiagnostics)
+
+    @property
+    def transactions(self) -> list[Transaction]:
+        """Get the file's transactions, built from the columns."""
+        return self.columns.to_transactions()
+
+    @property
+    def accounts(self) -> list[str]:
+        """Get the accounts the file's transactions resolved to."""
+        return sorted(set(self.columns.accounts))
+
+
+def _encode_entry(entry: ManifestEntry) -> dict[str, Any]:
+    """Convert an entry to a JSON object."""
+    return {
+        "size": entry.size,
+        "mtime_ns": entry.mtime_ns,
+        "sha256": entry.sha256,
+        "parser": entry.parser,
+        "pending_skipped": entry.pending_skipped,
+        "rows_seen": entry.diagnostics.rows_seen,
+        "skipped": entry.diagnostics.skipped,
+        "columns": _encode_columns(entry.columns),
+    }
+
+
+def _decode_entry(data: dict[str, Any]) -> ManifestEntry:
+    """Convert a JSON object back to an entry."""
+    return ManifestEntry(
+        size=data["size"],
+        mtime_ns=data["mtime_ns"],
+        sha256=data["sha256"],
+        parser=data["parser"],
+        columns=_decode_columns(data["columns"]),
+        pending_skipped=data["pending_skipped"],
+        diagnostics=RowDiagnostics(
+            rows_seen=int(data["rows_seen"]),
+            skipped={str(reason): int(count) for reason, count in data["skipped"].items()},
+        ),
+    )
+
+
+class Manifest:
+    """
+    Record of inputs parsed by earlier runs, keyed by resolved path.
+
+    A file is unchanged while its size and mtime match its entry. If either
+    changed, the content hash decides, so a touched but identical file is
+    still reused. Entries recorded under a different config or by
+    different parser code (see parser_digest) are ignored.
+
+    Loaded entries are decoded only when looked up, and the file is only
+    rewritten when an entry was added, changed or dropped, so a run costs
+    little beyond its new inputs.
+    """
+
+    def __init__(self, path: Path, config: dict[str, Any] | None = None) -> None:
+        """
+        Initialize an empty manifest.
+
+        Args:
+            path: File the manifest is saved to
+            config: Loaded JSON config the entries are valid for
+        """
+        self.path = path
+        self.config_digest = config_digest(config)
+        self.parser_digest = parser_digest()
+        self._entries: dict[str, ManifestEntry] = {}
+        # Entries as loaded from the file, until they are looked up
+        self._stored: dict[str, dict[str, Any]] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path, config: dict[str, Any] | None = None) -> "Manifest":
+        """
+        Load a manifest, starting empty if it is missing, unreadable or stale.
+
+        Args:
+            path: Manifest file
+            config: Loaded JSON config for this run
+
+        Returns:
+            Manifest holding the entries still valid for config
+        """
+        manifest = cls(path, config)
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+            if (
+                data["version"] != MANIFEST_VERSION
+                or data["config_digest"] != manifest.config_digest
+                or data["parser_digest"] != manifest.parser_digest
+            ):
+                return manifest
+            files = data["files"]
+            if not isinstance(files, dict):
+                raise TypeError("files is not an object")
+            manifest._stored = files
+        except (OSError, ValueError, KeyError, TypeError):
+            manifest._stored = {}
+        return manifest
+
+    def __len__(self) -> int:
+        """Get the number of recorded files."""
+        return len(self._entries) + len(self._stored)
+
+    @staticmethod
+    def _key(filepath: Path) -> str:
+        """Get the manifest key for a path."""
+        return str(filepath.resolve())
+
+    def lookup(self, filepath: Path) -> ManifestEntry | None:
+        """
+        Get the recorded entry for a file if the file has not changed.
+
+        Args:
+            filepath: Input file
+
+        Returns:
+            Entry from an earlier run, or None if the file is new or changed
+        """
+        key = self._key(filepath)
+        entry = self._entries.get(key)
+        if entry is None:
+            stored = self._stored.pop(key, None)
+            if stored is None:
+                return None
+            try:
+                entry = _decode_entry(stored)
+            except _DECODE_ERRORS:
+                self._dirty = True
+                return None
+            self._entries[key] = entry
+
+        try:
+            stat = filepath.stat()
+            if (entry.size, entry.mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+                if entry.sha256 != file_digest(filepath):
+                    del self._entries[key]
+                    self._dirty = True
+                    return None
+                entry.size, entry.mtime_ns = stat.st_size, stat.st_mtime_ns
+                self._dirty = True
+        except OSError:
+            return None
+        return entry
+
+    def record(
+        self,
+        filepath: Path,
+        parser: str,
+        columns: TransactionColumns,
+        pending_skipped: int = 0,
+        diagnostics: RowDiagnostics | None = None,
+    ) -> None:
+        """
+        Record a successful parse of a file.
+
+        Args:
+            filepath: Input file
+            parser: Name of the parser class that handled it
+            columns: Transactions parsed from it
+            pending_skipped: Pending transactions skipped while parsing it
+            diagnostics: Rows seen and skipped while parsing it
+        """
+        try:
+            stat = filepath.stat()
+            digest = file_digest(filepath)
+        except OSError:
+            return
+        key = self._key(filepath)
+        self._stored.pop(key, None)
+        self._entries[key] = ManifestEntry(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256=digest,
+            parser=parser,
+            columns=columns,
+            pending_skipped=pending_skipped,
+            diagnostics=diagnostics or RowDiagnostics(),
+        )
+        self._dirty = True
+
+    def save(self) -> None:
+        """
+        Write the manifest atomically, dropping entries for deleted files.
+
+        Nothing is written if no entry changed since it was loaded.
+        """
+        for entries in (self._entries, self._stored):
+            for key in [key for key in entries if not os.path.exists(key)]:
+                del entries[key]
+                self._dirty = True
+        if not self._dirty:
+            return
+
+        # Entries never looked up are written back exactly as they were read
+        files = dict(self._stored)
+        files.update((key, _encode_entry(entry)) for key, entry in self._entries.items())
+        data = {
+            "version": MANIFEST_VERSION,
+            "config_digest": self.config_digest,
+            "parser_digest": self.parser_digest,
+            "files": files,
+        }
+
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        except OSError:
+            # The manifest is an optimisation; never fail a run because of it
+            return
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, separators=(",", ":"))
+            os.replace(tmp_name, self.path)
+        except OSError:
+            Path(tmp_name).unlink(missing_ok=True)
+            return
+        self._dirty = False
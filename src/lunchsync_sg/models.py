@@ -1,10 +1,14 @@
 """Data models for bank transactions."""
 
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass, field
 from datetime import date
 from decimal import Decimal
 from typing import Any
 
+# Description given to transactions whose description is blank
+NO_DESCRIPTION = "(No description)"
+
 
 @dataclass(frozen=True)
 class Transaction:
@@ -23,7 +27,17 @@ class Transaction:
     def __post_init__(self) -> None:
         """Validate transaction data."""
         if not self.description.strip():
-            object.__setattr__(self, "description", "(No description)")
+            object.__setattr__(self, "description", NO_DESCRIPTION)
+
+    @property
+    def has_extras(self) -> bool:
+        """Check whether fields beyond those of plain CSV output are set."""
+        return (
+            self.original_currency != "SGD"
+            or self.original_amount is not None
+            or self.category is not None
+            or self.reference is not None
+        )
 
     @property
     def is_expense(self) -> bool:
@@ -49,6 +63,62 @@ class Transaction:
         }
 
 
+@dataclass
+class TransactionColumns:
+    """
+    Transactions stored as parallel columns.
+
+    Holds only the fields of plain CSV output, so bulk parses can fill it
+    without building a Transaction and its raw_data per row. Producers
+    apply Transaction's rule for blank descriptions.
+    """
+
+    dates: list[date] = field(default_factory=list)
+    descriptions: list[str] = field(default_factory=list)
+    amounts: list[Decimal] = field(default_factory=list)
+    accounts: list[str] = field(default_factory=list)
+
+    def __len__(self) -> int:
+        """Return the number of transactions."""
+        return len(self.dates)
+
+    @classmethod
+    def from_transactions(cls, transactions: Iterable[Transaction]) -> "TransactionColumns":
+        """Split transactions into columns."""
+        columns = cls()
+        for tx in transactions:
+            columns.dates.append(tx.date)
+            columns.descriptions.append(tx.description)
+            columns.amounts.append(tx.amount)
+            columns.accounts.append(tx.account)
+        return columns
+
+    def to_transactions(self) -> list[Transaction]:
+        """Build a Transaction per row (without raw_data)."""
+        return [
+            Transaction(date=d, description=desc, amount=amount, account=account)
+            for d, desc, amount, account in zip(
+                self.dates, self.descriptions, self.amounts, self.accounts, strict=True
+            )
+        ]
+
+    def extend(self, other: "TransactionColumns") -> None:
+        """Append the rows of another set of columns."""
+        self.dates.extend(other.dates)
+        self.descriptions.extend(other.descriptions)
+        self.amounts.extend(other.amounts)
+        self.accounts.extend(other.accounts)
+
+    def take(self, indexes: Sequence[int]) -> "TransactionColumns":
+        """Get the given rows, in the given order."""
+        return TransactionColumns(
+            dates=[self.dates[i] for i in indexes],
+            descriptions=[self.descriptions[i] for i in indexes],
+            amounts=[self.amounts[i] for i in indexes],
+            accounts=[self.accounts[i] for i in indexes],
+        )
+
+
 @dataclass
 class AccountMapping:
     """Maps account identifiers to friendly names."""
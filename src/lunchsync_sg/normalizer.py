@@ -1,13 +1,424 @@
 """Main normalizer class that orchestrates parsing."""
 
 import csv
+import sys
+from collections.abc import Iterable, Iterator, Sequence
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
 from datetime import date
+from functools import partial
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any
+from typing import IO, Any
+
+from lunchsync_sg.cache import ConversionCache, file_digest
+from lunchsync_sg.isolation import IsolatedExecutor
+from lunchsync_sg.manifest import Manifest
+from lunchsync_sg.models import Transaction, TransactionColumns
+from lunchsync_sg.parsers.base import (
+    BankParser,
+    ParseResult,
+    ParserRegistry,
+    ParseStream,
+    RowDiagnostics,
+    RowError,
+    collect,
+    failed,
+)
+from lunchsync_sg.utils import (
+    DECOMPRESSION_ERRORS,
+    INPUT_EXTENSIONS,
+    STATEMENT_EXTENSIONS,
+    STDIN,
+    Cell,
+    FileContent,
+    MappedFile,
+    TextStream,
+    XlsxReader,
+    compression_kind,
+    head_lines,
+    is_archive,
+    is_excel,
+    is_xlsx,
+    iter_archive,
+    iter_input_files,
+    load_bytes,
+    load_file,
+    member_path,
+    open_input,
+    rows_to_text,
+)
+
+# Text exports at least this large are streamed from a memory map
+MMAP_THRESHOLD = 8 * 1024 * 1024
+
+
+# Named outcomes of one input path; an archive has one per export inside it
+Outcomes = list[tuple[Path, ParseResult]]
+
+
+def iter_input(
+    filepath: Path,
+    config: dict[str, Any] | None = None,
+    cache: ConversionCache | None = None,
+    columnar: bool = False,
+) -> Iterator[tuple[Path, ParseStream]]:
+    """
+    Yield a parse stream for each export in an input path.
+
+    Archives yield one stream per member, named "archive!member"; other
+    files yield a single stream. Each stream must be consumed before the
+    next is requested.
+
+    Args:
+        filepath: Path to the file or archive
+        config: Loaded JSON config for account mappings
+        cache: Optional cache of converted .xls rows
+        columnar: Parse with the parsers' batch API; the streams then yield
+            nothing and return the rows in ParseResult.columns
+
+    Yields:
+        Tuples of (name, parse stream)
+    """
+    if not is_archive(filepath):
+        yield filepath, iter_file(filepath, config, cache, columnar)
+        return
+
+    found = False
+    try:
+        for member, data in iter_archive(filepath, STATEMENT_EXTENSIONS):
+            found = True
+            name = member_path(filepath, member)
+            yield name, _iter_bytes(data, name, config, columnar)
+    except ValueError as e:
+        yield filepath, failed(str(e))
+        return
+
+    if not found:
+        yield filepath, failed("No bank exports found in archive")
+
+
+def parse_input(
+    filepath: Path,
+    config: dict[str, Any] | None = None,
+    cache: ConversionCache | None = None,
+    columnar: bool = False,
+) -> Outcomes:
+    """
+    Parse an input path, which may be an archive holding several exports.
+
+    Runs as a module-level function so it can be shipped to worker processes.
+
+    Args:
+        filepath: Path to the file or archive
+        config: Loaded JSON config for account mappings
+        cache: Optional cache of converted .xls rows
+        columnar: Return the rows of successful parses in
+            ParseResult.columns instead of transactions
+
+    Returns:
+        (name, outcome) for each export; archive members are named
+        "archive!member"
+    """
+    return [
+        (name, collect(parsed))
+        for name, parsed in iter_input(filepath, config, cache, columnar)
+    ]
+
+
+def parse_bytes(
+    data: bytes, filepath: Path, config: dict[str, Any] | None = None
+) -> ParseResult:
+    """
+    Detect and parse file content already read into memory.
+
+    Args:
+        data: Raw file bytes
+        filepath: Name of the file, used for detection and error messages
+        config: Loaded JSON config for account mappings
+
+    Returns:
+        ParseResult with transactions or the error that stopped the file
+    """
+    return collect(_iter_bytes(data, filepath, config))
+
+
+def _iter_bytes(
+    data: bytes, filepath: Path, config: dict[str, Any] | None, columnar: bool = False
+) -> ParseStream:
+    """Stream the transactions of file content already read into memory."""
+    try:
+        content = load_bytes(data, filepath)
+    except ValueError as e:
+        return ParseResult(error=str(e))
+    return (yield from _iter_content(content, filepath, config, columnar))
+
+
+def parse_stream(
+    stream: IO[bytes],
+    name: Path = Path("<stdin>"),
+    config: dict[str, Any] | None = None,
+) -> ParseResult:
+    """
+    Detect and parse an export read incrementally from a binary stream.
+
+    The bank is detected from the leading lines and the rest is streamed
+    through the parser line by line. Spreadsheets need random access, so
+    they are read whole before parsing.
+
+    Args:
+        stream: Binary stream such as sys.stdin.buffer
+        name: Name used for detection and error messages
+        config: Loaded JSON config for account mappings
+
+    Returns:
+        ParseResult with transactions or the error that stopped the stream
+    """
+    return collect(iter_stream(stream, name, config))
+
+
+def iter_stream(
+    stream: IO[bytes],
+    name: Path = Path("<stdin>"),
+    config: dict[str, Any] | None = None,
+    columnar: bool = False,
+) -> ParseStream:
+    """
+    Stream the transactions of an export read from a binary stream.
+
+    Args:
+        stream: Binary stream such as sys.stdin.buffer
+        name: Name used for detection and error messages
+        config: Loaded JSON config for account mappings
+        columnar: Parse into ParseResult.columns instead (see iter_input)
+
+    Yields:
+        Transactions as they are parsed
+
+    Returns:
+        ParseResult with the parser, account and pending count, or the error
+    """
+    text_stream = TextStream(stream, name)
+    if text_stream.excel_kind is not None:
+        return (yield from _iter_bytes(text_stream.read_bytes(), name, config, columnar))
+
+    try:
+        header = text_stream.head(ParserRegistry.max_header_lines())
+    except ValueError as e:
+        return ParseResult(error=str(e))
+
+    parser = ParserRegistry.get_parser(header, name, config=config)
+    if parser is None:
+        return ParseResult(error="No parser found for this file format")
+
+    return (yield from _parse_lines(parser, text_stream.iter_lines(), columnar))
+
+
+def parse_file(
+    filepath: Path,
+    config: dict[str, Any] | None = None,
+    cache: ConversionCache | None = None,
+) -> ParseResult:
+    """
+    Read, detect and parse one file.
 
-from lunchsync_sg.models import Transaction
-from lunchsync_sg.parsers.base import ParserRegistry
-from lunchsync_sg.utils import read_file
+    Runs as a module-level function so it can be shipped to worker processes.
+
+    Args:
+        filepath: Path to the file
+        config: Loaded JSON config for account mappings
+        cache: Optional cache of converted .xls rows
+
+    Returns:
+        ParseResult with transactions or the error that stopped the file
+    """
+    return collect(iter_file(filepath, config, cache))
+
+
+def iter_file(
+    filepath: Path,
+    config: dict[str, Any] | None = None,
+    cache: ConversionCache | None = None,
+    columnar: bool = False,
+) -> ParseStream:
+    """
+    Read, detect and parse one file, yielding transactions as they are parsed.
+
+    Large, compressed and .xlsx files are streamed, so memory stays bounded
+    by the row being parsed. Transactions yielded before a parse error are
+    not retracted; the error is reported in the return value.
+
+    Args:
+        filepath: Path to the file
+        config: Loaded JSON config for account mappings
+        cache: Optional cache of converted .xls rows
+        columnar: Parse into ParseResult.columns instead (see iter_input)
+
+    Yields:
+        Transactions as they are parsed
+
+    Returns:
+        ParseResult with the parser, account and pending count, or the error
+    """
+    if compression_kind(filepath) is not None:
+        return (yield from _iter_compressed(filepath, config, columnar))
+    if _is_large_text(filepath):
+        return (yield from _iter_mapped(filepath, config, columnar))
+    if is_xlsx(filepath):
+        return (yield from _iter_xlsx(filepath, config, columnar))
+
+    try:
+        content = load_file(filepath, cache=cache)
+    except ValueError as e:
+        return ParseResult(error=str(e))
+    return (yield from _iter_content(content, filepath, config, columnar))
+
+
+def _parse_text(parser: BankParser, text: str, columnar: bool) -> ParseStream:
+    """Parse whole file content as a stream or, if columnar, in one batch."""
+    if columnar:
+        return parser.batch_result(partial(parser.parse_batch, text))
+    return (yield from parser.iter_result(parser.iter_parse(text)))
+
+
+def _parse_lines(parser: BankParser, lines: Iterable[str], columnar: bool) -> ParseStream:
+    """Parse text lines as a stream or, if columnar, in one batch."""
+    if columnar:
+        return parser.batch_result(partial(parser.parse_batch_lines, lines))
+    return (yield from parser.iter_result(parser.iter_parse_lines(lines)))
+
+
+def _parse_rows(
+    parser: BankParser, rows: Iterable[Sequence[Cell]], columnar: bool
+) -> ParseStream:
+    """Parse spreadsheet rows as a stream or, if columnar, in one batch."""
+    if columnar:
+        return parser.batch_result(partial(parser.parse_batch_rows, rows))
+    return (yield from parser.iter_result(parser.iter_parse_rows(rows)))
+
+
+def _iter_content(
+    content: FileContent, filepath: Path, config: dict[str, Any] | None, columnar: bool = False
+) -> ParseStream:
+    """Detect and parse content that has been loaded whole."""
+    header = content.head(ParserRegistry.max_header_lines())
+    parser = ParserRegistry.get_parser(header, filepath, config=config)
+    if parser is None:
+        return ParseResult(error="No parser found for this file format")
+
+    if content.rows is not None:
+        return (yield from _parse_rows(parser, content.rows, columnar))
+    return (yield from _parse_text(parser, content.text, columnar))
+
+
+def _iter_compressed(
+    filepath: Path, config: dict[str, Any] | None, columnar: bool = False
+) -> ParseStream:
+    """Detect and parse a compressed export while decompressing it as a stream."""
+    try:
+        with open_input(filepath) as stream:
+            return (yield from iter_stream(stream, filepath, config, columnar))
+    except ValueError as e:
+        return ParseResult(error=str(e))
+    except DECOMPRESSION_ERRORS as e:
+        return ParseResult(error=f"Could not read file {filepath}: {e}")
+
+
+def _is_large_text(filepath: Path) -> bool:
+    """Check whether a file should be read through a memory map."""
+    try:
+        size = filepath.stat().st_size
+    except OSError:
+        return False
+    return size >= MMAP_THRESHOLD and not is_excel(filepath)
+
+
+def _iter_mapped(
+    filepath: Path, config: dict[str, Any] | None, columnar: bool = False
+) -> ParseStream:
+    """Detect and parse a large text export line by line from a memory map."""
+    try:
+        mapped = MappedFile(filepath)
+    except ValueError as e:
+        return ParseResult(error=str(e))
+
+    with mapped:
+        header = mapped.head(ParserRegistry.max_header_lines())
+        parser = ParserRegistry.get_parser(header, filepath, config=config)
+        if parser is None:
+            return ParseResult(error="No parser found for this file format")
+
+        return (yield from _parse_lines(parser, mapped.iter_lines(), columnar))
+
+
+def _iter_xlsx(
+    filepath: Path, config: dict[str, Any] | None, columnar: bool = False
+) -> ParseStream:
+    """Detect and parse an .xlsx workbook while streaming its rows."""
+    try:
+        reader = XlsxReader(filepath)
+    except ValueError as e:
+        return ParseResult(error=str(e))
+
+    with reader:
+        max_lines = ParserRegistry.max_header_lines()
+        try:
+            header = head_lines(rows_to_text(reader.head_rows(max_lines)), max_lines)
+        except ValueError as e:
+            return ParseResult(error=str(e))
+
+        parser = ParserRegistry.get_parser(header, filepath, config=config)
+        if parser is None:
+            return ParseResult(error="No parser found for this file format")
+
+        return (yield from _parse_rows(parser, reader.iter_rows(), columnar))
+
+
+class _IdenticalFiles:
+    """
+    Spot inputs that are byte-identical to one seen earlier in a run.
+
+    Files are only hashed once another input has the same size, so distinct
+    statements are never read an extra time.
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no inputs seen."""
+        self._by_size: dict[int, list[Path]] = {}
+        self._digests: dict[Path, str | None] = {}
+
+    def _digest(self, filepath: Path) -> str | None:
+        """Hash a file once, or None if it cannot be read."""
+        if filepath not in self._digests:
+            try:
+                self._digests[filepath] = file_digest(filepath)
+            except OSError:
+                self._digests[filepath] = None
+        return self._digests[filepath]
+
+    def original_of(self, filepath: Path) -> Path | None:
+        """
+        Register an input and find an earlier identical one.
+
+        Args:
+            filepath: Input file
+
+        Returns:
+            Earlier input with the same content, or None if this one is new
+        """
+        try:
+            size = filepath.stat().st_size
+        except OSError:
+            return None
+
+        same_size = self._by_size.setdefault(size, [])
+        if same_size:
+            digest = self._digest(filepath)
+            if digest is not None:
+                for earlier in same_size:
+                    if self._digest(earlier) == digest:
+                        return earlier
+        same_size.append(filepath)
+        return None
 
 
 class BankNormalizer:
@@ -25,6 +436,11 @@ class BankNormalizer:
         deduplicate: bool = True,
         sort_descending: bool = True,
         config: dict[str, Any] | None = None,
+        jobs: int = 1,
+        cache: ConversionCache | None = None,
+        manifest: Manifest | None = None,
+        timeout: float | None = None,
+        memory_limit: int | None = None,
     ) -> None:
         """
         Initialize normalizer.
@@ -33,12 +449,43 @@ class BankNormalizer:
             deduplicate: Remove duplicate transactions
             sort_descending: Sort by date descending (newest first)
             config: Loaded JSON config for account mappings
+            jobs: Number of worker processes for process_files (1 = serial)
+            cache: Optional on-disk cache of converted .xls rows
+            manifest: Optional manifest of earlier runs; unchanged files are
+                served from it instead of being parsed again
+            timeout: Seconds each input may take to parse. With a timeout or
+                memory_limit, every input is parsed in its own worker
+                process, which is killed if it overruns; the input is then
+                reported in errors and the run carries on
+            memory_limit: Bytes of address space each parse worker may use
         """
         self.deduplicate = deduplicate
         self.sort_descending = sort_descending
         self.config = config
+        self.jobs = max(1, jobs)
+        self.cache = cache
+        self.manifest = manifest
+        self.timeout = timeout
+        self.memory_limit = memory_limit
         self._errors: list[tuple[Path, str]] = []
         self._pending_skipped = 0
+        self._files_processed = 0
+        self._files_unchanged = 0
+        self._duplicate_files: list[tuple[Path, Path]] = []
+        self._ambiguous: list[tuple[Path, str, list[str]]] = []
+        self._diagnostics = RowDiagnostics()
+        self._failed_rows: list[tuple[Path, RowError]] = []
+
+    def _reset_counters(self) -> None:
+        """Clear the counters reported for the last run."""
+        self._errors = []
+        self._pending_skipped = 0
+        self._files_processed = 0
+        self._files_unchanged = 0
+        self._duplicate_files = []
+        self._ambiguous = []
+        self._diagnostics = RowDiagnostics()
+        self._failed_rows = []
 
     @property
     def errors(self) -> list[tuple[Path, str]]:
@@ -50,6 +497,21 @@ class BankNormalizer:
         """Get count of pending transactions that were skipped."""
         return self._pending_skipped
 
+    @property
+    def rows_seen(self) -> int:
+        """Get count of table rows read by the last run, whatever became of them."""
+        return self._diagnostics.rows_seen
+
+    @property
+    def rows_skipped(self) -> dict[str, int]:
+        """Get counts of rows that produced no transaction, by reason."""
+        return self._diagnostics.skipped.copy()
+
+    @property
+    def failed_rows(self) -> list[tuple[Path, RowError]]:
+        """Get (file, row error) for rows quarantined because they could not be read."""
+        return self._failed_rows.copy()
+
     def process_file(self, filepath: Path) -> list[Transaction]:
         """
         Process a single file and return transactions.
@@ -60,44 +522,177 @@ class BankNormalizer:
         Returns:
             List of Transaction objects
         """
-        try:
-            content = read_file(filepath)
-        except ValueError as e:
-            self._errors.append((filepath, str(e)))
-            return []
-
-        parser = ParserRegistry.get_parser(content, filepath, config=self.config)
-        if parser is None:
-            self._errors.append((filepath, "No parser found for this file format"))
-            return []
+        return self._collect(self._parse(filepath))
+
+    def _parse(self, filepath: Path, columnar: bool = False) -> Outcomes:
+        """Parse one input here or in a budgeted worker, unless the manifest has it."""
+        if filepath == STDIN:
+            return self._parse_stdin(columnar)
+
+        outcomes = self._reuse(filepath, columnar)
+        if outcomes is None:
+            if self.isolated:
+                with self._executor() as executor:
+                    future = executor.submit(
+                        parse_input, filepath, self.config, self.cache, columnar
+                    )
+                    outcomes = self._result(filepath, future)
+            else:
+                outcomes = parse_input(filepath, self.config, self.cache, columnar)
+            self._record(filepath, outcomes)
+        return outcomes
 
+    @property
+    def isolated(self) -> bool:
+        """Check whether inputs are parsed in budgeted worker processes."""
+        return self.timeout is not None or self.memory_limit is not None
+
+    def _executor(self) -> Executor:
+        """Create the executor parsing inputs in worker processes."""
+        if self.isolated:
+            return IsolatedExecutor(self.jobs, self.timeout, self.memory_limit)
+        return ProcessPoolExecutor(max_workers=self.jobs)
+
+    def _result(self, filepath: Path, future: Future[Outcomes]) -> Outcomes:
+        """Wait for a worker's outcomes; a failed or aborted parse becomes the input's error."""
         try:
-            transactions = parser.parse(content)
-            # Track pending skipped if parser supports it
-            if hasattr(parser, "pending_skipped"):
-                self._pending_skipped += parser.pending_skipped
-            return transactions
+            return future.result()
+        except (TimeoutError, MemoryError, RuntimeError) as e:
+            return [(filepath, ParseResult(error=str(e)))]
         except Exception as e:
-            self._errors.append((filepath, f"Parse error: {e}"))
-            return []
+            # Raised in the worker and pickled back; the rest of the batch carries on
+            return [(filepath, ParseResult(error=f"Parse error: {str(e) or type(e).__name__}"))]
+
+    def _parse_stdin(self, columnar: bool = False) -> Outcomes:
+        """Parse standard input; it is never cached or recorded in the manifest."""
+        name = Path("<stdin>")
+        return [(name, collect(iter_stream(sys.stdin.buffer, name, self.config, columnar)))]
+
+    def _reuse(self, filepath: Path, columnar: bool = False) -> Outcomes | None:
+        """Get the outcome of an earlier run if the input is unchanged."""
+        if self.manifest is None:
+            return None
+        entry = self.manifest.lookup(filepath)
+        if entry is None:
+            return None
+        self._files_unchanged += 1
+        outcome = ParseResult(
+            pending_skipped=entry.pending_skipped,
+            parser=entry.parser,
+            diagnostics=RowDiagnostics(
+                rows_seen=entry.diagnostics.rows_seen, skipped=dict(entry.diagnostics.skipped)
+            ),
+        )
+        if columnar:
+            outcome.columns = entry.columns
+        else:
+            outcome.transactions = entry.transactions
+        return [(filepath, outcome)]
+
+    def _record(self, filepath: Path, outcomes: Outcomes) -> None:
+        """Record a fresh parse in the manifest if every export in it succeeded."""
+        if self.manifest is None:
+            return
+        if any(outcome.error is not None or not outcome.parser for _, outcome in outcomes):
+            return
+        # Keep reporting quarantined rows and ambiguous detections until the file is fixed
+        if any(outcome.diagnostics.failed or outcome.ambiguous for _, outcome in outcomes):
+            return
+        # An archive records the parsers of its members in order, once each
+        parsers = dict.fromkeys(outcome.parser or "" for _, outcome in outcomes)
+        columns = TransactionColumns()
+        diagnostics = RowDiagnostics()
+        for _, outcome in outcomes:
+            diagnostics.merge(outcome.diagnostics)
+            if outcome.columns is not None:
+                columns.extend(outcome.columns)
+            elif any(tx.has_extras for tx in outcome.transactions):
+                # The manifest only keeps the fields of plain CSV output
+                return
+            else:
+                columns.extend(TransactionColumns.from_transactions(outcome.transactions))
+        self.manifest.record(
+            filepath,
+            ",".join(parsers),
+            columns,
+            sum(outcome.pending_skipped for _, outcome in outcomes),
+            diagnostics,
+        )
+
+    def _collect(self, outcomes: Outcomes) -> list[Transaction]:
+        """Merge file outcomes into the counters and gather their transactions."""
+        self._count(outcomes)
+        return [tx for _, outcome in outcomes for tx in outcome.transactions]
+
+    def _collect_columns(self, outcomes: Outcomes) -> TransactionColumns:
+        """Merge file outcomes into the counters and gather their rows as columns."""
+        self._count(outcomes)
+        columns = TransactionColumns()
+        for _, outcome in outcomes:
+            if outcome.columns is not None:
+                columns.extend(outcome.columns)
+            else:
+                # From a parse that failed part way
+                columns.extend(TransactionColumns.from_transactions(outcome.transactions))
+        return columns
+
+    def _count(self, outcomes: Outcomes) -> None:
+        """Merge file outcomes into the normalizer's error and pending counters."""
+        for filepath, outcome in outcomes:
+            if outcome.error is not None:
+                self._errors.append((filepath, outcome.error))
+            if outcome.ambiguous:
+                self._ambiguous.append((filepath, outcome.parser or "", outcome.ambiguous))
+            self._diagnostics.merge(outcome.diagnostics)
+            self._failed_rows.extend((filepath, row) for row in outcome.diagnostics.failed)
+            self._pending_skipped += outcome.pending_skipped
+            self._files_processed += 1
+
+    @property
+    def files_processed(self) -> int:
+        """Get count of exports handled by the last process_files call."""
+        return self._files_processed
+
+    @property
+    def files_unchanged(self) -> int:
+        """Get count of files served from the manifest by the last process_files call."""
+        return self._files_unchanged
+
+    @property
+    def duplicate_files(self) -> list[tuple[Path, Path]]:
+        """Get (duplicate, original) for identical inputs skipped by process_files."""
+        return self._duplicate_files.copy()
+
+    @property
+    def ambiguous_files(self) -> list[tuple[Path, str, list[str]]]:
+        """Get (file, parser used, equally confident parsers) for ambiguous exports."""
+        return self._ambiguous.copy()
 
-    def process_files(self, filepaths: list[Path]) -> list[Transaction]:
+    def process_files(self, filepaths: Iterable[Path]) -> list[Transaction]:
         """
         Process multiple files and return combined transactions.
 
+        Archives are expanded and each export in them is processed as if it
+        were a file. The path "-" reads an export from standard input.
+        Paths may be a lazy iterable such as iter_input_files, in which case
+        parsing starts while discovery is still running. With
+        jobs > 1 the files are parsed in a process pool, or with a timeout or
+        memory_limit in up to jobs budgeted worker processes. Outcomes are
+        merged back in input order, so the result is identical to a serial run. With
+        a manifest, unchanged files are served from it and the manifest is
+        saved at the end. With deduplicate on, files byte-identical to an
+        earlier input are skipped before parsing (see duplicate_files).
+
         Args:
-            filepaths: List of file paths
+            filepaths: File paths to process
 
         Returns:
             List of Transaction objects (deduplicated and sorted if configured)
         """
-        self._errors = []
-        self._pending_skipped = 0
+        self._reset_counters()
         all_transactions: list[Transaction] = []
-
-        for filepath in filepaths:
-            transactions = self.process_file(filepath)
-            all_transactions.extend(transactions)
+        for outcomes in self._iter_outcomes(filepaths, columnar=False):
+            all_transactions.extend(self._collect(outcomes))
 
         if self.deduplicate:
             all_transactions = self._deduplicate(all_transactions)
@@ -107,8 +702,161 @@ class BankNormalizer:
 
         return all_transactions
 
+    def process_columns(self, filepaths: Iterable[Path]) -> TransactionColumns:
+        """
+        Process multiple files into columns for plain CSV output.
+
+        Works like process_files, but parsers fill columns through their
+        batch API instead of building a Transaction per row, which is
+        faster for large exports. Only the fields written by write_csv are
+        kept; write the result with write_columns.
+
+        Args:
+            filepaths: File paths to process
+
+        Returns:
+            Columns of the transactions (deduplicated and sorted if configured)
+        """
+        self._reset_counters()
+        columns = TransactionColumns()
+        for outcomes in self._iter_outcomes(filepaths, columnar=True):
+            columns.extend(self._collect_columns(outcomes))
+
+        if self.deduplicate:
+            seen: set[tuple[date, str, str, str]] = set()
+            unique: list[int] = []
+            for i, key in enumerate(
+                zip(
+                    columns.dates,
+                    (desc[:30] for desc in columns.descriptions),
+                    map(str, columns.amounts),
+                    columns.accounts,
+                    strict=True,
+                )
+            ):
+                if key not in seen:
+                    seen.add(key)
+                    unique.append(i)
+            if len(unique) < len(columns):
+                columns = columns.take(unique)
+
+        if self.sort_descending:
+            # sorted is stable, so equal dates keep their order as in process_files
+            columns = columns.take(
+                sorted(range(len(columns)), key=columns.dates.__getitem__, reverse=True)
+            )
+
+        return columns
+
+    def _iter_outcomes(self, filepaths: Iterable[Path], columnar: bool) -> Iterator[Outcomes]:
+        """
+        Parse inputs for process_files and process_columns, yielding in input order.
+
+        Args:
+            filepaths: File paths to process
+            columnar: Parse into ParseResult.columns instead of transactions
+
+        Yields:
+            Outcomes of each input that was not skipped as identical
+        """
+        # Peek ahead so a single file is never shipped to a pool
+        remaining = self._skip_identical(filepaths) if self.deduplicate else iter(filepaths)
+        first = list(islice(remaining, 2))
+        paths = chain(first, remaining)
+
+        if self.isolated or (self.jobs > 1 and len(first) > 1):
+            with self._executor() as executor:
+                pending: list[tuple[Path, Outcomes | Future[Outcomes]]] = []
+                for filepath in paths:
+                    # Standard input can only be read by this process
+                    if filepath == STDIN:
+                        pending.append((filepath, self._parse_stdin(columnar)))
+                        continue
+                    reused = self._reuse(filepath, columnar)
+                    if reused is None:
+                        future = executor.submit(
+                            parse_input, filepath, self.config, self.cache, columnar
+                        )
+                        pending.append((filepath, future))
+                    else:
+                        pending.append((filepath, reused))
+
+                for filepath, item in pending:
+                    if isinstance(item, Future):
+                        outcomes = self._result(filepath, item)
+                        self._record(filepath, outcomes)
+                    else:
+                        outcomes = item
+                    yield outcomes
+        else:
+            for filepath in paths:
+                yield self._parse(filepath, columnar)
+
+        if self.manifest is not None:
+            self.manifest.save()
+
+    def iter_transactions(self, filepaths: Iterable[Path]) -> Iterator[Transaction]:
+        """
+        Yield transactions from multiple files as they are parsed.
+
+        Files are parsed one at a time in this process, and rows are yielded
+        in input order without sorting, so memory stays bounded by one row
+        plus the keys seen when deduplicating. The manifest, jobs and the
+        parse budget are not used. Counters (errors, pending_skipped,
+        files_processed, duplicate_files, ambiguous_files and the row
+        counters) are reset when iteration starts and are complete once it
+        ends. Rows yielded before a file fails are not retracted; the error
+        is still recorded in errors.
+
+        Args:
+            filepaths: File paths to process
+
+        Yields:
+            Transaction objects (deduplicated if configured)
+        """
+        self._reset_counters()
+        seen: set[tuple[date, str, str, str]] = set()
+
+        paths = self._skip_identical(filepaths) if self.deduplicate else iter(filepaths)
+        for filepath in paths:
+            if filepath == STDIN:
+                inputs: Iterable[tuple[Path, ParseStream]] = [
+                    (Path("<stdin>"), iter_stream(sys.stdin.buffer, config=self.config))
+                ]
+            else:
+                inputs = iter_input(filepath, self.config, self.cache)
+
+            for name, parsed in inputs:
+                while True:
+                    try:
+                        tx = next(parsed)
+                    except StopIteration as stop:
+                        self._collect([(name, stop.value)])
+                        break
+                    if self.deduplicate:
+                        key = self._dedupe_key(tx)
+                        if key in seen:
+                            continue
+                        seen.add(key)
+                    yield tx
+
+    def _skip_identical(self, filepaths: Iterable[Path]) -> Iterator[Path]:
+        """Yield inputs, leaving out files identical to an earlier one."""
+        identical = _IdenticalFiles()
+        for filepath in filepaths:
+            original = None if filepath == STDIN else identical.original_of(filepath)
+            if original is None:
+                yield filepath
+            else:
+                self._duplicate_files.append((filepath, original))
+
     def process_directory(
-        self, directory: Path, extensions: list[str] | None = None
+        self,
+        directory: Path,
+        extensions: Sequence[str] | None = None,
+        include: Sequence[str] = (),
+        exclude: Sequence[str] = (),
+        max_depth: int | None = 0,
     ) -> list[Transaction]:
         """
         Process all matching files in a directory.
@@ -116,18 +864,21 @@ class BankNormalizer:
         Args:
             directory: Directory path
             extensions: File extensions to include (default: csv, xls, xlsx)
+            include: Globs a file must match, if any are given
+            exclude: Globs for files and directories to skip
+            max_depth: Levels of subdirectories to descend (0 = top level only,
+                None = unlimited)
 
         Returns:
             List of Transaction objects
         """
-        if extensions is None:
-            extensions = [".csv", ".xls", ".xlsx"]
-
-        files: list[Path] = []
-        for ext in extensions:
-            files.extend(directory.glob(f"*{ext}"))
-            files.extend(directory.glob(f"*{ext.upper()}"))
-
+        files = iter_input_files(
+            [directory],
+            extensions=extensions or INPUT_EXTENSIONS,
+            include=include,
+            exclude=exclude,
+            max_depth=max_depth,
+        )
         return self.process_files(files)
 
     def _deduplicate(self, transactions: list[Transaction]) -> list[Transaction]:
@@ -136,19 +887,23 @@ class BankNormalizer:
         unique: list[Transaction] = []
 
         for tx in transactions:
-            # Key on date, description (first 30 chars), amount, account
-            key = (
-                tx.date,
-                tx.description[:30],
-                str(tx.amount),
-                tx.account,
-            )
+            key = self._dedupe_key(tx)
             if key not in seen:
                 seen.add(key)
                 unique.append(tx)
 
         return unique
 
+    @staticmethod
+    def _dedupe_key(tx: Transaction) -> tuple[date, str, str, str]:
+        """Get the key duplicates share: date, description (first 30 chars), amount, account."""
+        return (
+            tx.date,
+            tx.description[:30],
+            str(tx.amount),
+            tx.account,
+        )
+
     @staticmethod
     def write_csv(
         transactions: list[Transaction],
@@ -174,6 +929,33 @@ class BankNormalizer:
                     tx.account,
                 ])
 
+    @staticmethod
+    def write_columns(
+        columns: TransactionColumns,
+        output_path: Path,
+        delimiter: str = ",",
+    ) -> None:
+        """
+        Write columns from process_columns to a CSV file laid out like write_csv.
+
+        Args:
+            columns: Transaction columns
+            output_path: Output file path
+            delimiter: CSV delimiter (default comma)
+        """
+        with open(output_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f, delimiter=delimiter)
+            writer.writerow(["Date", "Description", "Amount", "Account"])
+            writer.writerows(
+                zip(
+                    map(date.isoformat, columns.dates),
+                    columns.descriptions,
+                    map(str, columns.amounts),
+                    columns.accounts,
+                    strict=True,
+                )
+            )
+
     @staticmethod
     def write_full_csv(
         transactions: list[Transaction],
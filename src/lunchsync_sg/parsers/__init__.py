@@ -1,15 +1,61 @@
-"""Bank parsers package."""
+"""Bank parsers package.
+
+Bank modules are imported lazily: the registry knows the built-in parsers
+by their signatures and imports a module only when a file matches it (or
+when its class is accessed here).
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+from lunchsync_sg.parsers.base import (
+    BankParser,
+    Detection,
+    LazyParser,
+    ParseResult,
+    ParserRegistry,
+    RowDiagnostics,
+    RowError,
+    SignatureIndex,
+)
+from lunchsync_sg.parsers.catalog import BUILTIN_PARSERS
+from lunchsync_sg.parsers.spec import ParserSpec, SpecParser
+
+if TYPE_CHECKING:
+    from lunchsync_sg.parsers.citi import CitiParser
+    from lunchsync_sg.parsers.dbs import DBSCreditParser, DBSSavingsParser
+    from lunchsync_sg.parsers.hsbc import HSBCRevolutionParser
+    from lunchsync_sg.parsers.ocbc import OCBC360Parser, OCBCCreditParser
+    from lunchsync_sg.parsers.uob import UOBCreditParser
+
+for _entry in BUILTIN_PARSERS:
+    ParserRegistry.register_lazy(_entry)
+del _entry
+
+# Bank parser classes, by the module that defines them
+_BANK_MODULES = {
+    entry.target.partition(":")[2]: entry.target.partition(":")[0] for entry in BUILTIN_PARSERS
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import a bank parser class on first access."""
+    if name in _BANK_MODULES:
+        return getattr(import_module(_BANK_MODULES[name]), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-from lunchsync_sg.parsers.base import BankParser, ParserRegistry
-from lunchsync_sg.parsers.citi import CitiParser
-from lunchsync_sg.parsers.dbs import DBSCreditParser, DBSSavingsParser
-from lunchsync_sg.parsers.hsbc import HSBCRevolutionParser
-from lunchsync_sg.parsers.ocbc import OCBC360Parser, OCBCCreditParser
-from lunchsync_sg.parsers.uob import UOBCreditParser
 
 __all__ = [
     "BankParser",
+    "Detection",
+    "LazyParser",
+    "ParseResult",
     "ParserRegistry",
+    "RowDiagnostics",
+    "RowError",
+    "SignatureIndex",
+    "ParserSpec",
+    "SpecParser",
     "OCBCCreditParser",
     "OCBC360Parser",
     "DBSSavingsParser",
@@ -1,11 +1,25 @@
 """Base parser class and registry for bank parsers."""
 
+import importlib
+import math
+import re
+import warnings
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections.abc import Callable, Generator, Iterable, Iterator, Sequence
+from dataclasses import dataclass, field
+from importlib.metadata import entry_points
 from pathlib import Path
 from typing import Any, ClassVar
 
-from lunchsync_sg.models import Transaction
+from lunchsync_sg.models import Transaction, TransactionColumns
+from lunchsync_sg.utils import Cell, head_lines, rows_to_text
+
+# Marker identifying a file format: a literal substring or a compiled regex
+Marker = str | re.Pattern[str]
+
+# Confidence of a parser without signatures whose can_parse accepts a file,
+# below that of any signature match
+UNSIGNED_CONFIDENCE = 0.25
 
 
 @dataclass
@@ -18,13 +32,120 @@ class DetectedAccount:
     display_hint: str  # e.g., "OCBC Credit Card" for display
 
 
+@dataclass
+class RowError:
+    """A row that could not be read and was quarantined."""
+
+    line: int  # 1-based line of the file, or row of a spreadsheet
+    error: str
+    content: str = ""  # The row's cells joined by commas, if it was split into cells
+
+
+@dataclass
+class RowDiagnostics:
+    """
+    Per-row accounting of one parse.
+
+    Parsers fill this as they go: every row after the table header counts
+    as seen, and ends up as a transaction, a skip (counted by reason) or a
+    quarantined failure. A bad row is recorded in failed and parsing
+    carries on with the next one.
+    """
+
+    rows_seen: int = 0
+    skipped: dict[str, int] = field(default_factory=dict)  # Reason -> rows
+    failed: list[RowError] = field(default_factory=list)
+
+    def skip(self, reason: str) -> None:
+        """Count a row skipped for a reason."""
+        self.skipped[reason] = self.skipped.get(reason, 0) + 1
+
+    def merge(self, other: "RowDiagnostics") -> None:
+        """Add the counts of another parse to these."""
+        self.rows_seen += other.rows_seen
+        for reason, count in other.skipped.items():
+            self.skipped[reason] = self.skipped.get(reason, 0) + count
+        self.failed.extend(other.failed)
+
+
+@dataclass
+class ParseResult:
+    """
+    Outcome of a single pass over one export.
+
+    Detection, the account lookup and parsing share the pass, so callers
+    that only need the account (setup) and callers that need transactions
+    (the normalizer) both read the content once.
+    """
+
+    transactions: list[Transaction] = field(default_factory=list)
+    error: str | None = None
+    pending_skipped: int = 0
+    parser: str | None = None
+    account: DetectedAccount | None = None
+    # Other parsers that matched the content as confidently as the one used
+    ambiguous: list[str] = field(default_factory=list)
+    diagnostics: RowDiagnostics = field(default_factory=RowDiagnostics)
+    # Set instead of transactions by batch parses (see BankParser.parse_batch)
+    columns: TransactionColumns | None = None
+
+
+# Transactions of one export as they are parsed; the return value carries the
+# parser, account, pending count or error, but no transactions
+ParseStream = Generator[Transaction, None, ParseResult]
+
+
+def collect(parsed: ParseStream) -> ParseResult:
+    """
+    Drain a parse stream into a ParseResult.
+
+    Transactions of a stream that ends in an error are dropped, so a failed
+    file contributes nothing.
+
+    Args:
+        parsed: Parse stream to consume
+
+    Returns:
+        ParseResult with the transactions, or the error that stopped the stream
+    """
+    transactions: list[Transaction] = []
+    while True:
+        try:
+            transactions.append(next(parsed))
+        except StopIteration as stop:
+            result: ParseResult = stop.value
+            break
+    if result.error is None:
+        result.transactions = transactions
+    return result
+
+
+def failed(error: str) -> ParseStream:
+    """Get a parse stream that yields nothing and reports an error."""
+    yield from ()
+    return ParseResult(error=error)
+
+
 class BankParser(ABC):
-    """Abstract base class for bank transaction parsers."""
+    """
+    Abstract base class for bank transaction parsers.
+
+    Subclasses implement iter_parse, a generator yielding one transaction at
+    a time, and may override iter_parse_lines / iter_parse_rows to stream
+    from lines or spreadsheet rows. The list-returning parse, parse_lines and
+    parse_rows are thin wrappers around them. While parsing, parsers set
+    account from the header they already read (via detect_account) and
+    count pending_skipped and per-row diagnostics, so iter_result can report
+    them without a second scan.
+    """
 
     # Class attributes to be overridden by subclasses
     bank_name: ClassVar[str] = "Unknown"
     account_type: ClassVar[str] = "credit_card"  # credit_card or savings
     file_patterns: ClassVar[list[str]] = []  # Patterns to match in file content
+    header_lines: ClassVar[int] = 20  # Leading lines can_parse needs to see
+    # Markers the header window must contain: every group needs one of its markers
+    signatures: ClassVar[list[tuple[Marker, ...]]] = []
 
     def __init__(
         self,
@@ -34,23 +155,112 @@ class BankParser(ABC):
         """Initialize parser with optional account name override and config."""
         self._account_name = account_name
         self._config = config
+        self.account: DetectedAccount | None = None
+        self.pending_skipped = 0
+        self.ambiguous: list[str] = []
+        self.diagnostics = RowDiagnostics()
 
     @classmethod
-    @abstractmethod
     def can_parse(cls, content: str, filepath: Path | None = None) -> bool:
         """
         Check if this parser can handle the given file content.
 
+        The registry only passes the first ``header_lines`` lines of the file,
+        counted from its first non-blank line, so implementations must not
+        rely on anything past that window. The default checks the declared
+        signatures; parsers that need more than markers (e.g. a column count)
+        override this, and the registry then calls it only for files whose
+        signatures already matched.
+
         Args:
-            content: File content as string
+            content: File content (or its header window) as string
             filepath: Optional path for extension checking
 
         Returns:
             True if this parser can handle the file
         """
-        pass
+        if not cls.signatures:
+            return False
+        return all(
+            any(_find_marker(marker, content) for marker in group) for group in cls.signatures
+        )
+
+    @classmethod
+    def confidence(cls, content: str, filepath: Path | None = None) -> float:
+        """
+        Score how likely this parser is to read the given content.
+
+        Like can_parse, this only sees the parser's header window. The
+        default is 0.0 unless can_parse accepts the content; otherwise each
+        distinct signature marker found halves the remaining doubt, so
+        parsers matching more evidence rank first. Override this when some
+        matches are weaker than others, keeping the check as cheap as a
+        marker search.
+
+        Args:
+            content: Header window of the file as string
+            filepath: Optional path for extension checking
+
+        Returns:
+            Confidence from 0.0 (cannot parse) to 1.0
+        """
+        if not cls.can_parse(content, filepath):
+            return 0.0
+        if not cls.signatures:
+            return UNSIGNED_CONFIDENCE
+        markers = {_marker_key(marker): marker for group in cls.signatures for marker in group}
+        hits = sum(_find_marker(marker, content) for marker in markers.values())
+        return _signature_confidence(hits)
 
     @abstractmethod
+    def iter_parse(self, content: str) -> Iterator[Transaction]:
+        """
+        Parse file content, yielding transactions as they are found.
+
+        Counters such as pending_skipped and diagnostics are final once the
+        iterator is exhausted.
+
+        Args:
+            content: File content as string
+
+        Yields:
+            Transaction objects
+        """
+        pass
+
+    def iter_parse_lines(self, lines: Iterable[str]) -> Iterator[Transaction]:
+        """
+        Parse transactions from an iterable of text lines.
+
+        Lines keep their "\\n" endings, as when iterating a text file. Parsers
+        that can work line by line override this so large exports can be
+        streamed (e.g. from a MappedFile) without building the full content.
+        The default joins the lines and calls iter_parse().
+
+        Args:
+            lines: Text lines of the file
+
+        Yields:
+            Transaction objects
+        """
+        return self.iter_parse("".join(lines))
+
+    def iter_parse_rows(self, rows: Iterable[Sequence[Cell]]) -> Iterator[Transaction]:
+        """
+        Parse transactions from typed spreadsheet rows.
+
+        Cells are strings, floats or dates already converted from Excel.
+        Parsers for spreadsheet formats override this to skip the CSV round
+        trip. The default converts the rows to CSV text and calls iter_parse().
+
+        Args:
+            rows: Rows of typed cells
+
+        Yields:
+            Transaction objects
+        """
+        return self.iter_parse(rows_to_text(rows))
+
     def parse(self, content: str) -> list[Transaction]:
         """
         Parse file content and return list of transactions.
@@ -61,15 +271,139 @@ class BankParser(ABC):
         Returns:
             List of Transaction objects
         """
-        pass
+        return list(self.iter_parse(content))
+
+    def parse_lines(self, lines: Iterable[str]) -> list[Transaction]:
+        """
+        Parse transactions from text lines and return them as a list.
+
+        Args:
+            lines: Text lines of the file
+
+        Returns:
+            List of Transaction objects
+        """
+        return list(self.iter_parse_lines(lines))
+
+    def parse_rows(self, rows: Iterable[Sequence[Cell]]) -> list[Transaction]:
+        """
+        Parse transactions from typed spreadsheet rows and return them as a list.
+
+        Args:
+            rows: Rows of typed cells
+
+        Returns:
+            List of Transaction objects
+        """
+        return list(self.iter_parse_rows(rows))
+
+    def parse_batch(self, content: str) -> TransactionColumns:
+        """
+        Parse file content into columns instead of Transaction objects.
+
+        For bulk output that only needs dates, descriptions, amounts and
+        accounts. The default splits what iter_parse yields; parsers
+        override this to fill the columns without building transactions.
+        Counters are set as by iter_parse.
+
+        Args:
+            content: File content as string
+
+        Returns:
+            Columns of the parsed transactions
+        """
+        return TransactionColumns.from_transactions(self.iter_parse(content))
+
+    def parse_batch_lines(self, lines: Iterable[str]) -> TransactionColumns:
+        """
+        Parse text lines into columns; see parse_batch and iter_parse_lines.
+
+        Args:
+            lines: Text lines of the file
+
+        Returns:
+            Columns of the parsed transactions
+        """
+        return TransactionColumns.from_transactions(self.iter_parse_lines(lines))
+
+    def parse_batch_rows(self, rows: Iterable[Sequence[Cell]]) -> TransactionColumns:
+        """
+        Parse typed spreadsheet rows into columns; see parse_batch and iter_parse_rows.
+
+        Args:
+            rows: Rows of typed cells
+
+        Returns:
+            Columns of the parsed transactions
+        """
+        return TransactionColumns.from_transactions(self.iter_parse_rows(rows))
+
+    def iter_result(self, transactions: Iterable[Transaction]) -> ParseStream:
+        """
+        Stream this parser's transactions and summarise the pass.
+
+        Exceptions raised while parsing end the stream with an error rather
+        than propagating.
+
+        Args:
+            transactions: Iterator from iter_parse, iter_parse_lines or
+                iter_parse_rows of this parser
+
+        Yields:
+            Transaction objects
+
+        Returns:
+            ParseResult with the parser, account and pending count, or the error
+        """
+        try:
+            yield from transactions
+        except Exception as e:
+            return self._failure(e)
+        return self._summary()
+
+    def batch_result(self, parse: Callable[[], TransactionColumns]) -> ParseResult:
+        """
+        Run a batch parse of this parser and summarise it like iter_result.
+
+        Args:
+            parse: Calls parse_batch, parse_batch_lines or parse_batch_rows
+                of this parser
+
+        Returns:
+            ParseResult with the columns, parser, account and counters, or the error
+        """
+        try:
+            columns = parse()
+        except Exception as e:
+            return self._failure(e)
+        result = self._summary()
+        result.columns = columns
+        return result
+
+    def _summary(self) -> ParseResult:
+        """Summarise a finished parse, without its transactions."""
+        return ParseResult(
+            pending_skipped=self.pending_skipped,
+            parser=type(self).__name__,
+            account=self.account,
+            ambiguous=self.ambiguous,
+            diagnostics=self.diagnostics,
+        )
+
+    def _failure(self, error: Exception) -> ParseResult:
+        """Report a parse stopped by an exception."""
+        return ParseResult(
+            error=f"Parse error: {str(error) or type(error).__name__}", account=self.account
+        )
 
     @classmethod
     def detect_account(cls, content: str) -> DetectedAccount | None:
         """
         Detect account information from file content without full parsing.
 
-        Override this in subclasses to extract the account identifier.
-        Default implementation returns None.
+        Override this in subclasses to extract the account identifier, and
+        call it from the parse loop on the header already read so the same
+        search is not repeated. Default implementation returns None.
 
         Args:
             content: File content as string
@@ -89,25 +423,447 @@ class BankParser(ABC):
         return get_account_name(identifier, config=self._config)
 
 
+@dataclass(frozen=True, eq=False)
+class LazyParser:
+    """
+    Parser known by its signatures, imported only once they match a file.
+
+    Registering these instead of classes keeps startup flat however many
+    parsers exist: the registry compiles the signatures into its index and
+    imports the target module only when a file matches. The signatures and
+    header_lines must be those of the target class.
+
+        LazyParser(
+            "mybank.parsers:MyBankParser",
+            signatures=[("My Bank",), ("Date,Description,Amount",)],
+            header_lines=5,
+        )
+    """
+
+    target: str  # "package.module:ClassName"
+    signatures: list[tuple[Marker, ...]]
+    header_lines: int = 20
+
+    def load(self) -> type[BankParser]:
+        """
+        Import the target parser class.
+
+        Returns:
+            The parser class
+
+        Raises:
+            ValueError: If the target is not a BankParser subclass
+        """
+        module_name, _, name = self.target.partition(":")
+        parser_class = getattr(importlib.import_module(module_name), name, None)
+        if not (isinstance(parser_class, type) and issubclass(parser_class, BankParser)):
+            raise ValueError(f"{self.target} is not a BankParser subclass")
+        return parser_class
+
+
+# A registered parser: a class, or a lazy entry for one
+ParserEntry = type[BankParser] | LazyParser
+
+
+@dataclass(frozen=True)
+class Detection:
+    """A parser that can read some content, and how confident it is."""
+
+    parser: type[BankParser]
+    confidence: float
+
+
+# Blank lines, and a BOM before them, at the start of a file
+_LEADING_BLANK_LINES = re.compile(r"\ufeff?(?:[^\S\n]*\n)+")
+
+
+def _skip_blank_lines(content: str) -> str:
+    """Drop leading blank lines, so header windows start at the first real line."""
+    match = _LEADING_BLANK_LINES.match(content)
+    return content[match.end() :] if match else content
+
+
+def _target_of(parser_class: type[BankParser]) -> str:
+    """Get the "module:Class" target naming a parser class."""
+    return f"{parser_class.__module__}:{parser_class.__qualname__}"
+
+
+def _find_marker(marker: Marker, content: str) -> bool:
+    """Check whether content contains a marker."""
+    if isinstance(marker, str):
+        return marker in content
+    return marker.search(content) is not None
+
+
+def _marker_key(marker: Marker) -> tuple[str, int]:
+    """Get the regex source and flags a marker is compared and compiled by."""
+    if isinstance(marker, str):
+        return re.escape(marker), 0
+    return marker.pattern, marker.flags
+
+
+def _signature_confidence(hits: int) -> float:
+    """Get the confidence given by a number of distinct signature markers found."""
+    return 1.0 - 0.5**hits
+
+
+def _overrides(parser_class: type[BankParser], method: str) -> bool:
+    """Check whether a parser replaces a detection method of BankParser."""
+    for klass in parser_class.__mro__:
+        if klass is BankParser:
+            return False
+        if method in vars(klass):
+            return True
+    return False
+
+
+class SignatureIndex:
+    """
+    Declared signatures of many parsers compiled into one matcher.
+
+    Every distinct marker becomes a branch of a single regex, so a header
+    window is scanned once however many parsers are registered. Markers
+    starting at the same position as the branch that matched there are
+    checked individually, so overlapping markers are never missed. Markers
+    that cannot be embedded in the combined regex, such as patterns with
+    backreferences, are searched for on their own.
+
+        index = SignatureIndex(ParserRegistry.get_all_parsers())
+        for parser_class in index.candidates(header):
+            ...
+    """
+
+    def __init__(self, parsers: Sequence[ParserEntry]) -> None:
+        """
+        Compile the signatures of the given parsers.
+
+        Args:
+            parsers: Parser classes or lazy entries in registration order
+        """
+        self._parsers = list(parsers)
+        self._markers: list[re.Pattern[str]] = []
+        keys: dict[tuple[str, int], int] = {}
+        # Per parser: groups of marker indexes (for parsers with signatures)
+        self._groups: dict[ParserEntry, list[list[int]]] = {}
+
+        for parser_class in self._parsers:
+            if not parser_class.signatures:
+                continue
+            groups: list[list[int]] = []
+            for group in parser_class.signatures:
+                indexes = []
+                for marker in group:
+                    key = _marker_key(marker)
+                    if key not in keys:
+                        keys[key] = len(self._markers)
+                        self._markers.append(re.compile(*key))
+                    indexes.append(keys[key])
+                groups.append(indexes)
+            self._groups[parser_class] = groups
+
+        self._embedded: list[int] = []
+        self._separate: list[int] = []
+        for i, pattern in enumerate(self._markers):
+            (self._separate if _has_backreference(pattern) else self._embedded).append(i)
+        self._matcher = self._combine()
+        if self._matcher is None and self._embedded:
+            # Some branch cannot be combined (e.g. a group name used twice): add them one by one
+            self._embedded, candidates = [], self._embedded
+            for i in candidates:
+                self._embedded.append(i)
+                if self._combine() is None:
+                    self._embedded.pop()
+                    self._separate.append(i)
+            self._matcher = self._combine()
+
+    def _combine(self) -> re.Pattern[str] | None:
+        """Compile the embedded markers into one regex, or None if that fails."""
+        branches = "|".join(f"(?P<m{i}>{_scoped(self._markers[i])})" for i in self._embedded)
+        if not branches:
+            return None
+        try:
+            return re.compile(f"(?=(?:{branches}))")
+        except re.error:
+            return None
+
+    def marker_lines(self, content: str) -> dict[int, int]:
+        """
+        Find the first line each marker appears on.
+
+        Args:
+            content: Header window as string
+
+        Returns:
+            Mapping of marker index to 0-based line number
+        """
+        positions: dict[int, int] = {}
+        if self._matcher is not None:
+            for match in self._matcher.finditer(content):
+                start = match.start()
+                found = int((match.lastgroup or "m0")[1:])
+                positions.setdefault(found, start)
+                # Only one branch is reported per position; try the rest there too
+                for i in self._embedded:
+                    if i not in positions and i != found and self._markers[i].match(content, start):
+                        positions[i] = start
+        for i in self._separate:
+            found_at = self._markers[i].search(content)
+            if found_at is not None:
+                positions[i] = found_at.start()
+        return {i: content.count("\n", 0, start) for i, start in positions.items()}
+
+    def matches(self, content: str) -> list[tuple[ParserEntry, int]]:
+        """
+        Rank the parsers whose signatures match a header window.
+
+        A parser matches when every signature group has a marker within its
+        own header_lines. Matches with more distinct markers rank first,
+        then registration order decides. Parsers without signatures cannot
+        be ruled out and follow all matches, with no markers found.
+
+        Args:
+            content: Header window as string
+
+        Returns:
+            (parser, distinct markers found) for each candidate, most likely first
+        """
+        lines = self.marker_lines(content)
+        scored: list[tuple[int, int, ParserEntry]] = []
+        unsigned: list[tuple[ParserEntry, int]] = []
+
+        for order, parser_class in enumerate(self._parsers):
+            groups = self._groups.get(parser_class)
+            if groups is None:
+                unsigned.append((parser_class, 0))
+                continue
+            window = parser_class.header_lines
+            hits = {i for group in groups for i in group if lines.get(i, window) < window}
+            if all(hits.intersection(group) for group in groups):
+                scored.append((-len(hits), order, parser_class))
+
+        scored.sort(key=lambda item: item[:2])
+        return [(parser_class, -hits) for hits, _, parser_class in scored] + unsigned
+
+    def candidates(self, content: str) -> list[ParserEntry]:
+        """
+        Rank the parsers whose signatures match a header window.
+
+        Args:
+            content: Header window as string
+
+        Returns:
+            Candidate parsers, most likely first (see matches)
+        """
+        return [parser_class for parser_class, _ in self.matches(content)]
+
+
+# Flags that can be scoped to one branch of a combined regex
+_SCOPED_FLAGS = (
+    (re.ASCII, "a"),
+    (re.IGNORECASE, "i"),
+    (re.MULTILINE, "m"),
+    (re.DOTALL, "s"),
+    (re.VERBOSE, "x"),
+)
+
+# A reference to a group: a backreference not preceded by an escaped backslash,
+# a named backreference or a conditional group
+_BACKREFERENCE = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]|\(\?P=|\(\?\(")
+
+
+def _scoped(pattern: re.Pattern[str]) -> str:
+    """Get a pattern's source with its flags scoped to it, for use as a branch."""
+    flags = "".join(letter for flag, letter in _SCOPED_FLAGS if pattern.flags & flag)
+    return f"(?{flags}:{pattern.pattern})" if flags else f"(?:{pattern.pattern})"
+
+
+def _has_backreference(pattern: re.Pattern[str]) -> bool:
+    """Check whether a pattern refers back to its own groups, which shift when embedded."""
+    return pattern.groups > 0 and _BACKREFERENCE.search(pattern.pattern) is not None
+
+
 class ParserRegistry:
-    """Registry for bank parsers with automatic detection."""
+    """
+    Registry for bank parsers with automatic detection.
+
+    Parsers are registered as classes or as LazyParser entries, whose
+    modules are imported only when their signatures match a file. Other
+    packages can add parsers through the "lunchsync_sg.parsers" entry point
+    group, pointing at a LazyParser (or a parser class, imported eagerly);
+    plugins are discovered on first use of the registry.
+    """
 
-    _parsers: ClassVar[list[type[BankParser]]] = []
+    PLUGIN_GROUP: ClassVar[str] = "lunchsync_sg.parsers"
+
+    _parsers: ClassVar[list[ParserEntry]] = []
+    _loaded: ClassVar[dict[str, type[BankParser]]] = {}
+    _index: ClassVar[SignatureIndex | None] = None
+    _plugins_loaded: ClassVar[bool] = False
 
     @classmethod
     def register(cls, parser_class: type[BankParser]) -> type[BankParser]:
         """
         Register a parser class. Can be used as a decorator.
 
+        A class whose lazy entry is already registered takes that entry's
+        place rather than being added twice.
+
         Example:
             @ParserRegistry.register
             class MyBankParser(BankParser):
                 ...
         """
-        if parser_class not in cls._parsers:
+        target = _target_of(parser_class)
+        if any(isinstance(e, LazyParser) and e.target == target for e in cls._parsers):
+            cls._loaded[target] = parser_class
+        elif parser_class not in cls._parsers:
             cls._parsers.append(parser_class)
+            cls._index = None
+        return parser_class
+
+    @classmethod
+    def register_lazy(cls, entry: LazyParser) -> LazyParser:
+        """
+        Register a parser to be imported only when its signatures match.
+
+        Args:
+            entry: Lazy entry naming the parser class and its signatures
+
+        Returns:
+            The entry
+        """
+        if not any(isinstance(e, LazyParser) and e.target == entry.target for e in cls._parsers):
+            cls._parsers.append(entry)
+            cls._index = None
+        return entry
+
+    @classmethod
+    def _entries(cls) -> list[ParserEntry]:
+        """Get the registered entries, discovering plugins on first use."""
+        if not cls._plugins_loaded:
+            cls._plugins_loaded = True
+            cls._load_plugins()
+        return cls._parsers
+
+    @classmethod
+    def _load_plugins(cls) -> None:
+        """Register parsers advertised by installed packages."""
+        for entry_point in entry_points(group=cls.PLUGIN_GROUP):
+            try:
+                plugin = entry_point.load()
+            except Exception as e:
+                warnings.warn(f"Could not load parser plugin {entry_point.name}: {e}", stacklevel=2)
+                continue
+
+            if isinstance(plugin, LazyParser):
+                cls.register_lazy(plugin)
+            elif isinstance(plugin, type) and issubclass(plugin, BankParser):
+                cls.register(plugin)
+            else:
+                warnings.warn(
+                    f"Parser plugin {entry_point.name} is not a LazyParser or BankParser",
+                    stacklevel=2,
+                )
+
+    @classmethod
+    def _resolve(cls, entry: ParserEntry) -> type[BankParser]:
+        """Get the parser class of an entry, importing it if needed."""
+        if not isinstance(entry, LazyParser):
+            return entry
+        parser_class = cls._loaded.get(entry.target)
+        if parser_class is None:
+            parser_class = entry.load()
+            cls._loaded[entry.target] = parser_class
         return parser_class
 
+    @classmethod
+    def candidates(cls, content: str) -> list[type[BankParser]]:
+        """
+        Rank the registered parsers whose signatures match the content.
+
+        The signature index is compiled on first use and rebuilt after a
+        parser is registered. Only the matching parsers are imported.
+
+        Args:
+            content: File content (or a header prefix of it) as string
+
+        Returns:
+            Candidate parser classes, most likely first
+        """
+        return [cls._resolve(entry) for entry, _ in cls._matches(content)]
+
+    @classmethod
+    def _matches(cls, content: str) -> list[tuple[ParserEntry, int]]:
+        """Run the signature index, compiling it first if needed, over the header window."""
+        entries = cls._entries()
+        if cls._index is None:
+            cls._index = SignatureIndex(entries)
+        return cls._index.matches(head_lines(_skip_blank_lines(content), cls.max_header_lines()))
+
+    @classmethod
+    def rank(cls, content: str, filepath: Path | None = None) -> list[Detection]:
+        """
+        Score every parser that can read the content, most confident first.
+
+        The header window is scanned once by the signature index, whose
+        marker counts give the confidence of most parsers directly. Only
+        candidates that declare their own confidence or can_parse are
+        probed, each with just its own header window, so the cost of
+        detection grows with neither the size of the file nor the number
+        of parsers. Equal scores keep registration order.
+
+        Args:
+            content: File content (or a header prefix of it) as string
+            filepath: Optional filepath for extension detection
+
+        Returns:
+            Detections with a confidence above zero
+        """
+        content = _skip_blank_lines(content)
+        windows: dict[int, str] = {}
+
+        def window(parser_class: type[BankParser]) -> str:
+            max_lines = parser_class.header_lines
+            if max_lines not in windows:
+                windows[max_lines] = head_lines(content, max_lines)
+            return windows[max_lines]
+
+        detections: list[Detection] = []
+        for entry, hits in cls._matches(content):
+            parser_class = cls._resolve(entry)
+            if not hits or _overrides(parser_class, "confidence"):
+                confidence = parser_class.confidence(window(parser_class), filepath)
+            elif _overrides(parser_class, "can_parse") and not parser_class.can_parse(
+                window(parser_class), filepath
+            ):
+                continue
+            else:
+                confidence = _signature_confidence(hits)
+            if confidence > 0:
+                detections.append(Detection(parser_class, confidence))
+
+        detections.sort(key=lambda detection: -detection.confidence)
+        return detections
+
+    @classmethod
+    def detect(
+        cls,
+        content: str,
+        filepath: Path | None = None,
+    ) -> type[BankParser] | None:
+        """
+        Find the parser class most confident it can read the content.
+
+        Args:
+            content: File content (or a header prefix of it) as string
+            filepath: Optional filepath for extension detection
+
+        Returns:
+            Parser class if found, None otherwise
+        """
+        ranked = cls.rank(content, filepath)
+        return ranked[0].parser if ranked else None
+
     @classmethod
     def get_parser(
         cls,
@@ -118,6 +874,9 @@ class ParserRegistry:
         """
         Get appropriate parser for the given content.
 
+        The most confident parser is used. Parsers that scored as high are
+        listed in its ambiguous attribute, which its ParseResult carries.
+
         Args:
             content: File content as string
             filepath: Optional filepath for extension detection
@@ -126,17 +885,55 @@ class ParserRegistry:
         Returns:
             Parser instance if found, None otherwise
         """
-        for parser_class in cls._parsers:
-            if parser_class.can_parse(content, filepath):
-                return parser_class(config=config)
-        return None
+        ranked = cls.rank(content, filepath)
+        if not ranked:
+            return None
+        best, *others = ranked
+        parser = best.parser(config=config)
+        parser.ambiguous = [
+            other.parser.__name__
+            for other in others
+            if math.isclose(other.confidence, best.confidence)
+        ]
+        return parser
+
+    @classmethod
+    def parse(
+        cls,
+        content: str,
+        filepath: Path | None = None,
+        config: dict[str, Any] | None = None,
+    ) -> ParseResult:
+        """
+        Detect, identify the account of and parse content in one pass.
+
+        Args:
+            content: File content (or just its header window) as string
+            filepath: Optional filepath for extension detection
+            config: Loaded JSON config for account mappings
+
+        Returns:
+            ParseResult with the account and transactions, or an error
+        """
+        parser = cls.get_parser(content, filepath, config=config)
+        if parser is None:
+            return ParseResult(error="No parser found for this file format")
+        return collect(parser.iter_result(parser.iter_parse(content)))
+
+    @classmethod
+    def max_header_lines(cls) -> int:
+        """Get the largest header window any registered parser needs."""
+        return max((p.header_lines for p in cls._entries()), default=0)
 
     @classmethod
     def get_all_parsers(cls) -> list[type[BankParser]]:
-        """Get all registered parser classes."""
-        return cls._parsers.copy()
+        """Get all registered parser classes, importing any not loaded yet."""
+        return [cls._resolve(entry) for entry in cls._entries()]
 
     @classmethod
     def clear(cls) -> None:
-        """Clear all registered parsers (mainly for testing)."""
+        """Clear all registered parsers (mainly for testing); plugins are not rediscovered."""
         cls._parsers = []
+        cls._loaded = {}
+        cls._index = None
+        cls._plugins_loaded = True
@@ -0,0 +1,63 @@
+"""Signatures of the built-in parsers, registered without importing them."""
+
+import re
+
+from lunchsync_sg.parsers.base import LazyParser
+
+# In registration order; each must match its class's signatures and header_lines
+BUILTIN_PARSERS = [
+    LazyParser(
+        "lunchsync_sg.parsers.citi:CitiParser",
+        signatures=[
+            (re.compile(r"\d{2}/\d{2}/\d{4}"),),
+            (re.compile(r"'(\d{16})'"),),
+        ],
+        header_lines=1,
+    ),
+    LazyParser(
+        "lunchsync_sg.parsers.dbs:DBSSavingsParser",
+        signatures=[("DBS Savings Account",), ("Transaction Code",)],
+        header_lines=10,
+    ),
+    LazyParser(
+        "lunchsync_sg.parsers.dbs:DBSCreditParser",
+        signatures=[
+            ("DBS MasterCard", "Card Transaction Details"),
+            ("Transaction Posting Date",),
+        ],
+        header_lines=10,
+    ),
+    LazyParser(
+        "lunchsync_sg.parsers.hsbc:HSBCRevolutionParser",
+        signatures=[
+            ("•••• •••• •••• 3363", re.compile("PYMT @ AXS", re.IGNORECASE)),
+            ("3363",),
+        ],
+        header_lines=5,
+    ),
+    LazyParser(
+        "lunchsync_sg.parsers.ocbc:OCBCCreditParser",
+        signatures=[
+            ("OCBC Rewards Card", "OCBC Credit Card"),
+            ("Transaction date,Description,Withdrawals",),
+        ],
+        header_lines=10,
+    ),
+    LazyParser(
+        "lunchsync_sg.parsers.ocbc:OCBC360Parser",
+        signatures=[("360 Account",), ("Transaction date,Value date,Description",)],
+        header_lines=10,
+    ),
+    LazyParser(
+        "lunchsync_sg.parsers.uob:UOBCreditParser",
+        signatures=[
+            (re.compile("UNITED OVERSEAS BANK", re.IGNORECASE),),
+            (
+                re.compile("LADY'S SOLITAIRE", re.IGNORECASE),
+                re.compile("PREFERRED PLATINUM", re.IGNORECASE),
+            ),
+            (re.compile("TRANSACTION DATE", re.IGNORECASE),),
+        ],
+        header_lines=15,
+    ),
+]
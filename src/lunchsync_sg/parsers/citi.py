@@ -6,13 +6,13 @@ from io import StringIO
 from pathlib import Path
 from typing import ClassVar
 
-from lunchsync_sg.models import Transaction
-from lunchsync_sg.parsers.base import BankParser, DetectedAccount, ParserRegistry
-from lunchsync_sg.utils import clean_description, parse_amount, parse_date
+from lunchsync_sg.parsers.base import Marker, ParserRegistry
+from lunchsync_sg.parsers.spec import ParserSpec, SpecParser
+from lunchsync_sg.utils import head_lines
 
 
 @ParserRegistry.register
-class CitiParser(BankParser):
+class CitiParser(SpecParser):
     """Parser for Citibank Credit Card CSV exports.
 
     Handles headerless CSV exports with format:
@@ -22,9 +22,26 @@ class CitiParser(BankParser):
     bank_name: ClassVar[str] = "Citi"
     account_type: ClassVar[str] = "credit_card"
     file_patterns: ClassVar[list[str]] = ["ACCT_*.csv"]
+    header_lines: ClassVar[int] = 1  # Headerless, the first row identifies the format
 
     # Pattern for 16-digit card number with apostrophe wrapper
     CARD_PATTERN = re.compile(r"'(\d{16})'")
+    # Narrow candidates cheaply; can_parse then checks the column layout
+    signatures: ClassVar[list[tuple[Marker, ...]]] = [
+        (re.compile(r"\d{2}/\d{2}/\d{4}"),),
+        (CARD_PATTERN,),
+    ]
+    display_hint: ClassVar[str] = "Citi Credit Card"
+    # Each row names its card, so the account is looked up per row
+    spec: ClassVar[ParserSpec] = ParserSpec(
+        min_columns=5,
+        date=0,
+        description=1,
+        amount=2,  # Sign is already correct
+        account_pattern=CARD_PATTERN,
+        account_column=4,
+        default_account="Citi Card",
+    )
 
     @classmethod
     def can_parse(cls, content: str, filepath: Path | None = None) -> bool:
@@ -33,15 +50,11 @@ class CitiParser(BankParser):
         Detects headerless CSV with 5 columns: date, description, amount, empty, card_number.
         """
         # Strip BOM if present
-        content = content.lstrip("\ufeff")
-
-        lines = content.strip().split("\n")
-        if not lines:
-            return False
+        first_line = head_lines(content.lstrip("\ufeff").lstrip(), 1)
 
         # Check first data row structure
         try:
-            reader = csv.reader(StringIO(lines[0]))
+            reader = csv.reader(StringIO(first_line))
             row = next(reader)
         except (StopIteration, csv.Error):
             return False
@@ -59,58 +72,3 @@ class CitiParser(BankParser):
             return False
 
         return True
-
-    @classmethod
-    def detect_account(cls, content: str) -> DetectedAccount | None:
-        """Detect Citibank account from content."""
-        content = content.lstrip("\ufeff")
-        match = cls.CARD_PATTERN.search(content)
-        if match:
-            card_number = match.group(1)
-            return DetectedAccount(
-                card_number=card_number,
-                bank=cls.bank_name,
-                account_type=cls.account_type,
-                display_hint="Citi Credit Card",
-            )
-        return None
-
-    def parse(self, content: str) -> list[Transaction]:
-        """Parse Citibank transactions."""
-        transactions: list[Transaction] = []
-
-        # Strip BOM if present
-        content = content.lstrip("\ufeff")
-
-        reader = csv.reader(StringIO(content))
-
-        for row in reader:
-            if len(row) < 5:
-                continue
-
-            date_val = parse_date(row[0])
-            if not date_val:
-                continue
-
-            desc = clean_description(row[1])
-            amount = parse_amount(row[2])
-
-            if amount is None:
-                continue
-
-            # Get card number from last column and look up account name
-            match = self.CARD_PATTERN.search(row[4])
-            card_num = match.group(1) if match else "Citi Card"
-            account_name = self.get_account_name(card_num)
-
-            transactions.append(
-                Transaction(
-                    date=date_val,
-                    description=desc,
-                    amount=amount,  # Sign is already correct
-                    account=account_name,
-                    raw_data={"row": row},
-                )
-            )
-
-        return transactions
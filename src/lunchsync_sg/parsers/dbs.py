@@ -1,206 +1,58 @@
 """DBS bank parsers."""
 
-import csv
 import re
-from io import StringIO
-from pathlib import Path
 from typing import ClassVar
 
-from lunchsync_sg.models import Transaction
-from lunchsync_sg.parsers.base import BankParser, DetectedAccount, ParserRegistry
-from lunchsync_sg.utils import clean_description, parse_amount, parse_date
+from lunchsync_sg.parsers.base import Marker, ParserRegistry
+from lunchsync_sg.parsers.spec import ParserSpec, SpecParser
 
 
 @ParserRegistry.register
-class DBSSavingsParser(BankParser):
+class DBSSavingsParser(SpecParser):
     """Parser for DBS Savings Account CSV exports."""
 
     bank_name: ClassVar[str] = "DBS"
     account_type: ClassVar[str] = "savings"
     file_patterns: ClassVar[list[str]] = ["DBS Savings Account"]
-
-    @classmethod
-    def can_parse(cls, content: str, filepath: Path | None = None) -> bool:
-        """Check if content is DBS savings account format."""
-        return "DBS Savings Account" in content and "Transaction Code" in content
-
-    @classmethod
-    def detect_account(cls, content: str) -> DetectedAccount | None:
-        """Detect DBS savings account from content."""
-        for line in content.split("\n")[:10]:
-            match = re.search(r"DBS Savings Account\s+(\d{3}-\d-\d{6})", line)
-            if match:
-                return DetectedAccount(
-                    card_number=match.group(1),
-                    bank=cls.bank_name,
-                    account_type=cls.account_type,
-                    display_hint="DBS Savings Account",
-                )
-        return None
-
-    def parse(self, content: str) -> list[Transaction]:
-        """Parse DBS savings account transactions."""
-        transactions: list[Transaction] = []
-        lines = content.strip().split("\n")
-
-        # Extract account identifier
-        account_id = "DBS Savings"
-        for line in lines[:10]:
-            match = re.search(r"DBS Savings Account\s+(\d{3}-\d-\d{6})", line)
-            if match:
-                account_id = match.group(1)
-                break
-
-        account_name = self.get_account_name(account_id)
-
-        # Find transaction data
-        in_transactions = False
-        for line in lines:
-            if "Transaction Date" in line and "Transaction Code" in line:
-                in_transactions = True
-                continue
-
-            if not in_transactions:
-                continue
-
-            # Parse CSV properly
-            try:
-                reader = csv.reader(StringIO(line))
-                parts = next(reader)
-            except Exception:
-                continue
-
-            if len(parts) < 8:
-                continue
-
-            date_val = parse_date(parts[0])
-            if not date_val:
-                continue
-
-            desc = clean_description(parts[2])
-            debit = parse_amount(parts[7]) if len(parts) > 7 else None
-            credit = parse_amount(parts[8]) if len(parts) > 8 else None
-
-            if debit:
-                transactions.append(
-                    Transaction(
-                        date=date_val,
-                        description=desc,
-                        amount=-debit,
-                        account=account_name,
-                        raw_data={"row": parts},
-                    )
-                )
-            elif credit:
-                transactions.append(
-                    Transaction(
-                        date=date_val,
-                        description=desc,
-                        amount=credit,
-                        account=account_name,
-                        raw_data={"row": parts},
-                    )
-                )
-
-        return transactions
+    header_lines: ClassVar[int] = 10
+    signatures: ClassVar[list[tuple[Marker, ...]]] = [
+        ("DBS Savings Account",),
+        ("Transaction Code",),
+    ]
+    display_hint: ClassVar[str] = "DBS Savings Account"
+    spec: ClassVar[ParserSpec] = ParserSpec(
+        header=("Transaction Date", "Transaction Code"),
+        min_columns=8,
+        date=0,
+        description=2,
+        debit=7,
+        credit=8,
+        account_pattern=re.compile(r"DBS Savings Account\s+(\d{3}-\d-\d{6})"),
+        default_account="DBS Savings",
+    )
 
 
 @ParserRegistry.register
-class DBSCreditParser(BankParser):
+class DBSCreditParser(SpecParser):
     """Parser for DBS Credit Card CSV exports."""
 
     bank_name: ClassVar[str] = "DBS"
     account_type: ClassVar[str] = "credit_card"
     file_patterns: ClassVar[list[str]] = ["DBS MasterCard", "DBS Credit Card"]
-
-    @classmethod
-    def can_parse(cls, content: str, filepath: Path | None = None) -> bool:
-        """Check if content is DBS credit card format."""
-        return (
-            "DBS MasterCard" in content or "Card Transaction Details" in content
-        ) and "Transaction Posting Date" in content
-
-    @classmethod
-    def detect_account(cls, content: str) -> DetectedAccount | None:
-        """Detect DBS credit card account from content."""
-        for line in content.split("\n")[:10]:
-            match = re.search(r"(\d{4}-\d{4}-\d{4}-\d{4})", line)
-            if match:
-                return DetectedAccount(
-                    card_number=match.group(1),
-                    bank=cls.bank_name,
-                    account_type=cls.account_type,
-                    display_hint="DBS Credit Card",
-                )
-        return None
-
-    def parse(self, content: str) -> list[Transaction]:
-        """Parse DBS credit card transactions."""
-        transactions: list[Transaction] = []
-        self.pending_skipped = 0  # Track skipped pending transactions
-        lines = content.strip().split("\n")
-
-        # Extract account identifier
-        account_id = "DBS Card"
-        for line in lines[:10]:
-            match = re.search(r"(\d{4}-\d{4}-\d{4}-\d{4})", line)
-            if match:
-                account_id = match.group(1)
-                break
-
-        account_name = self.get_account_name(account_id)
-
-        # Find transaction data
-        in_transactions = False
-        for line in lines:
-            if "Transaction Date" in line and "Transaction Posting Date" in line:
-                in_transactions = True
-                continue
-
-            if not in_transactions:
-                continue
-
-            try:
-                reader = csv.reader(StringIO(line))
-                parts = next(reader)
-            except Exception:
-                continue
-
-            if len(parts) < 7:
-                continue
-
-            # Skip pending transactions (Transaction Status is in column 5)
-            if len(parts) > 5 and parts[5].strip().lower() == "pending":
-                self.pending_skipped += 1
-                continue
-
-            date_val = parse_date(parts[0])
-            if not date_val:
-                continue
-
-            desc = clean_description(parts[2])
-            debit = parse_amount(parts[6]) if len(parts) > 6 else None
-            credit = parse_amount(parts[7]) if len(parts) > 7 else None
-
-            if debit:
-                transactions.append(
-                    Transaction(
-                        date=date_val,
-                        description=desc,
-                        amount=-debit,
-                        account=account_name,
-                        raw_data={"row": parts},
-                    )
-                )
-            elif credit:
-                transactions.append(
-                    Transaction(
-                        date=date_val,
-                        description=desc,
-                        amount=credit,
-                        account=account_name,
-                        raw_data={"row": parts},
-                    )
-                )
-
-        return transactions
+    header_lines: ClassVar[int] = 10
+    signatures: ClassVar[list[tuple[Marker, ...]]] = [
+        ("DBS MasterCard", "Card Transaction Details"),
+        ("Transaction Posting Date",),
+    ]
+    display_hint: ClassVar[str] = "DBS Credit Card"
+    spec: ClassVar[ParserSpec] = ParserSpec(
+        header=("Transaction Date", "Transaction Posting Date"),
+        min_columns=7,
+        pending_column=5,  # Transaction Status
+        date=0,
+        description=2,
+        debit=6,
+        credit=7,
+        account_pattern=re.compile(r"(\d{4}-\d{4}-\d{4}-\d{4})"),
+        default_account="DBS Card",
+    )
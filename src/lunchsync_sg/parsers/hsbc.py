@@ -1,33 +1,47 @@
 """HSBC bank parsers."""
 
-import csv
-import io
 import re
 from pathlib import Path
 from typing import ClassVar
 
-from lunchsync_sg.models import Transaction
-from lunchsync_sg.parsers.base import BankParser, DetectedAccount, ParserRegistry
-from lunchsync_sg.utils import clean_description, parse_amount, parse_date
+from lunchsync_sg.parsers.base import DetectedAccount, Marker, ParserRegistry
+from lunchsync_sg.parsers.spec import ParserSpec, SpecParser
 
 
 @ParserRegistry.register
-class HSBCRevolutionParser(BankParser):
+class HSBCRevolutionParser(SpecParser):
     """Parser for HSBC Revolution Card CSV exports."""
 
     bank_name: ClassVar[str] = "HSBC"
     account_type: ClassVar[str] = "credit_card"
     file_patterns: ClassVar[list[str]] = ["3363", "HSBC"]
+    header_lines: ClassVar[int] = 5  # No header block, the first rows identify the card
+    # HSBC has a simple format without headers: the masked card number, or an
+    # AXS payment alongside the card's last digits
+    signatures: ClassVar[list[tuple[Marker, ...]]] = [
+        ("•••• •••• •••• 3363", re.compile("PYMT @ AXS", re.IGNORECASE)),
+        ("3363",),
+    ]
+    # Headerless; the amount in the last column already has the right sign
+    spec: ClassVar[ParserSpec] = ParserSpec(
+        min_columns=3,
+        date=0,
+        description=1,
+        amount=-1,
+        default_account="HSBC Revolution",
+    )
+
+    # Confidence when only an AXS payment and the card's last digits match,
+    # which any bill payment export could contain
+    WEAK_CONFIDENCE: ClassVar[float] = 0.25
 
     @classmethod
-    def can_parse(cls, content: str, filepath: Path | None = None) -> bool:
-        """Check if content is HSBC Revolution format."""
-        # HSBC has a simple format without headers
-        # Look for masked card number pattern and AXS payment pattern
-        return (
-            "•••• •••• •••• 3363" in content
-            or ("PYMT @ AXS" in content.upper() and "3363" in content)
-        )
+    def confidence(cls, content: str, filepath: Path | None = None) -> float:
+        """Score HSBC content; without the masked card number the match is weak."""
+        confidence = super().confidence(content, filepath)
+        if confidence and "•••• •••• •••• 3363" not in content:
+            return min(confidence, cls.WEAK_CONFIDENCE)
+        return confidence
 
     @classmethod
     def detect_account(cls, content: str) -> DetectedAccount | None:
@@ -51,40 +65,6 @@ class HSBCRevolutionParser(BankParser):
             )
         return None
 
-    def parse(self, content: str) -> list[Transaction]:
-        """Parse HSBC Revolution transactions."""
-        transactions: list[Transaction] = []
-        account_name = "HSBC Revolution"
-
-        # Use CSV reader to properly handle quoted fields with commas
-        reader = csv.reader(io.StringIO(content))
-
-        for row in reader:
-            if len(row) < 3:
-                continue
-
-            date_val = parse_date(row[0])
-            if not date_val:
-                continue
-
-            desc = clean_description(row[1])
-
-            # Amount is in the last column
-            amount_str = row[-1].strip()
-            amount = parse_amount(amount_str)
-
-            if amount is None:
-                continue
-
-            # HSBC: negative in file = expense, positive = payment
-            transactions.append(
-                Transaction(
-                    date=date_val,
-                    description=desc,
-                    amount=amount,  # Sign is already correct
-                    account=account_name,
-                    raw_data={"row": row},
-                )
-            )
-
-        return transactions
+    def account_name(self) -> str:
+        """Get the account name; HSBC exports are always named after the card."""
+        return self.spec.default_account
@@ -0,0 +1,455 @@
+"""Declarative parser specs compiled into specialised row converters."""
+
+import csv
+import re
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
+from datetime import date
+from decimal import Decimal
+from enum import Enum
+from io import StringIO
+from itertools import chain, islice
+from typing import ClassVar, Literal, TypeVar
+
+from lunchsync_sg.models import NO_DESCRIPTION, Transaction, TransactionColumns
+from lunchsync_sg.parsers.base import BankParser, DetectedAccount, RowDiagnostics, RowError
+from lunchsync_sg.utils import (
+    Cell,
+    DateParser,
+    cell_text,
+    clean_description,
+    head_lines,
+    parse_amount,
+    rows_to_text,
+)
+
+
+class Skip(Enum):
+    """Why a row produced no transaction."""
+
+    BLANK = "blank"  # Nothing but empty cells
+    SHORT = "short"  # Fewer columns than the spec needs
+    EXCLUDED = "excluded"  # A cell contains the spec's exclude marker
+    PENDING = "pending"  # Not yet settled
+    NO_DATE = "no_date"
+    NO_AMOUNT = "no_amount"
+
+
+# Converts one row, given the account name, to a transaction or a skip reason
+RowConverter = Callable[[Sequence[Cell], str], Transaction | Skip]
+
+# Extracts the date, description and amount of one row, or a skip reason
+FieldExtractor = Callable[[Sequence[Cell]], tuple[date, str, Decimal] | Skip]
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class ParserSpec:
+    """
+    Declarative layout of a bank export.
+
+    Column indexes may be negative to count from the end of the row. Give
+    either amount (one signed column) or debit and/or credit (withdrawals
+    become negative, deposits positive).
+    """
+
+    date: int
+    description: int
+    amount: int | None = None
+    amount_fallback: int | None = None  # Used when the amount cell is blank
+    negate: bool = False  # Flip the sign of the amount column
+    debit: int | None = None
+    credit: int | None = None
+    min_columns: int = 0
+    header: tuple[str, ...] = ()  # The table starts after the line holding all of these
+    pending_column: int | None = None  # Rows reading "pending" here are skipped
+    exclude: str | None = None  # Rows with a cell containing this are skipped
+    # Searched line by line in the header for the account identifier (group 1)
+    account_pattern: re.Pattern[str] | None = None
+    account_column: int | None = None  # Per-row account, searched with account_pattern
+    default_account: str = "Unknown"
+    raw: Literal["row", "line"] = "row"  # Keep the cells, or the comma-joined line
+
+    def __post_init__(self) -> None:
+        """Validate that exactly one amount layout is given."""
+        has_columns = self.debit is not None or self.credit is not None
+        if (self.amount is None) == (not has_columns):
+            raise ValueError("ParserSpec needs either amount or debit/credit columns")
+        if self.account_column is not None and self.account_pattern is None:
+            raise ValueError("ParserSpec account_column needs an account_pattern")
+
+
+def _optional(column: int | None, min_columns: int) -> bool:
+    """Check whether a column may be missing from rows that pass min_columns."""
+    return column is not None and column >= min_columns
+
+
+def compile_amount(spec: ParserSpec, text: Callable[[Cell], str]) -> Callable[
+    [Sequence[Cell]], Decimal | None
+]:
+    """
+    Compile the amount layout of a spec into a function of one row.
+
+    Args:
+        spec: Parser spec
+        text: Converts a cell to its text
+
+    Returns:
+        Function giving the signed amount of a row, or None if it has none
+    """
+    if spec.amount is not None:
+        column, fallback, negate = spec.amount, spec.amount_fallback, spec.negate
+
+        def signed(row: Sequence[Cell]) -> Decimal | None:
+            value = text(row[column]).strip()
+            if not value and fallback is not None:
+                value = text(row[fallback]).strip()
+            amount = parse_amount(value)
+            if amount is None or not negate:
+                return amount
+            return -amount
+
+        return signed
+
+    debit, credit = spec.debit, spec.credit
+    debit_optional = _optional(debit, spec.min_columns)
+    credit_optional = _optional(credit, spec.min_columns)
+
+    def debit_credit(row: Sequence[Cell]) -> Decimal | None:
+        if debit is not None and (not debit_optional or len(row) > debit):
+            withdrawal = parse_amount(text(row[debit]))
+            if withdrawal:
+                return -withdrawal
+        if credit is not None and (not credit_optional or len(row) > credit):
+            deposit = parse_amount(text(row[credit]))
+            if deposit:
+                return deposit
+        return None
+
+    return debit_credit
+
+
+def compile_fields(spec: ParserSpec, typed: bool = False) -> FieldExtractor:
+    """
+    Compile a spec into a function extracting the fields of one row.
+
+    Options are resolved once here, so the returned function only does the
+    work its spec needs. The extractor learns the file's date format from
+    the first row that has one, so compile a new one for each file.
+
+    Args:
+        spec: Parser spec
+        typed: Whether cells may be native dates and numbers from a
+            spreadsheet rather than strings
+
+    Returns:
+        Extractor returning (date, description, amount) or the reason the
+        row was skipped
+    """
+    text: Callable[[Cell], str] = cell_text if typed else str
+    amount_of = compile_amount(spec, text)
+    min_columns = spec.min_columns
+    date_column, description_column = spec.date, spec.description
+    pending_column, exclude = spec.pending_column, spec.exclude
+    parse_date = DateParser()
+
+    def fields(row: Sequence[Cell]) -> tuple[date, str, Decimal] | Skip:
+        if len(row) < min_columns:
+            return Skip.SHORT if any(cell != "" for cell in row) else Skip.BLANK
+        if exclude is not None and any(
+            isinstance(cell, str) and exclude in cell for cell in row
+        ):
+            return Skip.EXCLUDED
+        if pending_column is not None:
+            status = row[pending_column]
+            if not isinstance(status, date) and str(status).strip().lower() == "pending":
+                return Skip.PENDING
+
+        cell = row[date_column]
+        date_val = cell if typed and isinstance(cell, date) else parse_date(text(cell))
+        if not date_val:
+            return Skip.NO_DATE
+
+        description = clean_description(text(row[description_column]))
+        amount = amount_of(row)
+        if amount is None:
+            return Skip.NO_AMOUNT
+        return date_val, description, amount
+
+    return fields
+
+
+def compile_row(
+    spec: ParserSpec,
+    typed: bool = False,
+    account_of: Callable[[Sequence[Cell]], str] | None = None,
+) -> RowConverter:
+    """
+    Compile a spec into a function converting one row to a transaction.
+
+    Like compile_fields, compile a new converter for each file.
+
+    Args:
+        spec: Parser spec
+        typed: Whether cells may be native dates and numbers from a
+            spreadsheet rather than strings
+        account_of: Per-row account lookup, overriding the account passed in
+
+    Returns:
+        Converter returning a Transaction or the reason the row was skipped
+    """
+    text: Callable[[Cell], str] = cell_text if typed else str
+    fields = compile_fields(spec, typed)
+    raw_line = spec.raw == "line"
+
+    def convert(row: Sequence[Cell], account: str) -> Transaction | Skip:
+        result = fields(row)
+        if isinstance(result, Skip):
+            return result
+        date_val, description, amount = result
+        return Transaction(
+            date=date_val,
+            description=description,
+            amount=amount,
+            account=account if account_of is None else account_of(row),
+            raw_data={"line": ",".join(map(text, row))} if raw_line else {"row": row},
+        )
+
+    return convert
+
+
+# Rows of cells, each with the line (or spreadsheet row) it starts on
+NumberedRows = Iterator[tuple[int, Sequence[Cell]]]
+
+
+class SpecParser(BankParser):
+    """
+    Bank parser driven by a declarative ParserSpec.
+
+    Subclasses declare a spec (and a display_hint for detected accounts);
+    detection, the account lookup and the row loop are shared, so each bank
+    runs the same compiled inner loop. Override account_name or
+    detect_account when a bank names its account differently.
+    """
+
+    spec: ClassVar[ParserSpec]
+    display_hint: ClassVar[str] = ""
+
+    @classmethod
+    def detect_account(cls, content: str) -> DetectedAccount | None:
+        """Detect the account by searching header lines with the spec's account pattern."""
+        pattern = cls.spec.account_pattern
+        if pattern is None:
+            return None
+        for line in content.split("\n")[: cls.header_lines]:
+            match = pattern.search(line)
+            if match:
+                return DetectedAccount(
+                    card_number=match.group(1),
+                    bank=cls.bank_name,
+                    account_type=cls.account_type,
+                    display_hint=cls.display_hint,
+                )
+        return None
+
+    def account_name(self) -> str:
+        """Get the account name for this file's transactions, from the detected account."""
+        identifier = self.account.card_number if self.account else self.spec.default_account
+        return self.get_account_name(identifier)
+
+    def iter_parse(self, content: str) -> Iterator[Transaction]:
+        """Parse transactions from file content."""
+        return self.iter_parse_lines(StringIO(content))
+
+    def iter_parse_lines(self, lines: Iterable[str]) -> Iterator[Transaction]:
+        """Parse transactions line by line, starting after the spec's header line."""
+        yield from self._convert(self._table_lines(lines), typed=False)
+
+    def iter_parse_rows(self, rows: Iterable[Sequence[Cell]]) -> Iterator[Transaction]:
+        """Parse transactions from typed spreadsheet rows, starting after the header row."""
+        yield from self._convert(self._table_rows(rows), typed=True)
+
+    def parse_batch(self, content: str) -> TransactionColumns:
+        """Parse file content into columns."""
+        return self.parse_batch_lines(StringIO(content))
+
+    def parse_batch_lines(self, lines: Iterable[str]) -> TransactionColumns:
+        """Parse text lines into columns, starting after the spec's header line."""
+        return self._convert_batch(self._table_lines(lines), typed=False)
+
+    def parse_batch_rows(self, rows: Iterable[Sequence[Cell]]) -> TransactionColumns:
+        """Parse typed spreadsheet rows into columns, starting after the header row."""
+        return self._convert_batch(self._table_rows(rows), typed=True)
+
+    def _table_lines(self, lines: Iterable[str]) -> NumberedRows:
+        """
+        Read the header lines, detect the account and find the table.
+
+        Args:
+            lines: Text lines of the file
+
+        Returns:
+            Numbered rows of the table, empty if its header line is missing
+        """
+        spec = self.spec
+        line_iter = iter(lines)
+        header = list(islice(line_iter, self.header_lines))
+        # Strip BOM if present
+        if header:
+            header[0] = header[0].lstrip("\ufeff")
+        self.account = self.detect_account("".join(header))
+
+        remaining = chain(header, line_iter)
+        start = 1
+        if spec.header:
+            for line in remaining:
+                start += 1
+                if all(marker in line for marker in spec.header):
+                    break
+            else:
+                return iter(())
+
+        return self._tokenize(remaining, start)
+
+    def _table_rows(self, rows: Iterable[Sequence[Cell]]) -> NumberedRows:
+        """
+        Read the header rows, detect the account and find the table.
+
+        Args:
+            rows: Rows of typed cells
+
+        Returns:
+            Numbered rows of the table, empty if its header row is missing
+        """
+        spec = self.spec
+        row_iter = iter(rows)
+        header_rows = list(islice(row_iter, self.header_lines))
+        self.account = self.detect_account(
+            head_lines(rows_to_text(header_rows), self.header_lines)
+        )
+
+        remaining: Iterator[Sequence[Cell]] = chain(header_rows, row_iter)
+        start = 1
+        if spec.header:
+            for row in remaining:
+                start += 1
+                line = ",".join(map(cell_text, row))
+                if all(marker in line for marker in spec.header):
+                    break
+            else:
+                return iter(())
+
+        return enumerate(remaining, start)
+
+    def _tokenize(self, lines: Iterable[str], start: int) -> NumberedRows:
+        """
+        Split text lines into rows of cells with one streaming csv reader.
+
+        Quoted fields may span lines. Rows the csv module cannot read are
+        quarantined in diagnostics and reading carries on after them.
+
+        Args:
+            lines: Text lines after the table header
+            start: Line number of the first of them
+
+        Yields:
+            Tuples of (line number, cells)
+        """
+        # A row starts on the line after the one the previous row ended on
+        reader = csv.reader(lines)
+        number = start
+        while True:
+            try:
+                for row in reader:
+                    yield number, row
+                    number = start + reader.line_num
+                return
+            except csv.Error as e:
+                self._quarantine(number, f"Unreadable CSV: {e}")
+                number = start + reader.line_num
+
+    def _quarantine(self, line: int, error: str, content: str = "") -> None:
+        """Record a row that could not be read, so parsing can move on."""
+        self.diagnostics.rows_seen += 1
+        self.diagnostics.failed.append(RowError(line, error, content))
+
+    def _outcomes(
+        self, rows: NumberedRows, convert: Callable[[Sequence[Cell]], _T | Skip]
+    ) -> Iterator[tuple[Sequence[Cell], _T]]:
+        """
+        Run rows through a compiled converter, filling the diagnostics.
+
+        A row whose conversion raises is quarantined instead of ending the
+        parse.
+
+        Args:
+            rows: Numbered rows of the table
+            convert: Compiled converter of one row
+
+        Yields:
+            Tuples of (row, converted row) for rows that were not skipped
+        """
+        self.pending_skipped = 0
+        self.diagnostics = diagnostics = RowDiagnostics()
+
+        for number, row in rows:
+            try:
+                result = convert(row)
+            except Exception as e:
+                self._quarantine(number, str(e) or type(e).__name__, ",".join(map(str, row)))
+                continue
+            diagnostics.rows_seen += 1
+            if isinstance(result, Skip):
+                diagnostics.skip(result.value)
+                if result is Skip.PENDING:
+                    self.pending_skipped += 1
+            else:
+                yield row, result
+
+    def _accounts(self) -> tuple[str, Callable[[Sequence[Cell]], str] | None]:
+        """Get the file's account name, or a per-row lookup if rows name their account."""
+        if self.spec.account_column is not None:
+            return "", self._row_account()
+        return self.account_name(), None
+
+    def _convert(self, rows: NumberedRows, typed: bool) -> Iterator[Transaction]:
+        """Convert rows to transactions."""
+        account, account_of = self._accounts()
+        convert = compile_row(self.spec, typed=typed, account_of=account_of)
+        for _, tx in self._outcomes(rows, lambda row: convert(row, account)):
+            yield tx
+
+    def _convert_batch(self, rows: NumberedRows, typed: bool) -> TransactionColumns:
+        """Convert rows straight into columns, without building transactions."""
+        account, account_of = self._accounts()
+        columns = TransactionColumns()
+        dates, descriptions = columns.dates, columns.descriptions
+        amounts, accounts = columns.amounts, columns.accounts
+
+        for row, (date_val, description, amount) in self._outcomes(
+            rows, compile_fields(self.spec, typed)
+        ):
+            dates.append(date_val)
+            descriptions.append(description if description.strip() else NO_DESCRIPTION)
+            amounts.append(amount)
+            accounts.append(account if account_of is None else account_of(row))
+        return columns
+
+    def _row_account(self) -> Callable[[Sequence[Cell]], str]:
+        """Build a memoised lookup of the account named in each row."""
+        spec = self.spec
+        column, pattern = spec.account_column, spec.account_pattern
+        assert column is not None and pattern is not None
+        names: dict[str, str] = {}
+
+        def account_of(row: Sequence[Cell]) -> str:
+            cell = str(row[column])
+            name = names.get(cell)
+            if name is None:
+                match = pattern.search(cell)
+                name = self.get_account_name(match.group(1) if match else spec.default_account)
+                names[cell] = name
+            return name
+
+        return account_of
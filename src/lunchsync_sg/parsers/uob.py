@@ -1,38 +1,53 @@
 """UOB bank parsers."""
 
 import csv
-import io
 import re
-from pathlib import Path
+from collections.abc import Iterable, Iterator
 from typing import ClassVar
 
-from lunchsync_sg.models import Transaction
-from lunchsync_sg.parsers.base import BankParser, DetectedAccount, ParserRegistry
-from lunchsync_sg.utils import clean_description, parse_amount, parse_date
+from lunchsync_sg.models import Transaction, TransactionColumns
+from lunchsync_sg.parsers.base import DetectedAccount, Marker, ParserRegistry
+from lunchsync_sg.parsers.spec import ParserSpec, SpecParser
+from lunchsync_sg.utils import head_lines
 
 
 @ParserRegistry.register
-class UOBCreditParser(BankParser):
+class UOBCreditParser(SpecParser):
     """Parser for UOB Credit Card exports (XLS format converted to CSV)."""
 
     bank_name: ClassVar[str] = "UOB"
     account_type: ClassVar[str] = "credit_card"
     file_patterns: ClassVar[list[str]] = ["United Overseas Bank", "LADY'S SOLITAIRE", "PREFERRED PLATINUM"]
+    header_lines: ClassVar[int] = 15
+    signatures: ClassVar[list[tuple[Marker, ...]]] = [
+        (re.compile("UNITED OVERSEAS BANK", re.IGNORECASE),),
+        (
+            re.compile("LADY'S SOLITAIRE", re.IGNORECASE),
+            re.compile("PREFERRED PLATINUM", re.IGNORECASE),
+        ),
+        (re.compile("TRANSACTION DATE", re.IGNORECASE),),
+    ]
+    spec: ClassVar[ParserSpec] = ParserSpec(
+        header=("Transaction Date", "Posting Date"),
+        min_columns=7,
+        exclude="Previous Balance",
+        # Use Posting Date, not Transaction Date; PENDING rows are not settled
+        pending_column=1,
+        date=1,
+        description=2,
+        # Amount is in the last column (Transaction Amount Local). UOB shows
+        # payments/credits as negative and expenses as positive, so flip it
+        amount=-1,
+        amount_fallback=-2,
+        negate=True,
+        default_account="UOB Card",
+    )
 
     @classmethod
-    def can_parse(cls, content: str, filepath: Path | None = None) -> bool:
-        """Check if content is UOB credit card format."""
-        content_upper = content.upper()
-        return (
-            "UNITED OVERSEAS BANK" in content_upper
-            and ("LADY'S SOLITAIRE" in content_upper or "PREFERRED PLATINUM" in content_upper)
-            and "TRANSACTION DATE" in content_upper
-        )
-
-    @classmethod
-    def detect_account(cls, content: str) -> DetectedAccount | None:
+    def detect_account(cls, content: str) -> DetectedAccount:
         """Detect UOB credit card account from content."""
-        content_upper = content.upper()
+        header = head_lines(content, cls.header_lines)
+        content_upper = header.upper()
 
         # Determine card type for display hint
         if "LADY'S SOLITAIRE" in content_upper:
@@ -40,10 +55,10 @@ class UOBCreditParser(BankParser):
         elif "PREFERRED PLATINUM" in content_upper:
             display_hint = "UOB Platinum VISA"
         else:
-            display_hint = "UOB Credit Card"
+            display_hint = "UOB Card"
 
         # Try to find account number
-        for line in content.split("\n")[:15]:
+        for line in header.split("\n"):
             match = re.search(r"Account Number:,(\d+)", line)
             if match:
                 return DetectedAccount(
@@ -61,83 +76,17 @@ class UOBCreditParser(BankParser):
             display_hint=display_hint,
         )
 
-    def parse(self, content: str) -> list[Transaction]:
-        """Parse UOB credit card transactions."""
-        transactions: list[Transaction] = []
-        self.pending_skipped = 0  # Track skipped pending transactions
-
-        # Detect card type and get account name
-        content_upper = content.upper()
-        if "LADY'S SOLITAIRE" in content_upper:
-            account_name = "UOB Lady's Solitaire"
-        elif "PREFERRED PLATINUM" in content_upper:
-            account_name = "UOB Platinum VISA"
-        else:
-            account_name = "UOB Card"
-
-        # Try to get account name from account number in header
-        for line in content.split("\n")[:15]:
-            match = re.search(r"Account Number:,(\d+)", line)
-            if match:
-                account_name = self.get_account_name(match.group(1))
-                break
+    def account_name(self) -> str:
+        """Get the account name from the account number, or the card type if there is none."""
+        if self.account and self.account.card_number:
+            return self.get_account_name(self.account.card_number)
+        return self.account.display_hint if self.account else self.spec.default_account
 
+    def iter_parse_lines(self, lines: Iterable[str]) -> Iterator[Transaction]:
+        """Parse UOB credit card transactions from converted CSV lines."""
         # Use CSV reader to properly handle quoted multiline fields
-        reader = csv.reader(io.StringIO(content))
-        in_transactions = False
-
-        for row in reader:
-            if not row:
-                continue
-
-            # Check for header row
-            if len(row) >= 3 and "Transaction Date" in row[0] and "Posting Date" in row[1]:
-                in_transactions = True
-                continue
-
-            if not in_transactions:
-                continue
-
-            # Skip rows that don't have enough columns
-            if len(row) < 7:
-                continue
-
-            # Skip "Previous Balance" rows
-            if any("Previous Balance" in cell for cell in row):
-                continue
-
-            # Skip PENDING transactions - only include settled ones
-            posting_date = row[1].strip()
-            if posting_date.upper() == "PENDING":
-                self.pending_skipped += 1
-                continue
-
-            # Use Posting Date (row[1]), not Transaction Date (row[0])
-            date_val = parse_date(posting_date)
-            if not date_val:
-                continue
-
-            desc = clean_description(row[2])
-
-            # Amount is in the last column (Transaction Amount Local)
-            amount_str = row[-1].strip()
-            if not amount_str:
-                amount_str = row[-2].strip() if len(row) >= 2 else ""
-
-            amount = parse_amount(amount_str)
-            if amount is None:
-                continue
-
-            # UOB: negative = payment/credit, positive = expense
-            # So we flip the sign
-            transactions.append(
-                Transaction(
-                    date=date_val,
-                    description=desc,
-                    amount=-amount,
-                    account=account_name,
-                    raw_data={"row": row},
-                )
-            )
+        return self.iter_parse_rows(csv.reader(lines))
 
-        return transactions
+    def parse_batch_lines(self, lines: Iterable[str]) -> TransactionColumns:
+        """Parse UOB credit card converted CSV lines into columns."""
+        return self.parse_batch_rows(csv.reader(lines))
@@ -3,6 +3,7 @@
 import sys
 import termios
 import tty
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
 
@@ -13,7 +14,15 @@ from lunchsync_sg.config import (
     save_json_config,
 )
 from lunchsync_sg.parsers.base import DetectedAccount, ParserRegistry
-from lunchsync_sg.utils import read_file
+from lunchsync_sg.utils import (
+    STATEMENT_EXTENSIONS,
+    is_archive,
+    iter_archive,
+    iter_input_files,
+    load_bytes,
+    member_path,
+    read_header,
+)
 
 
 def mask_card_number(card_number: str) -> str:
@@ -135,36 +144,39 @@ def scan_files_for_accounts(paths: list[Path]) -> list[DetectedAccount]:
     Returns:
         List of DetectedAccount objects
     """
-    files: list[Path] = []
-    for path in paths:
-        if path.is_dir():
-            for ext in [".csv", ".xls", ".xlsx"]:
-                files.extend(path.glob(f"*{ext}"))
-                files.extend(path.glob(f"*{ext.upper()}"))
-        elif path.exists():
-            files.append(path)
-
     accounts: list[DetectedAccount] = []
     seen_cards: set[str] = set()
 
-    for filepath in files:
-        try:
-            content = read_file(filepath)
-        except Exception:
-            continue
+    # Account details live in the header, so only that much of each file is read
+    max_lines = ParserRegistry.max_header_lines()
 
-        # Try each parser to detect accounts
-        for parser_class in ParserRegistry.get_all_parsers():
-            if parser_class.can_parse(content, filepath):
-                detected = parser_class.detect_account(content)
-                if detected and detected.card_number not in seen_cards:
-                    accounts.append(detected)
-                    seen_cards.add(detected.card_number)
-                break
+    for filepath, header in _iter_headers(paths, max_lines):
+        # One pass detects the parser and reads the account from the header
+        detected = ParserRegistry.parse(header, filepath).account
+        if detected and detected.card_number not in seen_cards:
+            accounts.append(detected)
+            seen_cards.add(detected.card_number)
 
     return accounts
 
 
+def _iter_headers(paths: list[Path], max_lines: int) -> Iterator[tuple[Path, str]]:
+    """Yield the name and header of each export, looking inside archives."""
+    for filepath in iter_input_files(paths):
+        try:
+            if is_archive(filepath):
+                for member, data in iter_archive(filepath, STATEMENT_EXTENSIONS):
+                    name = member_path(filepath, member)
+                    try:
+                        yield name, load_bytes(data, name).head(max_lines)
+                    except ValueError:
+                        continue
+            else:
+                yield filepath, read_header(filepath, max_lines)
+        except Exception:
+            continue
+
+
 def fetch_lunchmoney_assets(api_key: str) -> list[dict[str, Any]]:
     """Fetch Lunch Money assets.
 
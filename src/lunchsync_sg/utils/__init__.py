@@ -1,10 +1,70 @@
 """Utility functions for lunchsync-sg."""
 
+from lunchsync_sg.utils.archive import is_archive, iter_archive, member_path
+from lunchsync_sg.utils.compression import (
+    DECOMPRESSION_ERRORS,
+    compression_kind,
+    decompress,
+    open_input,
+)
+from lunchsync_sg.utils.discovery import (
+    INPUT_EXTENSIONS,
+    STATEMENT_EXTENSIONS,
+    iter_input_files,
+)
+from lunchsync_sg.utils.mapped import MappedFile
 from lunchsync_sg.utils.parsing import (
+    DATE_FORMATS,
+    Cell,
+    DateParser,
+    FileContent,
+    cell_text,
     clean_description,
+    decode_text,
+    head_lines,
+    is_excel,
+    is_xlsx,
+    load_bytes,
+    load_file,
     parse_amount,
     parse_date,
     read_file,
+    read_header,
+    rows_to_text,
 )
+from lunchsync_sg.utils.stream import STDIN, TextStream
+from lunchsync_sg.utils.xlsx import XlsxReader
 
-__all__ = ["parse_date", "parse_amount", "clean_description", "read_file"]
+__all__ = [
+    "INPUT_EXTENSIONS",
+    "STATEMENT_EXTENSIONS",
+    "STDIN",
+    "DECOMPRESSION_ERRORS",
+    "DATE_FORMATS",
+    "Cell",
+    "DateParser",
+    "FileContent",
+    "MappedFile",
+    "parse_date",
+    "parse_amount",
+    "clean_description",
+    "compression_kind",
+    "decompress",
+    "cell_text",
+    "decode_text",
+    "head_lines",
+    "is_archive",
+    "is_excel",
+    "is_xlsx",
+    "iter_archive",
+    "iter_input_files",
+    "load_bytes",
+    "load_file",
+    "member_path",
+    "open_input",
+    "read_file",
+    "read_header",
+    "rows_to_text",
+    "TextStream",
+    "XlsxReader",
+]
@@ -0,0 +1,127 @@
+"""Reading bank exports directly from zip and tar archives."""
+
+import tarfile
+import zipfile
+from collections.abc import Iterator
+from pathlib import Path, PurePosixPath
+
+from lunchsync_sg.utils.compression import DECOMPRESSION_ERRORS
+
+# Archive extensions picked up from directories alongside plain exports
+ARCHIVE_EXTENSIONS = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+
+# Offset and value of the magic string in a POSIX tar header
+_TAR_MAGIC_OFFSET = 257
+_TAR_MAGIC = b"ustar"
+
+# Raised while reading a damaged zip member or archive
+_MEMBER_ERRORS: tuple[type[Exception], ...] = (*DECOMPRESSION_ERRORS, zipfile.BadZipFile)
+_ARCHIVE_ERRORS: tuple[type[Exception], ...] = (*_MEMBER_ERRORS, tarfile.TarError)
+
+
+def archive_kind(filepath: Path) -> str | None:
+    """
+    Identify a file as a "zip" or "tar" archive.
+
+    Zip packages that are .xlsx workbooks are not archives. Compressed tars
+    are recognised by extension, since their magic bytes are only those of
+    the compression format.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        "zip", "tar" or None
+    """
+    try:
+        with open(filepath, "rb") as f:
+            head = f.read(_TAR_MAGIC_OFFSET + len(_TAR_MAGIC))
+    except OSError:
+        return None
+
+    if head[:4] == b"PK\x03\x04":
+        try:
+            with zipfile.ZipFile(filepath) as zf:
+                names = set(zf.namelist())
+        except (OSError, zipfile.BadZipFile):
+            return None
+        return None if "xl/workbook.xml" in names else "zip"
+
+    if head[_TAR_MAGIC_OFFSET:] == _TAR_MAGIC:
+        return "tar"
+    name = filepath.name.lower()
+    if name.endswith(ARCHIVE_EXTENSIONS[2:]) and tarfile.is_tarfile(filepath):
+        return "tar"
+    return None
+
+
+def is_archive(filepath: Path) -> bool:
+    """Check whether a file is a zip or tar archive of exports."""
+    return archive_kind(filepath) is not None
+
+
+def member_path(archive: Path, member: str) -> Path:
+    """Get the name a member is reported under, as "archive!member"."""
+    return Path(f"{archive}!{member}")
+
+
+def _wanted(member: str, extensions: tuple[str, ...]) -> bool:
+    """Check whether an archive member looks like an export worth parsing."""
+    path = PurePosixPath(member)
+    if any(part.startswith((".", "__MACOSX")) for part in path.parts):
+        return False
+    return path.name.lower().endswith(extensions)
+
+
+def iter_archive(
+    filepath: Path, extensions: tuple[str, ...]
+) -> Iterator[tuple[str, bytes]]:
+    """
+    Yield the name and content of each export in an archive.
+
+    Members are read one at a time, so memory is bounded by the largest
+    member rather than the archive. Tar archives, compressed or not, are
+    read as a single forward stream.
+
+    Args:
+        filepath: Path to the archive
+        extensions: Member extensions to yield, compared case-insensitively
+
+    Yields:
+        Tuples of (member name, member bytes)
+
+    Raises:
+        ValueError: If the archive cannot be read
+    """
+    kind = archive_kind(filepath)
+    try:
+        if kind == "zip":
+            with zipfile.ZipFile(filepath) as zf:
+                for info in zf.infolist():
+                    if not info.is_dir() and _wanted(info.filename, extensions):
+                        yield info.filename, _read_member(zf, info, filepath)
+        elif kind == "tar":
+            with tarfile.open(filepath, "r|*") as tf:
+                for member in tf:
+                    if not member.isfile() or not _wanted(member.name, extensions):
+                        continue
+                    stream = tf.extractfile(member)
+                    if stream is not None:
+                        yield member.name, stream.read()
+        else:
+            raise ValueError(f"Not a zip or tar archive: {filepath}")
+    except _ARCHIVE_ERRORS as e:
+        raise ValueError(f"Could not read archive {filepath}: {e}") from e
+
+
+def _read_member(zf: zipfile.ZipFile, info: zipfile.ZipInfo, filepath: Path) -> bytes:
+    """
+    Read one zip member.
+
+    Raises:
+        ValueError: If the member is damaged, naming it as "archive!member"
+    """
+    try:
+        return zf.read(info)
+    except _MEMBER_ERRORS as e:
+        raise ValueError(f"Could not read file {member_path(filepath, info.filename)}: {e}") from e
@@ -0,0 +1,136 @@
+"""Transparent decompression of compressed exports."""
+
+import bz2
+import gzip
+import io
+import lzma
+import zlib
+from pathlib import Path
+from typing import IO, cast
+
+try:
+    from zstandard import ZstdError
+except ImportError:  # Optional dependency, only needed for .zst files
+    _ZSTD_ERRORS: tuple[type[Exception], ...] = ()
+else:
+    _ZSTD_ERRORS = (ZstdError,)
+
+# Magic bytes of supported compression formats
+_MAGIC = [
+    (b"\x1f\x8b", "gzip"),
+    (b"\xfd7zXZ\x00", "xz"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+]
+
+# Suffixes of compressed exports picked up from directories
+COMPRESSED_SUFFIXES = (".gz", ".bz2", ".xz", ".zst")
+
+# Errors raised by the decompressors on corrupt or truncated input; gzip
+# raises zlib.error when the deflate body is damaged
+DECOMPRESSION_ERRORS: tuple[type[Exception], ...] = (
+    OSError,
+    EOFError,
+    lzma.LZMAError,
+    zlib.error,
+    *_ZSTD_ERRORS,
+)
+
+
+def sniff_compression(data: bytes) -> str | None:
+    """
+    Identify a compression format from leading bytes.
+
+    Args:
+        data: At least the first 6 bytes of the content
+
+    Returns:
+        "gzip", "bz2", "xz", "zstd" or None
+    """
+    for magic, kind in _MAGIC:
+        if data.startswith(magic):
+            return kind
+    # "BZh" alone is plausible text, so also require the block size digit
+    if data[:3] == b"BZh" and b"1" <= data[3:4] <= b"9":
+        return "bz2"
+    return None
+
+
+def compression_kind(filepath: Path) -> str | None:
+    """Identify the compression format of a file by its magic bytes."""
+    try:
+        with open(filepath, "rb") as f:
+            return sniff_compression(f.read(6))
+    except OSError:
+        return None
+
+
+def _zstd_reader(raw: IO[bytes]) -> IO[bytes]:
+    """Wrap a stream in a zstd decompressor from the optional zstandard package."""
+    try:
+        import zstandard
+    except ImportError as err:
+        raise ValueError(
+            "zstandard is required to read .zst files. Install with: pip install zstandard"
+        ) from err
+
+    reader = zstandard.ZstdDecompressor().stream_reader(raw, closefd=True)
+    return io.BufferedReader(reader)
+
+
+def open_input(filepath: Path) -> IO[bytes]:
+    """
+    Open a file for binary reading, decompressing it on the fly if needed.
+
+    Args:
+        filepath: Path to the file
+
+    Returns:
+        Binary stream of the (decompressed) content
+
+    Raises:
+        ValueError: If the file cannot be opened
+    """
+    kind = compression_kind(filepath)
+    try:
+        # The decompressors' file objects are binary streams, if not typed as IO
+        if kind == "gzip":
+            return cast(IO[bytes], gzip.open(filepath, "rb"))
+        if kind == "bz2":
+            return cast(IO[bytes], bz2.open(filepath, "rb"))
+        if kind == "xz":
+            return cast(IO[bytes], lzma.open(filepath, "rb"))
+        if kind == "zstd":
+            return _zstd_reader(open(filepath, "rb"))  # noqa: SIM115 - closed by reader
+        return open(filepath, "rb")  # noqa: SIM115 - returned to the caller
+    except OSError as e:
+        raise ValueError(f"File not found: {filepath}") from e
+
+
+def decompress(data: bytes, filepath: Path) -> bytes:
+    """
+    Decompress content already in memory if it is compressed.
+
+    Args:
+        data: Raw bytes, compressed or not
+        filepath: Name of the file, used in error messages
+
+    Returns:
+        Decompressed bytes, or data unchanged if it is not compressed
+
+    Raises:
+        ValueError: If the content cannot be decompressed
+    """
+    kind = sniff_compression(data[:6])
+    if kind is None:
+        return data
+    try:
+        if kind == "gzip":
+            return gzip.decompress(data)
+        if kind == "bz2":
+            return bz2.decompress(data)
+        if kind == "xz":
+            return lzma.decompress(data)
+        with _zstd_reader(io.BytesIO(data)) as f:
+            return f.read()
+    except DECOMPRESSION_ERRORS as e:
+        raise ValueError(f"Could not decompress {filepath}: {e}") from e
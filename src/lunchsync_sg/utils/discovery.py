@@ -0,0 +1,112 @@
+"""Discovery of input files under files and directories."""
+
+import os
+from collections.abc import Iterable, Iterator, Sequence
+from fnmatch import fnmatch
+from pathlib import Path
+
+from lunchsync_sg.utils.archive import ARCHIVE_EXTENSIONS
+from lunchsync_sg.utils.compression import COMPRESSED_SUFFIXES
+from lunchsync_sg.utils.stream import STDIN
+
+# Extensions of single statement exports, plain or compressed
+STATEMENT_EXTENSIONS = tuple(
+    ext + suffix for ext in (".csv", ".xls", ".xlsx") for suffix in ("", *COMPRESSED_SUFFIXES)
+)
+
+# File extensions picked up from directories, compared case-insensitively
+INPUT_EXTENSIONS = STATEMENT_EXTENSIONS + ARCHIVE_EXTENSIONS
+
+
+def _matches(relative: str, name: str, patterns: Sequence[str]) -> bool:
+    """Check a path against globs, by its path relative to the root or its name."""
+    return any(fnmatch(relative, p) or fnmatch(name, p) for p in patterns)
+
+
+def iter_input_files(
+    paths: Iterable[Path],
+    extensions: Sequence[str] = INPUT_EXTENSIONS,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+    max_depth: int | None = 0,
+) -> Iterator[Path]:
+    """
+    Yield input files found under the given files and directories.
+
+    Each directory is listed once with os.scandir and paths are yielded as
+    they are found, so callers can start parsing before the walk finishes.
+    A file reachable more than once (overlapping inputs, symlinks) is
+    yielded only the first time. Paths given explicitly are always yielded
+    if they exist; include and exclude only filter directory contents. The
+    path "-" (standard input) is passed through once.
+
+    Args:
+        paths: Files and directories to scan
+        extensions: File extensions to pick up from directories
+        include: Globs a file must match, if any are given
+        exclude: Globs for files and directories to skip
+        max_depth: Levels of subdirectories to descend (0 = top level only,
+            None = unlimited)
+
+    Yields:
+        Paths of matching files
+    """
+    suffixes = tuple(ext.lower() for ext in extensions)
+    seen_files: set[tuple[int, int]] = set()
+    seen_dirs: set[tuple[int, int]] = set()
+    seen_stdin = False
+
+    def walk(directory: Path, prefix: str, depth: int) -> Iterator[Path]:
+        try:
+            stat = directory.stat()
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return
+
+        # Guard against symlink loops
+        if (stat.st_dev, stat.st_ino) in seen_dirs:
+            return
+        seen_dirs.add((stat.st_dev, stat.st_ino))
+
+        for entry in entries:
+            relative = prefix + entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                continue
+
+            if exclude and _matches(relative, entry.name, exclude):
+                continue
+
+            if is_dir:
+                if max_depth is None or depth < max_depth:
+                    yield from walk(Path(entry.path), relative + "/", depth + 1)
+                continue
+
+            if not entry.name.lower().endswith(suffixes):
+                continue
+            if include and not _matches(relative, entry.name, include):
+                continue
+            try:
+                entry_stat = entry.stat()
+            except OSError:
+                continue
+            key = (entry_stat.st_dev, entry_stat.st_ino)
+            if key not in seen_files:
+                seen_files.add(key)
+                yield Path(entry.path)
+
+    for path in paths:
+        if path == STDIN:
+            if not seen_stdin:
+                seen_stdin = True
+                yield path
+        elif path.is_dir():
+            yield from walk(path, "", 0)
+        elif path.exists():
+            path_stat = path.stat()
+            key = (path_stat.st_dev, path_stat.st_ino)
+            if key not in seen_files:
+                seen_files.add(key)
+                yield path
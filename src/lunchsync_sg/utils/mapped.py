@@ -0,0 +1,210 @@
+"""Memory-mapped reading of large text exports."""
+
+import codecs
+import mmap
+from collections.abc import Iterator
+from itertools import chain, islice
+from pathlib import Path
+from types import TracebackType
+
+from lunchsync_sg.utils.parsing import BOMS, FALLBACK_ENCODINGS
+
+# Bytes decoded per step; bounds the size of any intermediate string
+CHUNK_SIZE = 1024 * 1024
+
+# Leading bytes checked to pick an encoding for files without a BOM
+SNIFF_SIZE = 64 * 1024
+
+
+class MappedFile:
+    """
+    Read-only memory map of a text export.
+
+    Lines are decoded lazily from the mapped bytes, so the file is never
+    materialised as one Python string. Use as a context manager:
+
+        with MappedFile(path) as mapped:
+            for line in mapped.iter_lines():
+                ...
+    """
+
+    def __init__(self, filepath: Path) -> None:
+        """
+        Map the file and detect its encoding from its leading bytes.
+
+        Args:
+            filepath: Path to the text file
+
+        Raises:
+            ValueError: If the file cannot be opened or decoded
+        """
+        self.filepath = filepath
+        try:
+            self._file = open(filepath, "rb")  # noqa: SIM115 - closed in close()
+        except OSError as e:
+            raise ValueError(f"File not found: {filepath}") from e
+
+        self._map: mmap.mmap | None = None
+        try:
+            if filepath.stat().st_size > 0:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.encoding = self._detect_encoding()
+        except (OSError, ValueError):
+            self.close()
+            raise
+
+    def __enter__(self) -> "MappedFile":
+        """Enter the context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Unmap and close the file."""
+        self.close()
+
+    def close(self) -> None:
+        """Unmap and close the file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+    @property
+    def size(self) -> int:
+        """Size of the mapped file in bytes."""
+        return len(self._map) if self._map is not None else 0
+
+    def _chunks(self) -> Iterator[bytes]:
+        """Yield the mapped bytes in bounded chunks."""
+        if self._map is None:
+            return
+        for start in range(0, len(self._map), CHUNK_SIZE):
+            yield self._map[start : start + CHUNK_SIZE]
+
+    def _blocks(self) -> Iterator[bytes]:
+        """
+        Yield the mapped bytes in bounded blocks of whole lines.
+
+        Each block ends just after a line break, so it can be decoded on its
+        own by the ASCII-compatible fallback encodings. A line longer than
+        CHUNK_SIZE is carried into the next block.
+        """
+        carry = b""
+        for chunk in self._chunks():
+            block = carry + chunk
+            cut = max(block.rfind(b"\n"), block.rfind(b"\r")) + 1
+            if cut:
+                yield block[:cut]
+            carry = block[cut:]
+        if carry:
+            yield carry
+
+    def _detect_encoding(self) -> str:
+        """
+        Detect the encoding from a BOM or the first SNIFF_SIZE bytes.
+
+        Without a BOM only a bounded prefix is checked; iter_lines moves to
+        the next fallback encoding if a later block fails to decode.
+        """
+        prefix = self._map[:SNIFF_SIZE] if self._map is not None else b""
+        for bom, encoding in BOMS:
+            if prefix.startswith(bom):
+                return encoding
+
+        for encoding in FALLBACK_ENCODINGS:
+            try:
+                # Not final: the prefix may end inside a multibyte character
+                codecs.getincrementaldecoder(encoding)().decode(prefix)
+            except UnicodeDecodeError:
+                continue
+            return encoding
+
+        raise ValueError(f"Could not decode file {self.filepath} with any known encoding")
+
+    def _texts(self) -> Iterator[str]:
+        """
+        Decode the mapped bytes in bounded pieces.
+
+        A file with a BOM is decoded incrementally with its BOM's encoding.
+        Otherwise each block of lines is decoded with the current encoding,
+        moving to the next fallback encoding from the first block that fails,
+        as TextStream does line by line.
+
+        Raises:
+            ValueError: If the bytes cannot be decoded
+        """
+        if self.encoding not in FALLBACK_ENCODINGS:
+            decoder = codecs.getincrementaldecoder(self.encoding)()
+            for chunk in chain(self._chunks(), [b""]):
+                try:
+                    text = decoder.decode(chunk, final=not chunk)
+                except UnicodeDecodeError as e:
+                    raise ValueError(
+                        f"Could not decode file {self.filepath} as {self.encoding}"
+                    ) from e
+                yield text
+            return
+
+        fallbacks = FALLBACK_ENCODINGS[FALLBACK_ENCODINGS.index(self.encoding) + 1 :]
+        for block in self._blocks():
+            while True:
+                try:
+                    text = block.decode(self.encoding)
+                    break
+                except UnicodeDecodeError as e:
+                    if not fallbacks:
+                        raise ValueError(
+                            f"Could not decode file {self.filepath} with any known encoding"
+                        ) from e
+                    self.encoding = fallbacks.pop(0)
+            yield text
+
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Yield decoded lines, each ending in "\\n" except possibly the last.
+
+        Line endings are normalized to "\\n" as text-mode reads would.
+
+        Raises:
+            ValueError: If the bytes cannot be decoded
+        """
+        pending = ""
+        for piece in self._texts():
+            text = pending + piece
+            # A "\r" at the end may be the first half of "\r\n" in the next piece
+            if text.endswith("\r"):
+                text, pending = text[:-1], "\r"
+            else:
+                pending = ""
+            if "\r" in text:
+                text = text.replace("\r\n", "\n").replace("\r", "\n")
+
+            *lines, partial = text.split("\n")
+            for line in lines:
+                yield line + "\n"
+            pending = partial + pending
+
+        if pending:
+            pending = pending.replace("\r\n", "\n").replace("\r", "\n")
+            *lines, partial = pending.split("\n")
+            for line in lines:
+                yield line + "\n"
+            if partial:
+                yield partial
+
+    def head(self, max_lines: int) -> str:
+        """
+        Return the first lines of the file, like head_lines on the full text.
+
+        Args:
+            max_lines: Maximum number of lines to return
+
+        Returns:
+            Prefix of the file content holding at most max_lines lines
+        """
+        text = "".join(islice(self.iter_lines(), max_lines))
+        return text.removesuffix("\n") if text.count("\n") >= max_lines else text
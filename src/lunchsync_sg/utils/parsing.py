@@ -1,9 +1,93 @@
 """Parsing utilities for bank transaction files."""
 
+import codecs
+import io
 import re
+from collections.abc import Iterable, Sequence
 from datetime import date, datetime
 from decimal import Decimal, InvalidOperation
+from itertools import islice
 from pathlib import Path
+from typing import IO, TYPE_CHECKING
+
+from lunchsync_sg.utils.compression import (
+    DECOMPRESSION_ERRORS,
+    compression_kind,
+    decompress,
+    open_input,
+)
+
+if TYPE_CHECKING:
+    from lunchsync_sg.cache import ConversionCache
+
+# Byte order marks checked before anything else, longest first
+BOMS = [
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
+# Tried in order on files without a BOM; latin-1 accepts any byte sequence
+FALLBACK_ENCODINGS = ["utf-8", "cp1252", "latin-1"]
+
+# A spreadsheet cell: text, a number, or a date already converted from Excel
+Cell = str | float | date
+
+
+class FileContent:
+    """
+    File content together with details of how it was read.
+
+    Text files carry their decoded text. Spreadsheets carry typed rows, and
+    their CSV text is only built when something asks for it.
+    """
+
+    def __init__(
+        self,
+        text: str | None = None,
+        encoding: str | None = None,
+        rows: list[list[Cell]] | None = None,
+    ) -> None:
+        """
+        Initialize file content.
+
+        Args:
+            text: Decoded text (text files)
+            encoding: Detected encoding, None for spreadsheets
+            rows: Typed cell rows (spreadsheets)
+        """
+        self._text = text
+        self.encoding = encoding
+        self.rows = rows
+
+    @property
+    def text(self) -> str:
+        """Content as text; spreadsheet rows are converted to CSV on first use."""
+        if self._text is None:
+            self._text = rows_to_text(self.rows or [])
+        return self._text
+
+    def head(self, max_lines: int) -> str:
+        """Return the first lines of the text without converting every row."""
+        if self._text is None and self.rows is not None:
+            # Every row is at least one line, so max_lines rows are enough
+            return head_lines(rows_to_text(self.rows[:max_lines]), max_lines)
+        return head_lines(self.text, max_lines)
+
+
+# Date formats found in bank exports, tried in order
+DATE_FORMATS = (
+    "%d/%m/%Y",  # 30/01/2026
+    "%d %b %Y",  # 30 Jan 2026
+    "%d-%m-%Y",  # 30-01-2026
+    "%Y-%m-%d",  # 2026-01-30
+    "%d %B %Y",  # 30 January 2026
+)
+
+
+def _clean_date(date_str: str) -> str:
+    """Strip whitespace and quotes around a date cell."""
+    return date_str.strip().strip('"').strip()
 
 
 def parse_date(date_str: str) -> date | None:
@@ -22,20 +106,12 @@ def parse_date(date_str: str) -> date | None:
     Returns:
         date object if successful, None otherwise
     """
-    date_str = date_str.strip().strip('"').strip()
+    date_str = _clean_date(date_str)
 
     if not date_str:
         return None
 
-    formats = [
-        "%d/%m/%Y",  # 30/01/2026
-        "%d %b %Y",  # 30 Jan 2026
-        "%d-%m-%Y",  # 30-01-2026
-        "%Y-%m-%d",  # 2026-01-30
-        "%d %B %Y",  # 30 January 2026
-    ]
-
-    for fmt in formats:
+    for fmt in DATE_FORMATS:
         try:
             return datetime.strptime(date_str, fmt).date()
         except ValueError:
@@ -44,6 +120,57 @@ def parse_date(date_str: str) -> date | None:
     return None
 
 
+class DateParser:
+    """
+    Date parser that learns the format of one file.
+
+    Exports write every date the same way, so once a format parses a row
+    it is tried alone on the next ones; the other formats are only probed
+    (and the winner locked in instead) when it fails. Results are the same
+    as parse_date's. Use a new instance per file.
+
+        parse = DateParser()
+        for row in rows:
+            date_val = parse(row[0])
+    """
+
+    def __init__(self) -> None:
+        """Initialize with no format learned yet."""
+        self.format: str | None = None
+
+    def __call__(self, date_str: str) -> date | None:
+        """
+        Parse a date, trying the learned format first.
+
+        Args:
+            date_str: Date string to parse
+
+        Returns:
+            date object if successful, None otherwise
+        """
+        date_str = _clean_date(date_str)
+        if not date_str:
+            return None
+
+        learned = self.format
+        if learned is not None:
+            try:
+                return datetime.strptime(date_str, learned).date()
+            except ValueError:
+                pass
+
+        for fmt in DATE_FORMATS:
+            if fmt == learned:
+                continue
+            try:
+                parsed = datetime.strptime(date_str, fmt).date()
+            except ValueError:
+                continue
+            self.format = fmt
+            return parsed
+        return None
+
+
 def parse_amount(amount_str: str) -> Decimal | None:
     """
     Parse amount string to Decimal.
@@ -128,6 +255,77 @@ def clean_description(desc: str) -> str:
     return desc.strip()
 
 
+def head_lines(content: str, max_lines: int) -> str:
+    """
+    Return the first lines of content without splitting the rest of it.
+
+    Args:
+        content: Text to take the prefix of
+        max_lines: Maximum number of lines to keep
+
+    Returns:
+        Prefix of content holding at most max_lines lines
+    """
+    if max_lines <= 0:
+        return ""
+
+    end = -1
+    for _ in range(max_lines):
+        end = content.find("\n", end + 1)
+        if end == -1:
+            return content
+    return content[:end]
+
+
+def read_header(filepath: Path, max_lines: int) -> str:
+    """
+    Read only the leading lines of a file.
+
+    Text files are read up to max_lines lines, so large exports are never
+    loaded in full; compressed files are decompressed only that far. Only the
+    leading rows of .xlsx workbooks are read; legacy .xls files have to be
+    converted whole and are then cut.
+
+    Args:
+        filepath: Path to the file
+        max_lines: Maximum number of lines to return
+
+    Returns:
+        Header of the file content as string
+
+    Raises:
+        ValueError: If file cannot be read
+    """
+    if is_xlsx(filepath):
+        return _xlsx_header(filepath, max_lines)
+    if is_excel(filepath):
+        return load_file(filepath).head(max_lines)
+
+    try:
+        with open_input(filepath) as f:
+            data = b"".join(islice(f, max_lines))
+            kind = _sniff_excel(data[:8], Path())
+            if kind == "xlsx":
+                # A compressed workbook; the zip needs all of its bytes
+                return _xlsx_header(io.BytesIO(data + f.read()), max_lines)
+            if kind is not None:
+                return load_bytes(data + f.read(), filepath).head(max_lines)
+    except DECOMPRESSION_ERRORS as e:
+        raise ValueError(f"Could not read file {filepath}: {e}") from e
+
+    text, _ = decode_text(data, filepath)
+    return head_lines(text, max_lines)
+
+
+def _xlsx_header(source: Path | IO[bytes], max_lines: int) -> str:
+    """Read the leading rows of an .xlsx workbook as header text."""
+    from lunchsync_sg.utils.xlsx import XlsxReader
+
+    with XlsxReader(source) as reader:
+        # Every row is at least one line, so max_lines rows are enough
+        return head_lines(rows_to_text(reader.head_rows(max_lines)), max_lines)
+
+
 def read_file(filepath: Path) -> str:
     """
     Read file content, handling both text and Excel files.
@@ -141,46 +339,208 @@ def read_file(filepath: Path) -> str:
     Raises:
         ValueError: If file cannot be read
     """
+    return load_file(filepath).text
+
+
+def load_file(filepath: Path, cache: "ConversionCache | None" = None) -> FileContent:
+    """
+    Read file content and record how it was decoded.
+
+    Args:
+        filepath: Path to the file
+        cache: Optional cache of converted .xls rows
+
+    Returns:
+        FileContent with the text and detected encoding, or typed rows for
+        Excel files
+
+    Raises:
+        ValueError: If file cannot be read
+    """
+    if compression_kind(filepath) is not None:
+        return load_bytes(_read_bytes(filepath), filepath)
+    if is_xlsx(filepath):
+        from lunchsync_sg.utils.xlsx import XlsxReader
+
+        with XlsxReader(filepath) as reader:
+            return FileContent(rows=list(reader.iter_rows()))
+    elif is_excel(filepath):
+        rows = cache.get(filepath) if cache is not None else None
+        if rows is None:
+            rows = _read_excel_rows(filepath)
+            if cache is not None:
+                cache.put(filepath, rows)
+        return FileContent(rows=rows)
+    else:
+        text, encoding = _read_text(filepath)
+        return FileContent(text=text, encoding=encoding)
+
+
+def load_bytes(data: bytes, filepath: Path) -> FileContent:
+    """
+    Load file content already read into memory, such as an archive member.
+
+    Compressed content is decompressed first.
+
+    Args:
+        data: Raw file bytes
+        filepath: Name of the file, used for type detection and error messages
+
+    Returns:
+        FileContent with the text and detected encoding, or typed rows for
+        Excel files
+
+    Raises:
+        ValueError: If the content cannot be read
+    """
+    data = decompress(data, filepath)
+    kind = _sniff_excel(data[:8], filepath)
+    if kind == "xlsx":
+        from lunchsync_sg.utils.xlsx import XlsxReader
+
+        with XlsxReader(io.BytesIO(data)) as reader:
+            return FileContent(rows=list(reader.iter_rows()))
+    elif kind == "xls":
+        return FileContent(rows=_read_excel_rows(filepath, data))
+    else:
+        text, encoding = decode_text(data, filepath)
+        return FileContent(text=text, encoding=encoding)
+
+
+def decode_text(data: bytes, filepath: Path | None = None) -> tuple[str, str]:
+    """
+    Decode raw file bytes, detecting the encoding from the same buffer.
+
+    A BOM decides the encoding outright. Otherwise the bytes are validated as
+    UTF-8 and, failing that, decoded as Windows-1252 or Latin-1. Line endings
+    are normalized to "\\n" as text-mode reads would.
+
+    Args:
+        data: Raw file bytes
+        filepath: Optional path, used in error messages
+
+    Returns:
+        Tuple of (decoded text, encoding name)
+
+    Raises:
+        ValueError: If the bytes cannot be decoded
+    """
+    candidates = FALLBACK_ENCODINGS
+    for bom, bom_encoding in BOMS:
+        if data.startswith(bom):
+            candidates = [bom_encoding]
+            break
+
+    for encoding in candidates:
+        try:
+            text = data.decode(encoding)
+        except UnicodeDecodeError:
+            continue
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text, encoding
+
+    raise ValueError(f"Could not decode file {filepath} with any known encoding")
+
+
+def is_excel(filepath: Path) -> bool:
+    """Check whether a file is an Excel workbook (.xls or .xlsx)."""
+    return _excel_kind(filepath) is not None
+
+
+def is_xlsx(filepath: Path) -> bool:
+    """Check whether a file is an .xlsx workbook rather than a legacy .xls."""
+    return _excel_kind(filepath) == "xlsx"
+
+
+def _excel_kind(filepath: Path) -> str | None:
+    """Identify an Excel file as "xls" or "xlsx" by magic bytes, then extension."""
     # Check if it's an Excel file by magic bytes
-    is_xls = False
     try:
         with open(filepath, "rb") as f:
             magic = f.read(8)
-            # OLE2 magic bytes (used by .xls)
-            if magic[:4] == b"\xd0\xcf\x11\xe0" or magic[:4] == b"PK\x03\x04":
-                is_xls = True
     except Exception:
-        pass
+        magic = b""
+
+    return _sniff_excel(magic, filepath)
+
+
+def _sniff_excel(magic: bytes, filepath: Path) -> str | None:
+    """Identify leading bytes as "xls" or "xlsx", falling back to the extension."""
+    # OLE2 magic bytes (used by .xls); .xlsx is a zip package
+    if magic[:4] == b"\xd0\xcf\x11\xe0":
+        return "xls"
+    if magic[:4] == b"PK\x03\x04":
+        return "xlsx"
 
     # Also check extension
-    if filepath.suffix.lower() in [".xls", ".xlsx"]:
-        is_xls = True
+    suffix = filepath.suffix.lower()
+    if suffix in [".xls", ".xlsx"]:
+        return suffix[1:]
 
-    if is_xls:
-        return _read_excel(filepath)
-    else:
-        return _read_text(filepath)
+    return None
 
 
-def _read_text(filepath: Path) -> str:
-    """Read text file with encoding detection."""
-    if not filepath.exists():
-        raise ValueError(f"File not found: {filepath}")
+def _read_text(filepath: Path) -> tuple[str, str]:
+    """Read text file in one pass and detect its encoding."""
+    try:
+        data = filepath.read_bytes()
+    except OSError as e:
+        raise ValueError(f"File not found: {filepath}") from e
 
-    encodings = ["utf-8-sig", "utf-8", "latin-1", "cp1252"]
+    return decode_text(data, filepath)
 
-    for encoding in encodings:
-        try:
-            with open(filepath, encoding=encoding) as f:
-                return f.read()
-        except UnicodeDecodeError:
-            continue
 
-    raise ValueError(f"Could not decode file {filepath} with any known encoding")
+def _read_bytes(filepath: Path) -> bytes:
+    """Read a file's content, decompressing it as a stream if needed."""
+    try:
+        with open_input(filepath) as f:
+            return f.read()
+    except DECOMPRESSION_ERRORS as e:
+        raise ValueError(f"Could not read file {filepath}: {e}") from e
 
 
-def _read_excel(filepath: Path) -> str:
-    """Read Excel file and convert to CSV string."""
+def cell_text(cell: Cell) -> str:
+    """
+    Format a spreadsheet cell the way it appears in converted CSV text.
+
+    Args:
+        cell: Typed cell value
+
+    Returns:
+        Cell as string (dates as DD MMM YYYY)
+    """
+    if isinstance(cell, date):
+        return cell.strftime("%d %b %Y")
+    return str(cell)
+
+
+def rows_to_text(rows: Iterable[Sequence[Cell]]) -> str:
+    """
+    Convert typed spreadsheet rows to CSV text.
+
+    Args:
+        rows: Rows of typed cells
+
+    Returns:
+        CSV string, one line per row
+    """
+    lines = []
+    for row in rows:
+        row_data = []
+        for cell in row:
+            value = cell_text(cell)
+            # Escape commas in values
+            if "," in value or '"' in value or "\n" in value:
+                value = '"' + value.replace('"', '""') + '"'
+            row_data.append(value)
+        lines.append(",".join(row_data))
+
+    return "\n".join(lines)
+
+
+def _read_excel_rows(filepath: Path, data: bytes | None = None) -> list[list[Cell]]:
+    """Read the first sheet of an Excel file, or of its bytes, as typed rows."""
     try:
         import xlrd  # type: ignore[import-untyped]
     except ImportError as err:
@@ -189,29 +549,30 @@ def _read_excel(filepath: Path) -> str:
         ) from err
 
     try:
-        wb = xlrd.open_workbook(str(filepath))
+        if data is not None:
+            wb = xlrd.open_workbook(file_contents=data)
+        else:
+            wb = xlrd.open_workbook(str(filepath))
         sheet = wb.sheet_by_index(0)
 
-        lines = []
+        rows: list[list[Cell]] = []
         for row in range(sheet.nrows):
-            row_data = []
+            row_data: list[Cell] = []
             for col in range(sheet.ncols):
                 cell = sheet.cell(row, col)
                 if cell.ctype == xlrd.XL_CELL_DATE:
                     try:
                         dt = xlrd.xldate_as_datetime(cell.value, wb.datemode)
-                        row_data.append(dt.strftime("%d %b %Y"))
+                        row_data.append(dt.date())
                     except Exception:
-                        row_data.append(str(cell.value))
+                        row_data.append(cell.value)
+                elif cell.ctype == xlrd.XL_CELL_NUMBER:
+                    row_data.append(cell.value)
                 else:
-                    # Escape commas in values
-                    value = str(cell.value)
-                    if "," in value or '"' in value or "\n" in value:
-                        value = '"' + value.replace('"', '""') + '"'
-                    row_data.append(value)
-            lines.append(",".join(row_data))
-
-        return "\n".join(lines)
+                    row_data.append(str(cell.value))
+            rows.append(row_data)
+
+        return rows
 
     except Exception as e:
         raise ValueError(f"Could not read Excel file {filepath}: {e}") from e
@@ -0,0 +1,130 @@
+"""Incremental reading of exports piped through standard input."""
+
+from collections.abc import Iterator
+from itertools import islice
+from pathlib import Path
+from typing import IO
+
+from lunchsync_sg.utils.parsing import BOMS, FALLBACK_ENCODINGS, _sniff_excel
+
+# Input path that stands for standard input
+STDIN = Path("-")
+
+
+def _split_lines(text: str) -> Iterator[str]:
+    """Normalize line endings and yield lines, each ending in "\\n" but the last."""
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    *lines, partial = text.split("\n")
+    for line in lines:
+        yield line + "\n"
+    if partial:
+        yield partial
+
+
+class TextStream:
+    """
+    Text export read line by line from a binary stream such as stdin.
+
+    Nothing is buffered beyond the lines already read, so parsing can start
+    while the producer is still writing. A stream cannot be re-read, so
+    without a BOM lines are decoded as UTF-8 until one fails, then with the
+    next fallback encoding from there on.
+
+        stream = TextStream(sys.stdin.buffer)
+        header = stream.head(20)
+        for line in stream.iter_lines():
+            ...
+    """
+
+    def __init__(self, stream: IO[bytes], name: Path = Path("<stdin>")) -> None:
+        """
+        Start reading a stream and sniff its leading bytes.
+
+        Args:
+            stream: Binary stream to read
+            name: Name used in error messages
+        """
+        self.name = name
+        self._stream = stream
+        first = stream.readline()
+        self.excel_kind = _sniff_excel(first[:8], name)
+
+        self._encodings = list(FALLBACK_ENCODINGS)
+        for bom, encoding in BOMS:
+            if first.startswith(bom):
+                self._encodings = [encoding]
+                break
+        # UTF-16 cannot be split on b"\n", so it is decoded whole
+        if self._encodings == ["utf-16"]:
+            first += stream.read()
+
+        self._raw_first: bytes | None = first
+        self._lines = self._read_lines()
+        self._buffer: list[str] = []
+
+    @property
+    def encoding(self) -> str:
+        """Encoding used for the lines decoded so far."""
+        return self._encodings[0]
+
+    def read_bytes(self) -> bytes:
+        """
+        Read the rest of the stream, including what was sniffed, as bytes.
+
+        Used for spreadsheets, which cannot be parsed from a stream.
+        """
+        first, self._raw_first = self._raw_first or b"", None
+        return first + self._stream.read()
+
+    def _decode(self, raw: bytes) -> str:
+        """Decode a raw line, moving to the next fallback encoding on failure."""
+        while True:
+            try:
+                return raw.decode(self._encodings[0])
+            except UnicodeDecodeError as e:
+                if len(self._encodings) == 1:
+                    raise ValueError(
+                        f"Could not decode {self.name} with any known encoding"
+                    ) from e
+                self._encodings.pop(0)
+
+    def _read_lines(self) -> Iterator[str]:
+        """Yield decoded lines straight from the stream."""
+        if self._raw_first is None:
+            return
+        first, self._raw_first = self._raw_first, None
+        yield from _split_lines(self._decode(first))
+        for raw in self._stream:
+            yield from _split_lines(self._decode(raw))
+
+    def head(self, max_lines: int) -> str:
+        """
+        Return the first lines of the stream, like head_lines on the full text.
+
+        The lines are kept and yielded again by iter_lines.
+
+        Args:
+            max_lines: Maximum number of lines to return
+
+        Returns:
+            Prefix of the content holding at most max_lines lines
+
+        Raises:
+            ValueError: If the lines cannot be decoded
+        """
+        if len(self._buffer) < max_lines:
+            self._buffer.extend(islice(self._lines, max_lines - len(self._buffer)))
+        text = "".join(self._buffer[:max_lines])
+        return text.removesuffix("\n") if text.count("\n") >= max_lines else text
+
+    def iter_lines(self) -> Iterator[str]:
+        """
+        Yield decoded lines, each ending in "\\n" except possibly the last.
+
+        Raises:
+            ValueError: If a line cannot be decoded
+        """
+        buffered, self._buffer = self._buffer, []
+        yield from buffered
+        yield from self._lines
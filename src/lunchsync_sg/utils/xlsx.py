@@ -0,0 +1,278 @@
+"""Streaming reader for .xlsx workbooks."""
+
+import posixpath
+import re
+import zipfile
+from collections.abc import Generator
+from datetime import date, datetime, timedelta
+from itertools import islice
+from pathlib import Path
+from types import TracebackType
+from typing import IO
+from xml.etree.ElementTree import Element, iterparse, parse
+
+from lunchsync_sg.utils.compression import DECOMPRESSION_ERRORS
+from lunchsync_sg.utils.parsing import Cell
+
+_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+_PKG_REL_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+
+# Built-in number formats that display dates or times
+_DATE_FORMAT_IDS = frozenset(range(14, 23)) | frozenset(range(45, 48))
+
+# Quoted literals, escaped characters and [colour]/[locale] sections in format codes
+_FORMAT_NOISE = re.compile(r'"[^"]*"|\\.|\[[^\]]*\]')
+
+_CELL_REF = re.compile(r"([A-Z]+)(\d+)")
+
+# Raised while streaming a damaged or malformed sheet
+_SHEET_ERRORS: tuple[type[Exception], ...] = (
+    *DECOMPRESSION_ERRORS,
+    KeyError,
+    ValueError,
+    SyntaxError,
+    zipfile.BadZipFile,
+)
+
+
+def _column_index(letters: str) -> int:
+    """Convert a column reference such as "AB" to a zero-based index."""
+    index = 0
+    for char in letters:
+        index = index * 26 + (ord(char) - 64)
+    return index - 1
+
+
+def _is_date_format(format_code: str) -> bool:
+    """Check whether a custom number format code displays a date."""
+    code = _FORMAT_NOISE.sub("", format_code).lower()
+    return any(char in code for char in "dmy")
+
+
+def _text(element: Element) -> str:
+    """Concatenate the <t> runs of a string item, skipping phonetic hints."""
+    parts = []
+    for child in element.iter():
+        if child.tag == f"{_NS}t" and child.text:
+            parts.append(child.text)
+        elif child.tag == f"{_NS}rPh":
+            break
+    return "".join(parts)
+
+
+class XlsxReader:
+    """
+    Read-only, streaming reader for the first sheet of an .xlsx workbook.
+
+    Worksheet XML is parsed incrementally and each row is discarded once
+    yielded, so memory stays bounded by the shared string table rather than
+    the size of the sheet. Rows match the .xls reader: cells are strings,
+    floats or dates, padded to the sheet width.
+
+        with XlsxReader(path) as reader:
+            for row in reader.iter_rows():
+                ...
+    """
+
+    def __init__(self, source: Path | IO[bytes]) -> None:
+        """
+        Open the workbook and load its shared strings and styles.
+
+        Args:
+            source: Path or binary file object of the .xlsx file
+
+        Raises:
+            ValueError: If the workbook cannot be read
+        """
+        self._name = str(source) if isinstance(source, Path) else "workbook"
+        try:
+            self._zip = zipfile.ZipFile(source)
+        except (OSError, zipfile.BadZipFile) as e:
+            raise ValueError(f"Could not read Excel file {self._name}: {e}") from e
+
+        try:
+            self._sheet_path, self._epoch = self._read_workbook()
+            self._shared_strings = self._read_shared_strings()
+            self._date_styles = self._read_date_styles()
+        except Exception as e:
+            self.close()
+            raise ValueError(f"Could not read Excel file {self._name}: {e}") from e
+
+    def __enter__(self) -> "XlsxReader":
+        """Enter the context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Close the workbook."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the workbook."""
+        self._zip.close()
+
+    def _read_workbook(self) -> tuple[str, datetime]:
+        """Find the first sheet's part name and the workbook's date epoch."""
+        workbook = self._parse("xl/workbook.xml")
+        pr = workbook.find(f"{_NS}workbookPr")
+        date1904 = pr is not None and pr.get("date1904") in ("1", "true")
+        epoch = datetime(1904, 1, 1) if date1904 else datetime(1899, 12, 30)
+
+        sheet = workbook.find(f"{_NS}sheets/{_NS}sheet")
+        names = set(self._zip.namelist())
+        if sheet is not None and "xl/_rels/workbook.xml.rels" in names:
+            rel_id = sheet.get(f"{_REL_NS}id")
+            rels = self._parse("xl/_rels/workbook.xml.rels")
+            for rel in rels.iter(f"{_PKG_REL_NS}Relationship"):
+                if rel.get("Id") == rel_id:
+                    target = rel.get("Target", "")
+                    if target.startswith("/"):
+                        return target.lstrip("/"), epoch
+                    return posixpath.normpath(posixpath.join("xl", target)), epoch
+
+        return "xl/worksheets/sheet1.xml", epoch
+
+    def _read_shared_strings(self) -> list[str]:
+        """Load the shared string table, streaming over its items."""
+        if "xl/sharedStrings.xml" not in self._zip.namelist():
+            return []
+
+        strings: list[str] = []
+        with self._zip.open("xl/sharedStrings.xml") as f:
+            for _, element in iterparse(f):
+                if element.tag == f"{_NS}si":
+                    strings.append(_text(element))
+                    element.clear()
+        return strings
+
+    def _read_date_styles(self) -> frozenset[int]:
+        """Find the cell style indexes whose number format is a date."""
+        if "xl/styles.xml" not in self._zip.namelist():
+            return frozenset()
+
+        styles = self._parse("xl/styles.xml")
+        custom_dates = {
+            int(fmt.get("numFmtId", "0"))
+            for fmt in styles.iter(f"{_NS}numFmt")
+            if _is_date_format(fmt.get("formatCode", ""))
+        }
+
+        cell_xfs = styles.find(f"{_NS}cellXfs")
+        if cell_xfs is None:
+            return frozenset()
+
+        return frozenset(
+            index
+            for index, xf in enumerate(cell_xfs.iter(f"{_NS}xf"))
+            if (fmt_id := int(xf.get("numFmtId", "0"))) in _DATE_FORMAT_IDS
+            or fmt_id in custom_dates
+        )
+
+    def _parse(self, name: str) -> Element:
+        """Parse a small workbook part in full."""
+        with self._zip.open(name) as f:
+            return parse(f).getroot()
+
+    def _cell_value(self, cell: Element) -> Cell:
+        """Convert a <c> element to a typed cell value."""
+        cell_type = cell.get("t", "n")
+        if cell_type == "inlineStr":
+            inline = cell.find(f"{_NS}is")
+            return _text(inline) if inline is not None else ""
+
+        value = cell.findtext(f"{_NS}v")
+        if value is None:
+            return ""
+        if cell_type == "s":
+            index = int(value)
+            if not 0 <= index < len(self._shared_strings):
+                raise ValueError(f"shared string {index} does not exist")
+            return self._shared_strings[index]
+        if cell_type == "b":
+            return str(int(value))
+        if cell_type == "d":
+            return date.fromisoformat(value[:10])
+        if cell_type in ("str", "e"):
+            return value
+
+        number = float(value)
+        if int(cell.get("s", "0")) in self._date_styles:
+            try:
+                return (self._epoch + timedelta(days=number)).date()
+            except OverflowError:
+                return number
+        return number
+
+    def head_rows(self, max_rows: int) -> list[list[Cell]]:
+        """
+        Read only the first rows of the sheet.
+
+        Args:
+            max_rows: Maximum number of rows to return
+
+        Returns:
+            Leading rows of the sheet
+        """
+        rows = self.iter_rows()
+        try:
+            return list(islice(rows, max_rows))
+        finally:
+            rows.close()
+
+    def iter_rows(self) -> Generator[list[Cell], None, None]:
+        """
+        Yield the rows of the first sheet in order.
+
+        Each call streams the sheet again from the start, so the reader can
+        be used once for detection and again for parsing.
+
+        Raises:
+            ValueError: If the sheet is damaged or refers to missing strings
+        """
+        width = 0
+        next_row = 0
+        sheet_data: Element | None = None
+        try:
+            with self._zip.open(self._sheet_path) as f:
+                for event, element in iterparse(f, events=("start", "end")):
+                    if event == "start":
+                        if element.tag == f"{_NS}sheetData":
+                            sheet_data = element
+                        continue
+                    if element.tag == f"{_NS}dimension":
+                        last = element.get("ref", "").rpartition(":")[2]
+                        match = _CELL_REF.fullmatch(last)
+                        if match:
+                            width = _column_index(match.group(1)) + 1
+                        continue
+                    if element.tag != f"{_NS}row":
+                        continue
+
+                    ref = element.get("r")
+                    row_number = int(ref) - 1 if ref else next_row
+                    cells: list[Cell] = []
+                    for cell in element.iter(f"{_NS}c"):
+                        match = _CELL_REF.match(cell.get("r", ""))
+                        column = _column_index(match.group(1)) if match else len(cells)
+                        if column > len(cells):
+                            cells.extend([""] * (column - len(cells)))
+                        cells.append(self._cell_value(cell))
+                    # Drop the finished row so the tree never holds more than one
+                    element.clear()
+                    if sheet_data is not None:
+                        sheet_data.remove(element)
+
+                    # Rows with no cells are left out of the XML; xlrd yields them empty
+                    width = max(width, len(cells))
+                    for _ in range(next_row, row_number):
+                        yield [""] * width
+                    cells.extend([""] * (width - len(cells)))
+                    next_row = row_number + 1
+                    yield cells
+        except _SHEET_ERRORS as e:
+            raise ValueError(f"Could not read Excel file {self._name}: {e}") from e
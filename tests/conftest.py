@@ -1,7 +1,11 @@
 """Pytest configuration and fixtures."""
 
+import zipfile
+from collections.abc import Callable, Sequence
+from datetime import date
 from pathlib import Path
 from typing import Any
+from xml.sax.saxutils import escape
 
 import pytest
 
@@ -97,3 +101,65 @@ def citi_rewards_file(fixtures_dir: Path) -> Path:
 def citi_prestige_file(fixtures_dir: Path) -> Path:
     """Return path to Citi Prestige fixture."""
     return fixtures_dir / "citi_prestige.csv"
+
+
+def write_xlsx(path: Path, rows: Sequence[Sequence[Any]], date1904: bool = False) -> Path:
+    """Write a minimal .xlsx workbook with one sheet.
+
+    Strings go to the shared string table, numbers are numeric cells and
+    dates are serials with a built-in date format. Empty strings are omitted
+    and fully empty rows are left out, as Excel does.
+    """
+    epoch = date(1904, 1, 1) if date1904 else date(1899, 12, 30)
+    strings: list[str] = []
+    xml_rows = []
+    width = max((len(row) for row in rows), default=1)
+    for r, row in enumerate(rows, start=1):
+        cells = []
+        for c, value in enumerate(row):
+            ref = f"{chr(65 + c)}{r}"
+            if isinstance(value, date):
+                cells.append(f'<c r="{ref}" s="1"><v>{(value - epoch).days}</v></c>')
+            elif isinstance(value, int | float):
+                cells.append(f'<c r="{ref}"><v>{value}</v></c>')
+            elif value != "":
+                strings.append(value)
+                cells.append(f'<c r="{ref}" t="s"><v>{len(strings) - 1}</v></c>')
+        if cells:
+            xml_rows.append(f'<row r="{r}">{"".join(cells)}</row>')
+
+    ns = 'xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+    rel_ns = 'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships"'
+    shared = "".join(f"<si><t>{escape(s)}</t></si>" for s in strings)
+    with zipfile.ZipFile(path, "w") as zf:
+        zf.writestr(
+            "xl/workbook.xml",
+            f'<workbook {ns} {rel_ns}><workbookPr date1904="{int(date1904)}"/>'
+            '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets></workbook>',
+        )
+        zf.writestr(
+            "xl/_rels/workbook.xml.rels",
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Target="worksheets/sheet1.xml"/></Relationships>',
+        )
+        zf.writestr("xl/sharedStrings.xml", f"<sst {ns}>{shared}</sst>")
+        zf.writestr(
+            "xl/styles.xml",
+            f'<styleSheet {ns}><cellXfs><xf numFmtId="0"/><xf numFmtId="14"/></cellXfs></styleSheet>',
+        )
+        zf.writestr(
+            "xl/worksheets/sheet1.xml",
+            f'<worksheet {ns}><dimension ref="A1:{chr(64 + width)}{len(rows)}"/>'
+            f'<sheetData>{"".join(xml_rows)}</sheetData></worksheet>',
+        )
+    return path
+
+
+@pytest.fixture
+def make_xlsx(tmp_path: Path) -> Callable[..., Path]:
+    """Return a function that writes rows to an .xlsx file in tmp_path."""
+
+    def _make(rows: Sequence[Sequence[Any]], name: str = "sheet.xlsx", **kwargs: Any) -> Path:
+        return write_xlsx(tmp_path / name, rows, **kwargs)
+
+    return _make
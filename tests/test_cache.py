@@ -0,0 +1,121 @@
+"""Tests for the Excel conversion cache."""
+
+import os
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from lunchsync_sg import BankNormalizer
+from lunchsync_sg.cache import ConversionCache
+from lunchsync_sg.manifest import MANIFEST_FILENAME
+from lunchsync_sg.utils import Cell, load_file
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> ConversionCache:
+    """Return an empty cache in a temporary directory."""
+    return ConversionCache(tmp_path / "cache")
+
+
+@pytest.fixture
+def source(tmp_path: Path) -> Path:
+    """Return a small source file to key cache entries on."""
+    path = tmp_path / "statement.xls"
+    path.write_bytes(b"statement bytes")
+    return path
+
+
+ROWS: list[list[Cell]] = [["Date", "Amount"], [date(2025, 1, 15), -12.5], ["", "note"]]
+
+
+class TestConversionCache:
+    """Tests for ConversionCache."""
+
+    def test_miss_then_hit(self, cache: ConversionCache, source: Path) -> None:
+        """Test rows round-trip with their cell types."""
+        assert cache.get(source) is None
+        cache.put(source, ROWS)
+        assert cache.get(source) == ROWS
+
+    def test_changed_content_misses(self, cache: ConversionCache, source: Path) -> None:
+        """Test an entry is dropped once the source content changes."""
+        cache.put(source, ROWS)
+        source.write_bytes(b"different statement")
+        assert cache.get(source) is None
+        assert not list(cache.cache_dir.glob("*.json"))
+
+    def test_touched_identical_file_hits(
+        self, cache: ConversionCache, source: Path
+    ) -> None:
+        """Test a new mtime with identical content is still a hit."""
+        cache.put(source, ROWS)
+        stat = source.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert cache.get(source) == ROWS
+
+    def test_corrupt_entry_misses(self, cache: ConversionCache, source: Path) -> None:
+        """Test an unreadable entry is treated as a miss."""
+        cache.put(source, ROWS)
+        for entry in cache.cache_dir.glob("*.json"):
+            entry.write_text("{not json")
+        assert cache.get(source) is None
+
+    def test_evicts_least_recently_used(self, tmp_path: Path) -> None:
+        """Test the oldest entries are evicted once over budget."""
+        cache = ConversionCache(tmp_path / "cache")
+        sources = []
+        for i in range(3):
+            path = tmp_path / f"s{i}.xls"
+            path.write_bytes(f"source {i}".encode())
+            sources.append(path)
+            cache.put(path, ROWS)
+            entry = cache._entry_path(path)
+            os.utime(entry, (1000 + i, 1000 + i))
+
+        entry_size = cache._entry_path(sources[0]).stat().st_size
+        cache.max_bytes = entry_size * 2
+        cache.evict()
+
+        assert cache.get(sources[0]) is None
+        assert cache.get(sources[1]) == ROWS
+        assert cache.get(sources[2]) == ROWS
+
+    def test_other_files_are_left_alone(self, cache: ConversionCache, source: Path) -> None:
+        """Test files sharing the directory, like the manifest, are not entries."""
+        cache.put(source, ROWS)
+        manifest = cache.cache_dir / MANIFEST_FILENAME
+        manifest.write_text("{}" + " " * 4096)
+        other = cache.cache_dir / ("0" * 64 + ".json")
+        other.write_text("{}")
+
+        cache.max_bytes = cache._entry_path(source).stat().st_size
+        cache.evict()
+        assert cache.get(source) == ROWS
+        assert other.exists()
+
+        cache.clear()
+        assert cache.get(source) is None
+        assert manifest.exists()
+        assert other.exists()
+
+    def test_load_file_uses_cache(
+        self, cache: ConversionCache, uob_solitaire_file: Path
+    ) -> None:
+        """Test load_file returns the same rows with and without the cache."""
+        expected = load_file(uob_solitaire_file).rows
+        assert load_file(uob_solitaire_file, cache=cache).rows == expected
+        assert cache.get(uob_solitaire_file) == expected
+        assert load_file(uob_solitaire_file, cache=cache).rows == expected
+
+    def test_normalizer_matches_uncached(
+        self, cache: ConversionCache, fixtures_dir: Path
+    ) -> None:
+        """Test cached runs produce the same transactions as uncached ones."""
+        files = sorted(fixtures_dir.glob("*.xls"))
+        expected = BankNormalizer().process_files(files)
+
+        normalizer = BankNormalizer(cache=cache)
+        assert normalizer.process_files(files) == expected
+        assert normalizer.process_files(files) == expected
+        assert normalizer.errors == []
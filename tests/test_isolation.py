@@ -0,0 +1,135 @@
+"""Tests for budgeted worker-process isolation."""
+
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from lunchsync_sg import BankNormalizer
+from lunchsync_sg.isolation import IsolatedExecutor
+from lunchsync_sg.normalizer import Outcomes, parse_input
+
+
+def _square(x: int) -> int:
+    return x * x
+
+
+def _sleep(seconds: float) -> float:
+    time.sleep(seconds)
+    return seconds
+
+
+def _allocate(megabytes: int) -> int:
+    return len(bytearray(megabytes * 1024 * 1024))
+
+
+def _exit(code: int) -> None:
+    os._exit(code)
+
+
+def _fail(message: str) -> None:
+    raise ValueError(message)
+
+
+def _parse_or_fail(filepath: Path, *args: Any) -> Outcomes:
+    if filepath.name == "bad.csv":
+        raise KeyError("boom")
+    return parse_input(filepath, *args)
+
+
+class TestIsolatedExecutor:
+    """Tests for IsolatedExecutor."""
+
+    def test_results(self) -> None:
+        """Test that calls return their results through futures."""
+        with IsolatedExecutor(max_workers=2) as executor:
+            futures = [executor.submit(_square, i) for i in range(5)]
+            assert [f.result() for f in futures] == [0, 1, 4, 9, 16]
+
+    def test_exceptions_propagate(self) -> None:
+        """Test that an exception raised in a worker is raised by its future."""
+        with IsolatedExecutor() as executor:
+            future = executor.submit(_fail, "boom")
+            with pytest.raises(ValueError, match="boom"):
+                future.result()
+
+    def test_timeout_kills_only_the_slow_call(self) -> None:
+        """Test that a call over its time budget is aborted and others finish."""
+        start = time.monotonic()
+        with IsolatedExecutor(max_workers=2, timeout=1) as executor:
+            slow = executor.submit(_sleep, 60)
+            fast = [executor.submit(_square, i) for i in range(3)]
+
+            with pytest.raises(TimeoutError, match="timed out after 1s"):
+                slow.result()
+            assert [f.result() for f in fast] == [0, 1, 4]
+        assert time.monotonic() - start < 30
+
+    def test_memory_limit(self) -> None:
+        """Test that a call over its memory budget fails with MemoryError."""
+        with IsolatedExecutor(memory_limit=512 * 1024 * 1024) as executor:
+            assert executor.submit(_allocate, 16).result() == 16 * 1024 * 1024
+            with pytest.raises(MemoryError, match="memory budget"):
+                executor.submit(_allocate, 1024).result()
+
+    def test_worker_crash(self) -> None:
+        """Test that a worker dying without a result fails its call."""
+        with IsolatedExecutor() as executor:
+            with pytest.raises(RuntimeError, match="exit code 3"):
+                executor.submit(_exit, 3).result()
+            assert executor.submit(_square, 3).result() == 9
+
+    def test_submit_after_shutdown(self) -> None:
+        """Test that no calls are accepted after shutdown."""
+        executor = IsolatedExecutor()
+        executor.shutdown()
+        with pytest.raises(RuntimeError):
+            executor.submit(_square, 2)
+
+
+class TestBudgetedNormalizer:
+    """Tests for BankNormalizer with a parse budget."""
+
+    def test_matches_serial(self, fixtures_dir: Path) -> None:
+        """Test that isolated parsing gives the same result as a serial run."""
+        serial = BankNormalizer()
+        expected = serial.process_directory(fixtures_dir)
+
+        isolated = BankNormalizer(jobs=2, timeout=60)
+        assert isolated.process_directory(fixtures_dir) == expected
+        assert isolated.errors == serial.errors
+        assert isolated.pending_skipped == serial.pending_skipped
+
+    def test_files_over_budget_are_errors(
+        self, dbs_savings_file: Path, ocbc_credit_file: Path, tmp_path: Path
+    ) -> None:
+        """Test that a file exceeding the budget is reported and the batch continues."""
+        lines = dbs_savings_file.read_text().splitlines(keepends=True)
+        huge = tmp_path / "huge.csv"
+        huge.write_text("".join(lines[:7] + lines[7:] * 20_000))
+        expected = BankNormalizer().process_file(ocbc_credit_file)
+
+        normalizer = BankNormalizer(timeout=0.5)
+        assert normalizer.process_files([huge, ocbc_credit_file]) == expected
+        assert normalizer.errors == [(huge, "Parse timed out after 0.5s")]
+        assert normalizer.files_processed == 2
+
+    @pytest.mark.parametrize("options", [{"jobs": 2}, {"timeout": 60}, {"jobs": 2, "timeout": 60}])
+    def test_worker_exceptions_are_errors(
+        self,
+        options: dict[str, Any],
+        ocbc_credit_file: Path,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        """Test that any exception raised in a worker is that file's error."""
+        monkeypatch.setattr("lunchsync_sg.normalizer.parse_input", _parse_or_fail)
+        bad = tmp_path / "bad.csv"
+        bad.write_text("anything\n")
+        expected = BankNormalizer().process_file(ocbc_credit_file)
+
+        normalizer = BankNormalizer(**options)
+        assert normalizer.process_files([bad, ocbc_credit_file]) == expected
+        assert normalizer.errors == [(bad, "Parse error: 'boom'")]
@@ -0,0 +1,232 @@
+"""Tests for the manifest of previously parsed inputs."""
+
+import json
+import os
+import shutil
+from importlib.metadata import EntryPoint
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from lunchsync_sg import BankNormalizer
+from lunchsync_sg import manifest as manifest_module
+from lunchsync_sg import normalizer as normalizer_module
+from lunchsync_sg.manifest import Manifest
+from lunchsync_sg.models import Transaction, TransactionColumns
+from lunchsync_sg.normalizer import Outcomes, parse_file
+from lunchsync_sg.parsers import ParserRegistry
+
+
+@pytest.fixture
+def inputs(fixtures_dir: Path, tmp_path: Path) -> list[Path]:
+    """Copy fixtures to a scratch directory so they can be modified."""
+    directory = tmp_path / "inputs"
+    directory.mkdir()
+    return [
+        Path(shutil.copy(fixtures_dir / name, directory))
+        for name in ["ocbc_credit_1.csv", "dbs_savings.csv", "uob_solitaire.xls"]
+    ]
+
+
+class TestManifest:
+    """Tests for Manifest."""
+
+    def test_round_trip(self, inputs: list[Path], tmp_path: Path) -> None:
+        """Test recorded transactions survive a save and load unchanged."""
+        path = tmp_path / "manifest.json"
+        manifest = Manifest(path)
+        outcome = parse_file(inputs[0])
+        assert outcome.parser is not None
+        manifest.record(
+            inputs[0],
+            outcome.parser,
+            TransactionColumns.from_transactions(outcome.transactions),
+            3,
+            outcome.diagnostics,
+        )
+        manifest.save()
+
+        entry = Manifest.load(path).lookup(inputs[0])
+        assert entry is not None
+        assert entry.parser == "OCBCCreditParser"
+        assert entry.transactions == outcome.transactions
+        assert entry.pending_skipped == 3
+        assert entry.diagnostics == outcome.diagnostics
+        assert entry.diagnostics.rows_seen > 0
+        assert entry.accounts == sorted({tx.account for tx in outcome.transactions})
+
+    def test_changed_file_misses(self, inputs: list[Path], tmp_path: Path) -> None:
+        """Test a file whose content changed is parsed again."""
+        manifest = Manifest(tmp_path / "manifest.json")
+        manifest.record(inputs[1], "DBSSavingsParser", TransactionColumns())
+        with open(inputs[1], "a") as f:
+            f.write("\n")
+        assert manifest.lookup(inputs[1]) is None
+
+    def test_touched_file_hits(self, inputs: list[Path], tmp_path: Path) -> None:
+        """Test a new mtime with identical content is still reused."""
+        manifest = Manifest(tmp_path / "manifest.json")
+        manifest.record(inputs[1], "DBSSavingsParser", TransactionColumns())
+        stat = inputs[1].stat()
+        os.utime(inputs[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        assert manifest.lookup(inputs[1]) is not None
+
+    def test_config_change_invalidates(
+        self, inputs: list[Path], tmp_path: Path, test_config: dict[str, Any]
+    ) -> None:
+        """Test entries recorded under another config are ignored."""
+        path = tmp_path / "manifest.json"
+        manifest = Manifest(path, test_config)
+        manifest.record(inputs[1], "DBSSavingsParser", TransactionColumns())
+        manifest.save()
+
+        assert len(Manifest.load(path, test_config)) == 1
+        assert len(Manifest.load(path, None)) == 0
+
+    def test_parser_change_invalidates(
+        self, inputs: list[Path], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test entries recorded by other parser code are ignored."""
+        path = tmp_path / "manifest.json"
+        manifest = Manifest(path)
+        manifest.record(inputs[1], "DBSSavingsParser", TransactionColumns())
+        manifest.save()
+        assert len(Manifest.load(path)) == 1
+
+        monkeypatch.setattr(manifest_module, "parser_digest", lambda: "changed parsers")
+        assert len(Manifest.load(path)) == 0
+
+    def test_parser_digest_covers_plugins(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test installing a parser plugin changes the digest."""
+        before = manifest_module.parser_digest()
+        plugin = EntryPoint("acme", "acme_bank:AcmeParser", ParserRegistry.PLUGIN_GROUP)
+        monkeypatch.setattr(manifest_module, "entry_points", lambda group: [plugin])
+        manifest_module.parser_digest.cache_clear()
+        try:
+            assert manifest_module.parser_digest() != before
+        finally:
+            manifest_module.parser_digest.cache_clear()
+
+    def test_unreadable_manifest_is_empty(self, tmp_path: Path) -> None:
+        """Test a corrupt manifest file starts empty."""
+        path = tmp_path / "manifest.json"
+        path.write_text("{not json")
+        assert len(Manifest.load(path)) == 0
+
+    def test_corrupt_entry_misses(self, inputs: list[Path], tmp_path: Path) -> None:
+        """Test a damaged entry is dropped on lookup without losing the others."""
+        path = tmp_path / "manifest.json"
+        manifest = Manifest(path)
+        for filepath in inputs[:2]:
+            manifest.record(filepath, "OCBCCreditParser", TransactionColumns())
+        manifest.save()
+        data = json.loads(path.read_text())
+        data["files"][str(inputs[0].resolve())]["columns"]["amounts"] = ["not a number"]
+        path.write_text(json.dumps(data))
+
+        loaded = Manifest.load(path)
+        assert loaded.lookup(inputs[0]) is None
+        assert loaded.lookup(inputs[1]) is not None
+        loaded.save()
+        assert len(Manifest.load(path)) == 1
+
+    def test_saved_only_when_changed(self, inputs: list[Path], tmp_path: Path) -> None:
+        """Test a run that only reuses entries leaves the file untouched."""
+        path = tmp_path / "manifest.json"
+        manifest = Manifest(path)
+        manifest.record(inputs[1], "DBSSavingsParser", TransactionColumns())
+        manifest.save()
+        path.write_text(path.read_text() + " ")
+
+        loaded = Manifest.load(path)
+        assert loaded.lookup(inputs[1]) is not None
+        loaded.save()
+        assert path.read_text().endswith(" ")
+
+        loaded.record(inputs[0], "OCBCCreditParser", TransactionColumns())
+        loaded.save()
+        assert not path.read_text().endswith(" ")
+        assert len(Manifest.load(path)) == 2
+
+        inputs[0].unlink()
+        path.write_text(path.read_text() + " ")
+        Manifest.load(path).save()
+        assert len(Manifest.load(path)) == 1
+
+
+class TestNormalizerWithManifest:
+    """Tests for BankNormalizer with a manifest."""
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_unchanged_files_are_reused(
+        self, inputs: list[Path], tmp_path: Path, jobs: int
+    ) -> None:
+        """Test a second run reuses every file and gives the same result."""
+        path = tmp_path / "manifest.json"
+        fresh = BankNormalizer()
+        expected = fresh.process_files(inputs)
+
+        first = BankNormalizer(manifest=Manifest.load(path), jobs=jobs)
+        assert first.process_files(inputs) == expected
+        assert first.files_unchanged == 0
+
+        second = BankNormalizer(manifest=Manifest.load(path), jobs=jobs)
+        assert second.process_files(inputs) == expected
+        assert second.files_unchanged == len(inputs)
+        assert second.files_processed == len(inputs)
+        assert second.rows_seen == fresh.rows_seen > 0
+        assert second.rows_skipped == fresh.rows_skipped
+        assert second.pending_skipped == fresh.pending_skipped
+
+    def test_only_new_files_are_parsed(self, inputs: list[Path], tmp_path: Path) -> None:
+        """Test adding a file leaves the others served from the manifest."""
+        path = tmp_path / "manifest.json"
+        BankNormalizer(manifest=Manifest.load(path)).process_files(inputs[:2])
+
+        normalizer = BankNormalizer(manifest=Manifest.load(path))
+        normalizer.process_files(inputs)
+        assert normalizer.files_unchanged == 2
+
+    def test_transactions_with_extras_are_not_recorded(
+        self, inputs: list[Path], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test files whose transactions need more than the kept fields are parsed each run."""
+        path = tmp_path / "manifest.json"
+        monkeypatch.setattr(Transaction, "has_extras", property(lambda tx: True))
+        BankNormalizer(manifest=Manifest.load(path)).process_files(inputs)
+
+        assert len(Manifest.load(path)) == 0
+
+    def test_ambiguous_files_are_not_recorded(
+        self, inputs: list[Path], tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test an ambiguous detection is parsed, and reported, on every run."""
+        real_parse_input = normalizer_module.parse_input
+
+        def parse_ambiguous(*args: Any) -> Outcomes:
+            outcomes = real_parse_input(*args)
+            for _, outcome in outcomes:
+                outcome.ambiguous = ["OtherParser"]
+            return outcomes
+
+        monkeypatch.setattr(normalizer_module, "parse_input", parse_ambiguous)
+        path = tmp_path / "manifest.json"
+        BankNormalizer(manifest=Manifest.load(path)).process_files(inputs[:1])
+
+        normalizer = BankNormalizer(manifest=Manifest.load(path))
+        normalizer.process_files(inputs[:1])
+        assert normalizer.files_unchanged == 0
+        assert normalizer.ambiguous_files == [(inputs[0], "OCBCCreditParser", ["OtherParser"])]
+
+    def test_failed_files_are_not_recorded(self, tmp_path: Path) -> None:
+        """Test files that fail to parse are retried on the next run."""
+        bad = tmp_path / "unknown.csv"
+        bad.write_text("nothing,to,see\n")
+        path = tmp_path / "manifest.json"
+        BankNormalizer(manifest=Manifest.load(path)).process_files([bad])
+
+        normalizer = BankNormalizer(manifest=Manifest.load(path))
+        normalizer.process_files([bad])
+        assert normalizer.files_unchanged == 0
+        assert len(normalizer.errors) == 1
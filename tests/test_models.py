@@ -1,11 +1,12 @@
 """Tests for data models."""
 
+from dataclasses import replace
 from datetime import date
 from decimal import Decimal
 
 import pytest
 
-from lunchsync_sg.models import AccountMapping, Transaction
+from lunchsync_sg.models import AccountMapping, Transaction, TransactionColumns
 
 
 class TestTransaction:
@@ -53,6 +54,13 @@ class TestTransaction:
         )
         assert tx.description == "(No description)"
 
+    def test_has_extras(self) -> None:
+        """Test has_extras is set only by fields beyond plain CSV output."""
+        tx = Transaction(date(2026, 1, 30), "CAFE", Decimal("-4.50"), "OCBC Rewards")
+        assert tx.has_extras is False
+        assert replace(tx, category="Food").has_extras is True
+        assert replace(tx, original_currency="USD").has_extras is True
+
     def test_to_dict(self) -> None:
         """Test conversion to dictionary."""
         tx = Transaction(
@@ -79,6 +87,32 @@ class TestTransaction:
             tx.amount = Decimal("200")  # type: ignore
 
 
+class TestTransactionColumns:
+    """Tests for TransactionColumns."""
+
+    TRANSACTIONS = [
+        Transaction(date(2026, 1, 30), "CAFE", Decimal("-4.50"), "OCBC Rewards"),
+        Transaction(date(2026, 1, 28), "SALARY", Decimal("5000.00"), "DBS Savings"),
+        Transaction(date(2026, 1, 29), "SHOP", Decimal("-10.00"), "OCBC Rewards"),
+    ]
+
+    def test_round_trip(self) -> None:
+        """Test splitting transactions into columns and building them back."""
+        columns = TransactionColumns.from_transactions(self.TRANSACTIONS)
+        assert len(columns) == 3
+        assert columns.descriptions == ["CAFE", "SALARY", "SHOP"]
+        assert columns.to_transactions() == self.TRANSACTIONS
+
+    def test_extend_and_take(self) -> None:
+        """Test appending columns and selecting rows by index."""
+        columns = TransactionColumns.from_transactions(self.TRANSACTIONS[:1])
+        columns.extend(TransactionColumns.from_transactions(self.TRANSACTIONS[1:]))
+
+        taken = columns.take([2, 0])
+        assert taken.to_transactions() == [self.TRANSACTIONS[2], self.TRANSACTIONS[0]]
+        assert len(columns) == 3
+
+
 class TestAccountMapping:
     """Tests for AccountMapping model."""
 
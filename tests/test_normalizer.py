@@ -1,9 +1,27 @@
 """Tests for the main normalizer class."""
 
+import gzip
+import io
+import shutil
+import sys
+import tarfile
 import tempfile
+import zipfile
+from collections.abc import Callable, Iterator
 from pathlib import Path
+from typing import Any
+
+import pytest
 
 from lunchsync_sg import BankNormalizer, Transaction
+from lunchsync_sg import normalizer as normalizer_module
+from lunchsync_sg.manifest import Manifest
+from lunchsync_sg.models import TransactionColumns
+from lunchsync_sg.utils import STDIN, iter_input_files, load_file
+
+
+def _unexpected(*args: Any) -> Any:
+    raise AssertionError("not expected to be called")
 
 
 class TestBankNormalizer:
@@ -40,6 +58,286 @@ class TestBankNormalizer:
         accounts = {tx.account for tx in transactions}
         assert len(accounts) >= 5
 
+    def test_process_directory_recursive(
+        self, fixtures_dir: Path, tmp_path: Path
+    ) -> None:
+        """Test nested directories are only searched when asked to."""
+        nested = tmp_path / "2025" / "ocbc"
+        nested.mkdir(parents=True)
+        shutil.copy(fixtures_dir / "ocbc_credit_1.csv", nested)
+
+        normalizer = BankNormalizer()
+        assert normalizer.process_directory(tmp_path) == []
+        assert normalizer.process_directory(tmp_path, max_depth=None) == (
+            normalizer.process_files([fixtures_dir / "ocbc_credit_1.csv"])
+        )
+        assert normalizer.files_processed == 1
+
+    def test_process_files_accepts_iterator(self, fixtures_dir: Path) -> None:
+        """Test a lazy path iterator gives the same result as a list."""
+        files = sorted(fixtures_dir.glob("*.csv"))
+        normalizer = BankNormalizer()
+        expected = normalizer.process_files(files)
+        assert normalizer.process_files(iter(files)) == expected
+        assert BankNormalizer(jobs=2).process_files(iter(files)) == expected
+        assert normalizer.files_processed == len(files)
+
+    def test_process_archives(self, fixtures_dir: Path, tmp_path: Path) -> None:
+        """Test exports inside zip and tar.gz bundles match the extracted files."""
+        names = ["ocbc_credit_1.csv", "dbs_savings.csv", "uob_solitaire.xls"]
+        expected = BankNormalizer().process_files([fixtures_dir / n for n in names])
+
+        bundle = tmp_path / "bundle.zip"
+        with zipfile.ZipFile(bundle, "w") as zf:
+            for name in names:
+                zf.write(fixtures_dir / name, f"june/{name}")
+        tarball = tmp_path / "bundle.tar.gz"
+        with tarfile.open(tarball, "w:gz") as tf:
+            for name in names:
+                tf.add(fixtures_dir / name, arcname=name)
+
+        for archive in (bundle, tarball):
+            normalizer = BankNormalizer()
+            assert normalizer.process_files([archive]) == expected
+            assert normalizer.files_processed == len(names)
+            assert normalizer.errors == []
+
+        assert BankNormalizer().process_directory(tmp_path) == expected
+
+    def test_archive_errors_name_members(self, fixtures_dir: Path, tmp_path: Path) -> None:
+        """Test errors inside an archive are reported as archive!member."""
+        bundle = tmp_path / "bundle.zip"
+        with zipfile.ZipFile(bundle, "w") as zf:
+            zf.write(fixtures_dir / "ocbc_credit_1.csv", "ocbc.csv")
+            zf.writestr("unknown.csv", "nothing,to,see\n")
+
+        normalizer = BankNormalizer()
+        assert normalizer.process_files([bundle])
+        assert normalizer.errors == [
+            (Path(f"{bundle}!unknown.csv"), "No parser found for this file format")
+        ]
+
+    def test_stdin_matches_file(
+        self, fixtures_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test "-" reads an export from stdin like the same file on disk."""
+        other = fixtures_dir / "dbs_savings.csv"
+        for name in ["ocbc_credit_1.csv", "hsbc_revolution.csv", "uob_solitaire.xls"]:
+            path = fixtures_dir / name
+            stdin = io.TextIOWrapper(io.BytesIO(path.read_bytes()))
+            monkeypatch.setattr(sys, "stdin", stdin)
+
+            normalizer = BankNormalizer(jobs=2)
+            transactions = normalizer.process_files([STDIN, other])
+            assert transactions == BankNormalizer().process_files([path, other])
+            assert {tx.account for tx in transactions} != {
+                tx.account for tx in BankNormalizer().process_files([other])
+            }
+            assert normalizer.errors == []
+
+    def test_stdin_errors_are_named(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test an unknown export on stdin is reported as <stdin>."""
+        monkeypatch.setattr(sys, "stdin", io.TextIOWrapper(io.BytesIO(b"no,bank\n")))
+        normalizer = BankNormalizer()
+        assert normalizer.process_files([STDIN]) == []
+        assert normalizer.errors == [(Path("<stdin>"), "No parser found for this file format")]
+
+    def test_compressed_inputs(self, fixtures_dir: Path, tmp_path: Path) -> None:
+        """Test compressed exports, alone or in archives, parse like the originals."""
+        names = ["ocbc_credit_1.csv", "hsbc_revolution.csv", "uob_solitaire.xls"]
+        expected = BankNormalizer().process_files([fixtures_dir / n for n in names])
+
+        for name in names:
+            data = (fixtures_dir / name).read_bytes()
+            (tmp_path / f"{name}.gz").write_bytes(gzip.compress(data))
+        normalizer = BankNormalizer()
+        assert normalizer.process_directory(tmp_path) == expected
+        assert normalizer.files_processed == len(names)
+
+        bundle = tmp_path / "bundle" / "bundle.zip"
+        bundle.parent.mkdir()
+        with zipfile.ZipFile(bundle, "w") as zf:
+            for name in names:
+                zf.write(tmp_path / f"{name}.gz", f"{name}.gz")
+        assert BankNormalizer().process_files([bundle]) == expected
+
+    def test_corrupt_compressed_input(self, tmp_path: Path) -> None:
+        """Test a corrupt compressed file is reported, not raised."""
+        path = tmp_path / "broken.csv.gz"
+        path.write_bytes(b"\x1f\x8b\x08\x00garbage")
+        normalizer = BankNormalizer()
+        assert normalizer.process_files([path]) == []
+        assert len(normalizer.errors) == 1
+
+    def test_corrupt_compressed_body(self, fixtures_dir: Path, tmp_path: Path) -> None:
+        """Test a gzip file with a damaged deflate body is reported, alone or archived."""
+        data = gzip.compress((fixtures_dir / "dbs_savings.csv").read_bytes())
+        broken = data[:20] + bytes(b ^ 0xFF for b in data[20:60]) + data[60:]
+        path = tmp_path / "broken.csv.gz"
+        path.write_bytes(broken)
+        bundle = tmp_path / "bundle.zip"
+        with zipfile.ZipFile(bundle, "w") as zf:
+            zf.writestr("broken.csv.gz", broken)
+            zf.write(fixtures_dir / "ocbc_credit_1.csv", "ocbc_credit_1.csv")
+        expected = BankNormalizer().process_file(fixtures_dir / "ocbc_credit_1.csv")
+
+        normalizer = BankNormalizer()
+        assert normalizer.process_files([path, bundle]) == expected
+        assert [filepath.name for filepath, _ in normalizer.errors] == [
+            "broken.csv.gz",
+            "bundle.zip!broken.csv.gz",
+        ]
+        assert all("decompress" in error for _, error in normalizer.errors)
+
+    def test_corrupt_zip_member(self, fixtures_dir: Path, tmp_path: Path) -> None:
+        """Test a zip member with a damaged deflate body is reported, not raised."""
+        data = (fixtures_dir / "dbs_savings.csv").read_bytes()
+        bundle = tmp_path / "bad.zip"
+        with zipfile.ZipFile(bundle, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr("bad.csv", data)
+        raw = bytearray(bundle.read_bytes())
+        # The deflate body follows the 30-byte local header and the member name
+        start = 30 + len("bad.csv")
+        raw[start : start + 40] = bytes(b ^ 0xFF for b in raw[start : start + 40])
+        bundle.write_bytes(bytes(raw))
+
+        normalizer = BankNormalizer()
+        assert normalizer.process_files([bundle]) == []
+        [(filepath, error)] = normalizer.errors
+        assert filepath == bundle
+        assert f"{bundle}!bad.csv" in error
+
+    def test_identical_inputs_are_collapsed(
+        self, fixtures_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test a re-downloaded copy of a statement is skipped before parsing."""
+        original = fixtures_dir / "dbs_savings.csv"
+        copy = tmp_path / "dbs_savings (1).csv"
+        shutil.copy(original, copy)
+        files = [original, fixtures_dir / "ocbc_credit_1.csv", copy]
+
+        parsed: list[Path] = []
+        real_parse_input = normalizer_module.parse_input
+
+        def spy(filepath: Path, *args: Any) -> Any:
+            parsed.append(filepath)
+            return real_parse_input(filepath, *args)
+
+        monkeypatch.setattr(normalizer_module, "parse_input", spy)
+
+        normalizer = BankNormalizer()
+        transactions = normalizer.process_files(files)
+        assert transactions == BankNormalizer().process_files(files[:2])
+        assert normalizer.duplicate_files == [(copy, original)]
+        assert copy not in parsed
+
+    def test_same_size_different_content_is_kept(self, tmp_path: Path) -> None:
+        """Test files that only share a size are both parsed."""
+        first = tmp_path / "a.csv"
+        second = tmp_path / "b.csv"
+        first.write_text("one,1\n")
+        second.write_text("two,2\n")
+        normalizer = BankNormalizer()
+        normalizer.process_files([first, second])
+        assert normalizer.duplicate_files == []
+        assert normalizer.files_processed == 2
+
+    def test_identical_inputs_kept_without_dedup(
+        self, fixtures_dir: Path, tmp_path: Path
+    ) -> None:
+        """Test identical files are all parsed when deduplication is off."""
+        copy = tmp_path / "copy.csv"
+        shutil.copy(fixtures_dir / "dbs_savings.csv", copy)
+        normalizer = BankNormalizer(deduplicate=False)
+        normalizer.process_files([fixtures_dir / "dbs_savings.csv", copy])
+        assert normalizer.duplicate_files == []
+        assert normalizer.files_processed == 2
+
+    def test_parallel_matches_serial(self, fixtures_dir: Path) -> None:
+        """Test that a process pool produces the same output as a serial run."""
+        files = sorted(fixtures_dir.iterdir()) + [Path("/nonexistent/file.csv")]
+
+        serial = BankNormalizer()
+        parallel = BankNormalizer(jobs=3)
+
+        assert parallel.process_files(files) == serial.process_files(files)
+        assert parallel.errors == serial.errors
+        assert parallel.pending_skipped == serial.pending_skipped
+
+    def test_mapped_matches_in_memory(
+        self, fixtures_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that streaming from a memory map gives the same output."""
+        files = sorted(fixtures_dir.iterdir())
+        expected = BankNormalizer().process_files(files)
+
+        monkeypatch.setattr("lunchsync_sg.normalizer.MMAP_THRESHOLD", 0)
+        normalizer = BankNormalizer()
+        assert normalizer.process_files(files) == expected
+        assert normalizer.errors == []
+
+    def test_xlsx_matches_xls(
+        self, uob_solitaire_file: Path, make_xlsx: Callable[..., Path]
+    ) -> None:
+        """Test that an .xlsx export parses the same as the .xls one."""
+        rows = load_file(uob_solitaire_file).rows
+        assert rows is not None
+
+        normalizer = BankNormalizer()
+        from_xlsx = normalizer.process_file(make_xlsx(rows))
+        assert normalizer.errors == []
+        assert from_xlsx == normalizer.process_file(uob_solitaire_file)
+
+    def test_damaged_xlsx_is_an_error(
+        self, uob_solitaire_file: Path, make_xlsx: Callable[..., Path], tmp_path: Path
+    ) -> None:
+        """Test that a workbook naming a missing shared string is that file's error."""
+        rows = load_file(uob_solitaire_file).rows
+        assert rows is not None
+        xlsx_file = make_xlsx(rows)
+        with zipfile.ZipFile(xlsx_file) as zf:
+            parts = {name: zf.read(name) for name in zf.namelist()}
+        damaged = tmp_path / "damaged.xlsx"
+        with zipfile.ZipFile(damaged, "w") as zf:
+            for name, data in parts.items():
+                if name == "xl/sharedStrings.xml":
+                    data = data.partition(b"<si>")[0] + b"</sst>"
+                zf.writestr(name, data)
+
+        normalizer = BankNormalizer()
+        assert normalizer.process_files([damaged]) == []
+        [(filepath, error)] = normalizer.errors
+        assert filepath == damaged
+        assert "shared string" in error
+
+    def test_iter_transactions_matches_process_files(self, fixtures_dir: Path) -> None:
+        """Test that streamed transactions match process_files without sorting."""
+        files = sorted(fixtures_dir.iterdir()) + [Path("/nonexistent/file.csv")]
+        expected_normalizer = BankNormalizer(sort_descending=False)
+        expected = expected_normalizer.process_files(files)
+
+        normalizer = BankNormalizer(sort_descending=False)
+        assert list(normalizer.iter_transactions(files)) == expected
+        assert normalizer.errors == expected_normalizer.errors
+        assert normalizer.pending_skipped == expected_normalizer.pending_skipped
+        assert normalizer.files_processed == expected_normalizer.files_processed
+
+    def test_iter_transactions_is_lazy(self, fixtures_dir: Path) -> None:
+        """Test that later files are not opened before earlier rows are consumed."""
+        opened: list[Path] = []
+
+        def paths() -> Iterator[Path]:
+            for name in ("ocbc_credit_1.csv", "dbs_savings.csv"):
+                opened.append(fixtures_dir / name)
+                yield fixtures_dir / name
+
+        normalizer = BankNormalizer()
+        transactions = normalizer.iter_transactions(paths())
+        assert opened == []
+        first = next(transactions)
+        assert opened == [fixtures_dir / "ocbc_credit_1.csv"]
+        assert first.account == BankNormalizer().process_file(opened[0])[0].account
+
     def test_deduplication(self, ocbc_credit_file: Path) -> None:
         """Test that duplicate transactions are removed."""
         normalizer = BankNormalizer(deduplicate=True)
@@ -121,6 +419,54 @@ class TestBankNormalizer:
         finally:
             output_path.unlink()
 
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_process_columns_matches_process_files(
+        self, fixtures_dir: Path, tmp_path: Path, jobs: int
+    ) -> None:
+        """Test that the columnar path writes the same CSV as the transaction path."""
+        inputs = tmp_path / "inputs"
+        shutil.copytree(fixtures_dir, inputs)
+        data = (fixtures_dir / "dbs_savings.csv").read_bytes()
+        (inputs / "dbs_savings_copy.csv.gz").write_bytes(gzip.compress(data))
+        with zipfile.ZipFile(inputs / "bundle.zip", "w") as zf:
+            zf.write(fixtures_dir / "ocbc_credit_1.csv", "ocbc_credit.csv")
+
+        normalizer = BankNormalizer(jobs=jobs)
+        transactions = normalizer.process_directory(inputs)
+        normalizer.write_csv(transactions, tmp_path / "transactions.csv")
+        counters = (normalizer.files_processed, normalizer.pending_skipped, normalizer.rows_seen)
+
+        columns = normalizer.process_columns(iter_input_files([inputs]))
+        normalizer.write_columns(columns, tmp_path / "columns.csv")
+
+        assert len(columns) == len(transactions)
+        assert (tmp_path / "columns.csv").read_bytes() == (
+            tmp_path / "transactions.csv"
+        ).read_bytes()
+        assert counters == (
+            normalizer.files_processed,
+            normalizer.pending_skipped,
+            normalizer.rows_seen,
+        )
+
+    def test_process_columns_with_manifest(
+        self, fixtures_dir: Path, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that columnar runs record in and reuse the manifest."""
+        files = sorted(fixtures_dir.glob("*.csv"))
+        expected = BankNormalizer().process_files(files)
+
+        manifest = Manifest(tmp_path / "manifest.json")
+        with monkeypatch.context() as patch:
+            # Neither recording nor reusing should build a Transaction per row
+            patch.setattr(TransactionColumns, "to_transactions", _unexpected)
+            first = BankNormalizer(manifest=manifest).process_columns(files)
+            normalizer = BankNormalizer(manifest=Manifest.load(tmp_path / "manifest.json"))
+            patch.setattr(TransactionColumns, "from_transactions", _unexpected)
+            assert normalizer.process_columns(files) == first
+        assert normalizer.files_unchanged == len(files)
+        assert first == TransactionColumns.from_transactions(expected)
+
     def test_error_handling_invalid_file(self) -> None:
         """Test error handling for invalid file."""
         normalizer = BankNormalizer()
@@ -142,6 +488,26 @@ class TestBankNormalizer:
         assert len(normalizer.errors) == 1
         assert "No parser found" in normalizer.errors[0][1]
 
+    def test_malformed_row_is_quarantined(self, dbs_savings_file: Path, tmp_path: Path) -> None:
+        """Test that an unreadable row is reported by line and the rest still parse."""
+        expected = BankNormalizer().process_file(dbs_savings_file)
+
+        lines = dbs_savings_file.read_text().splitlines(keepends=True)
+        # A field over the csv module's size limit, as left by a corrupted download
+        lines.insert(8, '"02 Feb 2026","POS","' + "X" * 200_000 + '"\n')
+        broken = tmp_path / "dbs_savings.csv"
+        broken.write_text("".join(lines))
+
+        normalizer = BankNormalizer()
+        assert normalizer.process_file(broken) == expected
+        assert normalizer.errors == []
+        [(filepath, row_error)] = normalizer.failed_rows
+        assert filepath == broken
+        assert row_error.line == 9
+        assert "field larger than field limit" in row_error.error
+        assert normalizer.rows_seen == len(lines) - 7
+        assert sum(normalizer.rows_skipped.values()) == normalizer.rows_seen - len(expected) - 1
+
 
 class TestTransactionSignConvention:
     """Tests to verify consistent sign convention across all parsers."""
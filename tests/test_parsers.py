@@ -1,10 +1,22 @@
 """Tests for bank parsers."""
 
+import csv
+import re
+import subprocess
+import sys
+from collections.abc import Iterator
+from dataclasses import replace
 from datetime import date
 from decimal import Decimal
+from functools import partial
+from importlib.metadata import EntryPoint
+from io import StringIO
 from pathlib import Path
-from typing import Any
+from typing import Any, ClassVar
 
+import pytest
+
+from lunchsync_sg.models import NO_DESCRIPTION, Transaction, TransactionColumns
 from lunchsync_sg.parsers import (
     CitiParser,
     DBSCreditParser,
@@ -13,9 +25,20 @@ from lunchsync_sg.parsers import (
     OCBC360Parser,
     OCBCCreditParser,
     ParserRegistry,
+    SignatureIndex,
     UOBCreditParser,
 )
-from lunchsync_sg.utils import read_file
+from lunchsync_sg.parsers.base import (
+    UNSIGNED_CONFIDENCE,
+    BankParser,
+    Detection,
+    LazyParser,
+    Marker,
+    collect,
+)
+from lunchsync_sg.parsers.catalog import BUILTIN_PARSERS
+from lunchsync_sg.parsers.spec import ParserSpec, Skip, SpecParser, compile_row
+from lunchsync_sg.utils import Cell, MappedFile, head_lines, load_file, read_file, rows_to_text
 
 
 class TestOCBCCreditParser:
@@ -58,6 +81,24 @@ class TestOCBCCreditParser:
         assert len(tx1) == 2
         assert len(tx2) == 8
 
+    def test_quoted_commas(self, ocbc_credit_file: Path) -> None:
+        """Test that commas inside quoted merchants and amounts keep columns aligned."""
+        lines = read_file(ocbc_credit_file).splitlines(keepends=True)
+        header = next(i for i, line in enumerate(lines) if line.startswith("Transaction date"))
+        lines[header + 1 : header + 1] = [
+            '28/01/2026,"CAFE, TOWN          SINGAPORE     SGP",4.50,\n',
+            '27/01/2026,FURNITURE STORE,"1,234.50",\n',
+        ]
+        parser = OCBCCreditParser()
+        transactions = parser.parse("".join(lines))
+
+        assert [(tx.description, tx.amount) for tx in transactions[:2]] == [
+            ("CAFE, TOWN SINGAPORE", Decimal("-4.50")),
+            ("FURNITURE STORE", Decimal("-1234.50")),
+        ]
+        assert transactions[1].raw_data == {"line": "27/01/2026,FURNITURE STORE,1,234.50,"}
+        assert len(transactions) == len(parser.parse(read_file(ocbc_credit_file))) + 2
+
 
 class TestOCBC360Parser:
     """Tests for OCBC 360 Account parser."""
@@ -112,6 +153,20 @@ class TestDBSSavingsParser:
         salaries = [tx for tx in transactions if tx.amount > 0]
         assert len(salaries) > 0
 
+    def test_multiline_description(self, dbs_savings_file: Path) -> None:
+        """Test that a quoted description spanning lines stays one row."""
+        lines = read_file(dbs_savings_file).splitlines(keepends=True)
+        lines.insert(7, '"30 Jan 2026","FAST","PAYNOW TO\nJOHN TAN","","","","Settled",12.5,""\n')
+        content = "".join(lines)
+        parser = DBSSavingsParser()
+        transactions = parser.parse(content)
+
+        assert len(transactions) == len(parser.parse(read_file(dbs_savings_file))) + 1
+        paynow = [tx for tx in transactions if tx.description == "PAYNOW TO JOHN TAN"]
+        assert [tx.amount for tx in paynow] == [Decimal("-12.5")]
+        assert parser.diagnostics.failed == []
+        assert parser.parse_lines(StringIO(content)) == transactions
+
 
 class TestDBSCreditParser:
     """Tests for DBS Credit Card parser."""
@@ -130,6 +185,20 @@ class TestDBSCreditParser:
 
         assert len(transactions) >= 4
 
+    def test_quoted_comma_and_newline(self, dbs_credit_file: Path) -> None:
+        """Test that commas and line breaks inside quoted cells keep columns aligned."""
+        lines = read_file(dbs_credit_file).splitlines(keepends=True)
+        header = next(i for i, line in enumerate(lines) if "Transaction Posting Date" in line)
+        lines.insert(
+            header + 1,
+            '"30 Jan 2026","30 Jan 2026","CAFE, TOWN\nSINGAPORE SGP","","","Settled","8.2",""\n',
+        )
+        transactions = DBSCreditParser().parse("".join(lines))
+
+        [cafe] = [tx for tx in transactions if tx.description.startswith("CAFE")]
+        assert cafe.amount == Decimal("-8.2")
+        assert cafe.date == date(2026, 1, 30)
+
 
 class TestUOBCreditParser:
     """Tests for UOB Credit Card parser."""
@@ -221,6 +290,352 @@ class TestCitiParser:
         assert len(transactions) >= 5
         assert any("Citi Prestige" in tx.account for tx in transactions)
 
+    def test_detect_after_blank_lines(
+        self, citi_rewards_file: Path, test_config: dict[str, Any]
+    ) -> None:
+        """Test that leading blank lines do not use up the one-line header window."""
+        content = read_file(citi_rewards_file)
+        padded = "\ufeff\n  \r\n" + content
+
+        assert ParserRegistry.detect(padded) is CitiParser
+        parser = ParserRegistry.get_parser(padded, config=test_config)
+        assert parser is not None
+        assert parser.parse(padded) == CitiParser(config=test_config).parse(content)
+
+
+class TestParseLines:
+    """Tests for line-streaming parsing."""
+
+    def test_parse_lines_matches_parse(
+        self, fixtures_dir: Path, test_config: dict[str, Any]
+    ) -> None:
+        """Test that every parser gives the same result from streamed lines."""
+        for csv_file in sorted(fixtures_dir.glob("*.csv")):
+            content = read_file(csv_file)
+            parser = ParserRegistry.get_parser(content, config=test_config)
+            assert parser is not None
+
+            with MappedFile(csv_file) as mapped:
+                streamed = parser.parse_lines(mapped.iter_lines())
+            assert streamed == parser.parse(content)
+
+    def test_default_parse_lines(
+        self, uob_solitaire_file: Path, test_config: dict[str, Any]
+    ) -> None:
+        """Test that parsers without a line path fall back to parse()."""
+        content = read_file(uob_solitaire_file)
+        parser = UOBCreditParser(config=test_config)
+        assert parser.parse_lines(StringIO(content)) == parser.parse(content)
+
+
+class TestIterParse:
+    """Tests for the generator parsing API."""
+
+    def test_iter_parse_matches_parse(
+        self, fixtures_dir: Path, test_config: dict[str, Any]
+    ) -> None:
+        """Test that every parser yields the same transactions parse() returns."""
+        for csv_file in sorted(fixtures_dir.glob("*.csv")):
+            content = read_file(csv_file)
+            parser = ParserRegistry.get_parser(content, config=test_config)
+            assert parser is not None
+
+            streamed = parser.iter_parse(content)
+            assert not isinstance(streamed, list)
+            assert list(streamed) == parser.parse(content)
+
+    def test_iter_parse_is_lazy(self, ocbc_credit_file: Path) -> None:
+        """Test that rows are produced one at a time from a line iterator."""
+        content = read_file(ocbc_credit_file)
+        all_lines = StringIO(content).readlines()
+        all_lines += all_lines[-1:] * 100
+        consumed = 0
+
+        def lines() -> Iterator[str]:
+            nonlocal consumed
+            for line in all_lines:
+                consumed += 1
+                yield line
+
+        parser = OCBCCreditParser()
+        first = next(parser.iter_parse_lines(lines()))
+        assert first == parser.parse(content)[0]
+        assert consumed < len(all_lines)
+
+
+class TestParseRows:
+    """Tests for parsing typed spreadsheet rows."""
+
+    def test_uob_rows_match_text(
+        self, fixtures_dir: Path, test_config: dict[str, Any]
+    ) -> None:
+        """Test that UOB parses typed rows the same as converted text."""
+        for xls_file in sorted(fixtures_dir.glob("uob_*.xls")):
+            content = load_file(xls_file)
+            assert content.rows is not None
+
+            parser = UOBCreditParser(config=test_config)
+            from_rows = parser.parse_rows(content.rows)
+            rows_pending = parser.pending_skipped
+            from_text = parser.parse(content.text)
+
+            assert from_rows == from_text
+            assert rows_pending == parser.pending_skipped
+
+    def test_uob_native_cells(self) -> None:
+        """Test that native date and number cells are used directly."""
+        rows: list[list[Cell]] = [
+            ["United Overseas Bank Limited."],
+            ["Account Type:", "LADY'S SOLITAIRE CARD"],
+            ["Transaction Date", "Posting Date", "Description", "", "", "", "Amount"],
+            [date(2026, 1, 30), date(2026, 1, 31), "CAFE", "", "", "SGD", 28.38],
+            [date(2026, 1, 26), date(2026, 1, 27), "PAYMENT", "", "", "SGD", -100.0],
+            [date(2026, 1, 26), "PENDING", "SHOP", "", "", "SGD", 5.0],
+        ]
+        parser = UOBCreditParser()
+        transactions = parser.parse_rows(rows)
+
+        assert [(tx.date, tx.amount) for tx in transactions] == [
+            (date(2026, 1, 31), Decimal("-28.38")),
+            (date(2026, 1, 27), Decimal("100.0")),
+        ]
+        assert parser.pending_skipped == 1
+        assert transactions == parser.parse(rows_to_text(rows))
+
+    def test_default_parse_rows(self, hsbc_file: Path) -> None:
+        """Test that parsers without a row path parse the converted text."""
+        content = read_file(hsbc_file)
+        rows = list(csv.reader(StringIO(content)))
+        parser = HSBCRevolutionParser()
+        assert parser.parse_rows(rows) == parser.parse(content)
+
+
+class TestParseResult:
+    """Tests for single-pass parsing through the registry."""
+
+    def test_parse_matches_separate_calls(
+        self, fixtures_dir: Path, test_config: dict[str, Any]
+    ) -> None:
+        """Test that one pass gives the same account and transactions as separate calls."""
+        for path in sorted(fixtures_dir.iterdir()):
+            content = load_file(path).text
+            parser_class = ParserRegistry.detect(content)
+            assert parser_class is not None
+
+            result = ParserRegistry.parse(content, config=test_config)
+            assert result.error is None
+            assert result.parser == parser_class.__name__
+            assert result.account == parser_class.detect_account(content)
+            assert result.transactions == parser_class(config=test_config).parse(content)
+
+    def test_parse_header_window(self, dbs_credit_file: Path) -> None:
+        """Test that the account is found from the header window alone."""
+        header = head_lines(read_file(dbs_credit_file), ParserRegistry.max_header_lines())
+        account = ParserRegistry.parse(header).account
+        assert account is not None
+        assert account.bank == "DBS"
+        assert account.account_type == "credit_card"
+
+    def test_parse_unknown(self) -> None:
+        """Test that unknown content reports an error and no account."""
+        result = ParserRegistry.parse("random content that matches nothing")
+        assert result.error == "No parser found for this file format"
+        assert result.account is None
+        assert result.transactions == []
+
+
+class TestParseBatch:
+    """Tests for the columnar batch parsing API."""
+
+    def test_batch_matches_parse(self, fixtures_dir: Path, test_config: dict[str, Any]) -> None:
+        """Test that every parser fills the same columns from text, lines and rows."""
+        for path in sorted(fixtures_dir.iterdir()):
+            content = load_file(path)
+            parser = ParserRegistry.get_parser(content.text, config=test_config)
+            assert parser is not None
+
+            expected = TransactionColumns.from_transactions(parser.parse(content.text))
+            pending = parser.pending_skipped
+            assert parser.parse_batch(content.text) == expected
+            assert parser.pending_skipped == pending
+            assert parser.parse_batch_lines(StringIO(content.text)) == expected
+
+            rows = content.rows
+            if rows is None:
+                rows = list(csv.reader(StringIO(content.text)))
+            from_rows = TransactionColumns.from_transactions(parser.parse_rows(rows))
+            assert parser.parse_batch_rows(rows) == from_rows
+
+    def test_blank_description(self) -> None:
+        """Test that batch parses apply Transaction's rule for blank descriptions."""
+        content = TestParserSpec.CONTENT.replace("REFUND", " ")
+        parser = _SpecCardParser()
+        columns = parser.parse_batch(content)
+        assert columns.descriptions == [tx.description for tx in parser.parse(content)]
+        assert NO_DESCRIPTION in columns.descriptions
+
+    def test_batch_result(self) -> None:
+        """Test that a batch pass is summarised like a streamed one."""
+        parser = _SpecCardParser()
+        result = parser.batch_result(partial(parser.parse_batch, TestParserSpec.CONTENT))
+        streamed = collect(parser.iter_result(parser.iter_parse(TestParserSpec.CONTENT)))
+
+        assert result.transactions == []
+        assert result.columns == TransactionColumns.from_transactions(streamed.transactions)
+        assert result.parser == streamed.parser
+        assert result.pending_skipped == streamed.pending_skipped == 1
+        assert result.diagnostics == streamed.diagnostics
+
+    def test_batch_result_error(self) -> None:
+        """Test that an exception from a batch parse becomes the result's error."""
+        parser = _SpecCardParser()
+
+        def fail() -> TransactionColumns:
+            raise ValueError("bad export")
+
+        result = parser.batch_result(fail)
+        assert result.error == "Parse error: bad export"
+        assert result.columns is None
+
+    def test_error_without_message(self) -> None:
+        """Test that an exception with no message is reported by its type."""
+        parser = _SpecCardParser()
+
+        def fail() -> TransactionColumns:
+            raise KeyError()
+
+        def stream() -> Iterator[Transaction]:
+            yield from fail().to_transactions()
+
+        assert parser.batch_result(fail).error == "Parse error: KeyError"
+        assert collect(parser.iter_result(stream())).error == "Parse error: KeyError"
+
+
+class _SpecCardParser(SpecParser):
+    """Card format expressed only as a spec."""
+
+    bank_name: ClassVar[str] = "Test"
+    header_lines: ClassVar[int] = 3
+    signatures: ClassVar[list[tuple[Marker, ...]]] = [("Date,Description,Amount,Status",)]
+    display_hint: ClassVar[str] = "Test Card"
+    spec: ClassVar[ParserSpec] = ParserSpec(
+        header=("Date", "Amount"),
+        min_columns=4,
+        pending_column=3,
+        date=0,
+        description=1,
+        amount=2,
+        negate=True,
+        account_pattern=re.compile(r"Card (\d{4})"),
+        default_account="Test Card",
+    )
+
+
+class _LooseCardParser(_SpecCardParser):
+    """Card spec whose status column may be missing from short rows."""
+
+    spec: ClassVar[ParserSpec] = replace(_SpecCardParser.spec, min_columns=3)
+
+
+class TestParserSpec:
+    """Tests for the declarative parser spec engine."""
+
+    CONTENT = (
+        "Test Card 1234\n"
+        "Date,Description,Amount,Status\n"
+        '01/02/2026,"CAFE, TOWN",4.50,Posted\n'
+        "02/02/2026,SHOP,10.00,Pending\n"
+        "not a date,SHOP,1.00,Posted\n"
+        "03/02/2026,REFUND,-2.00,Posted\n"
+    )
+
+    def test_spec_parser(self) -> None:
+        """Test that a format declared as a spec parses without custom code."""
+        parser = _SpecCardParser()
+        transactions = parser.parse(self.CONTENT)
+
+        assert [(tx.description, tx.amount) for tx in transactions] == [
+            ("CAFE, TOWN", Decimal("-4.50")),
+            ("REFUND", Decimal("2.00")),
+        ]
+        assert parser.pending_skipped == 1
+        assert parser.account is not None
+        assert parser.account.card_number == "1234"
+        assert parser.parse_lines(StringIO(self.CONTENT)) == transactions
+        rows = list(csv.reader(StringIO(self.CONTENT)))
+        assert parser.parse_rows(rows) == transactions
+
+    def test_skip_reasons(self) -> None:
+        """Test that the compiled converter reports why a row was skipped."""
+        convert = compile_row(_SpecCardParser.spec)
+        assert convert(["01/02/2026", "X"], "A") is Skip.SHORT
+        assert convert(["01/02/2026", "X", "1", "PENDING"], "A") is Skip.PENDING
+        assert convert(["bad", "X", "1", "Posted"], "A") is Skip.NO_DATE
+        assert convert(["01/02/2026", "X", "", "Posted"], "A") is Skip.NO_AMOUNT
+
+        tx = convert(["01/02/2026", "X", "1", "Posted"], "A")
+        assert isinstance(tx, Transaction)
+        assert tx.account == "A"
+
+    def test_debit_credit_columns(self) -> None:
+        """Test that withdrawals are negative and deposits positive."""
+        spec = ParserSpec(date=0, description=1, debit=2, credit=3, min_columns=3)
+        convert = compile_row(spec)
+        withdrawal = convert(["01/02/2026", "X", "5.00"], "A")
+        deposit = convert(["01/02/2026", "X", "", "7.00"], "A")
+        assert isinstance(withdrawal, Transaction) and withdrawal.amount == Decimal("-5.00")
+        assert isinstance(deposit, Transaction) and deposit.amount == Decimal("7.00")
+
+    def test_invalid_spec(self) -> None:
+        """Test that a spec must give exactly one amount layout."""
+        with pytest.raises(ValueError):
+            ParserSpec(date=0, description=1)
+        with pytest.raises(ValueError):
+            ParserSpec(date=0, description=1, amount=2, debit=3)
+
+
+class TestRowDiagnostics:
+    """Tests for per-row diagnostics."""
+
+    def test_rows_counted_by_outcome(self) -> None:
+        """Test that every row after the header is counted as parsed or skipped."""
+        parser = _SpecCardParser()
+        result = collect(parser.iter_result(parser.iter_parse(TestParserSpec.CONTENT + "\n")))
+
+        assert len(result.transactions) == 2
+        assert result.diagnostics.rows_seen == 5
+        assert result.diagnostics.skipped == {"pending": 1, "no_date": 1, "blank": 1}
+        assert result.diagnostics.failed == []
+
+    def test_failing_row_is_quarantined(self) -> None:
+        """Test that a row whose conversion raises is recorded and parsing continues."""
+        content = TestParserSpec.CONTENT.replace("4.50,Posted", "4.50", 1)
+        parser = _LooseCardParser()
+
+        transactions = parser.parse(content)
+        assert [tx.description for tx in transactions] == ["REFUND"]
+        [row_error] = parser.diagnostics.failed
+        assert row_error.line == 3
+        assert row_error.content == "01/02/2026,CAFE, TOWN,4.50"
+        assert "index out of range" in row_error.error
+        assert parser.diagnostics.rows_seen == 4
+
+    def test_unreadable_csv_is_quarantined(self) -> None:
+        """Test that the csv reader resumes after a line it cannot read."""
+        content = TestParserSpec.CONTENT.replace("SHOP,1.00", "S" * 30 + ",1.00")
+        parser = _SpecCardParser()
+        limit = csv.field_size_limit(20)
+        try:
+            transactions = parser.parse(content)
+        finally:
+            csv.field_size_limit(limit)
+
+        assert len(transactions) == 2
+        [row_error] = parser.diagnostics.failed
+        assert row_error.line == 5
+        assert row_error.error.startswith("Unreadable CSV")
+        assert parser.diagnostics.rows_seen == 4
+
 
 class TestParserRegistry:
     """Tests for ParserRegistry."""
@@ -242,7 +657,265 @@ class TestParserRegistry:
         parser = ParserRegistry.get_parser("random content that matches nothing")
         assert parser is None
 
+    def test_detection_uses_header_window(self, ocbc_credit_file: Path) -> None:
+        """Test that markers beyond a parser's header window are ignored."""
+        content = read_file(ocbc_credit_file)
+        assert ParserRegistry.detect(content) is OCBCCreditParser
+
+        padded = "filler\n" * OCBCCreditParser.header_lines + content
+        assert ParserRegistry.detect(padded) is None
+
     def test_list_all_parsers(self) -> None:
         """Test listing all parsers."""
         parsers = ParserRegistry.get_all_parsers()
         assert len(parsers) >= 7  # At least 7 parsers registered
+
+
+class _LiteralParser(BankParser):
+    """Parser detected by a single literal marker."""
+
+    signatures: ClassVar[list[tuple[Marker, ...]]] = [("Transaction date",)]
+
+    def iter_parse(self, content: str) -> Iterator[Any]:
+        return iter([])
+
+
+class _OverlappingParser(_LiteralParser):
+    """Parser whose markers start where _LiteralParser's does."""
+
+    signatures: ClassVar[list[tuple[Marker, ...]]] = [
+        ("Transaction date,Value date",),
+        (re.compile("transaction", re.IGNORECASE),),
+    ]
+
+
+class _UnsignedParser(_LiteralParser):
+    """Parser relying on can_parse alone."""
+
+    signatures: ClassVar[list[tuple[Marker, ...]]] = []
+
+    @classmethod
+    def can_parse(cls, content: str, filepath: Path | None = None) -> bool:
+        return True
+
+
+class _BackreferenceParser(_LiteralParser):
+    """Parser whose marker refers back to one of its own groups."""
+
+    signatures: ClassVar[list[tuple[Marker, ...]]] = [(re.compile(r"(['\"])\d{4}\1"),)]
+
+
+class _VerboseParser(_LiteralParser):
+    """Parser whose marker is written as a verbose ASCII-only pattern."""
+
+    signatures: ClassVar[list[tuple[Marker, ...]]] = [
+        (re.compile(r"card \s ending \s \d{4}", re.VERBOSE | re.ASCII),),
+    ]
+
+
+class _NamedGroupParser(_LiteralParser):
+    """Parser whose marker reuses a group name of _NamedGroupTwin's."""
+
+    signatures: ClassVar[list[tuple[Marker, ...]]] = [(re.compile(r"(?P<card>\d{4})-x"),)]
+
+
+class _NamedGroupTwin(_LiteralParser):
+    """Parser with another marker using the same group name."""
+
+    signatures: ClassVar[list[tuple[Marker, ...]]] = [(re.compile(r"(?P<card>\d{4})-y"),)]
+
+
+class TestSignatureIndex:
+    """Tests for the compiled signature matcher."""
+
+    def test_matches_linear_scan(self, fixtures_dir: Path) -> None:
+        """Test that indexed detection agrees with probing every parser in turn."""
+        for path in sorted(fixtures_dir.iterdir()):
+            content = load_file(path).text
+            expected = next(
+                (
+                    p
+                    for p in ParserRegistry.get_all_parsers()
+                    if p.can_parse(head_lines(content, p.header_lines))
+                ),
+                None,
+            )
+            assert expected is not None
+            assert ParserRegistry.detect(content) is expected
+            assert ParserRegistry.candidates(content)[0] is expected
+
+    def test_overlapping_markers(self) -> None:
+        """Test that markers starting at the same position are all found."""
+        index = SignatureIndex([_LiteralParser, _OverlappingParser])
+        content = "header\nTransaction date,Value date,Description\n"
+
+        assert index.candidates(content) == [_OverlappingParser, _LiteralParser]
+        assert index.candidates("Transaction date\n") == [_LiteralParser]
+
+    def test_markers_outside_window(self) -> None:
+        """Test that a marker only counts within the parser's header lines."""
+        index = SignatureIndex([_LiteralParser])
+        window = _LiteralParser.header_lines
+        assert index.candidates("\n" * (window - 1) + "Transaction date") == [_LiteralParser]
+        assert index.candidates("\n" * window + "Transaction date") == []
+
+    def test_unsigned_parsers_follow(self) -> None:
+        """Test that parsers without signatures are kept as last candidates."""
+        index = SignatureIndex([_UnsignedParser, _LiteralParser])
+        assert index.candidates("Transaction date") == [_LiteralParser, _UnsignedParser]
+        assert index.candidates("nothing") == [_UnsignedParser]
+
+    def test_backreference_marker(self) -> None:
+        """Test that a marker with a backreference is searched for on its own."""
+        index = SignatureIndex([_LiteralParser, _BackreferenceParser])
+        assert index.candidates("id,'2026'\n") == [_BackreferenceParser]
+        assert index.candidates("id,'2026\"\nTransaction date") == [_LiteralParser]
+
+    def test_verbose_and_ascii_flags(self) -> None:
+        """Test that verbose and ASCII-only markers keep their flags in the index."""
+        index = SignatureIndex([_LiteralParser, _VerboseParser])
+        assert index.candidates("Paid by card ending 1234") == [_VerboseParser]
+        assert index.candidates("Paid by card ending ١٢٣٤") == []
+
+    def test_uncombinable_markers(self) -> None:
+        """Test that markers which cannot share one regex are still matched."""
+        index = SignatureIndex([_NamedGroupParser, _NamedGroupTwin, _LiteralParser])
+        assert index.candidates("1234-y") == [_NamedGroupTwin]
+        assert index.candidates("Transaction date\n1234-x") == [_NamedGroupParser, _LiteralParser]
+
+
+class _TwinParser(_LiteralParser):
+    """Parser with the same signatures as _LiteralParser."""
+
+
+class TestConfidence:
+    """Tests for confidence-scored detection."""
+
+    def test_fixtures_detected_without_ties(self, fixtures_dir: Path) -> None:
+        """Test that each fixture has one best parser scored as it scores itself."""
+        for path in sorted(fixtures_dir.iterdir()):
+            content = load_file(path).text
+            best, *others = ParserRegistry.rank(content)
+            window = head_lines(content, best.parser.header_lines)
+            assert best.confidence == best.parser.confidence(window)
+            assert all(other.confidence < best.confidence for other in others)
+            assert ParserRegistry.parse(content).ambiguous == []
+
+    def test_weak_hsbc_match_loses(self, ocbc_credit_file: Path) -> None:
+        """Test that an AXS payment to a card ending 3363 does not make a file HSBC."""
+        lines = ocbc_credit_file.read_text().splitlines(keepends=True)
+        lines.insert(2, "Last payment,PYMT @ AXS 3363\n")
+        content = "".join(lines)
+
+        ranked = ParserRegistry.rank(content)
+        assert [d.parser for d in ranked] == [OCBCCreditParser, HSBCRevolutionParser]
+        assert ranked[1].confidence == HSBCRevolutionParser.WEAK_CONFIDENCE
+        assert ParserRegistry.parse(content).parser == "OCBCCreditParser"
+
+    def test_more_markers_rank_first(self, isolated_registry: None) -> None:
+        """Test that the parser matching more markers wins regardless of order."""
+        ParserRegistry.clear()
+        ParserRegistry.register(_LiteralParser)
+        ParserRegistry.register(_OverlappingParser)
+
+        ranked = ParserRegistry.rank("Transaction date,Value date\n")
+        assert [d.parser for d in ranked] == [_OverlappingParser, _LiteralParser]
+        assert ranked[0].confidence > ranked[1].confidence
+        parser = ParserRegistry.get_parser("Transaction date,Value date\n")
+        assert isinstance(parser, _OverlappingParser)
+        assert parser.ambiguous == []
+
+    def test_ties_reported(self, isolated_registry: None) -> None:
+        """Test that equally confident parsers are reported alongside the one used."""
+        ParserRegistry.clear()
+        ParserRegistry.register(_LiteralParser)
+        ParserRegistry.register(_TwinParser)
+        ParserRegistry.register(_UnsignedParser)
+
+        parser = ParserRegistry.get_parser("Transaction date\n")
+        assert isinstance(parser, _LiteralParser)
+        assert parser.ambiguous == ["_TwinParser"]
+        assert collect(parser.iter_result(iter([]))).ambiguous == ["_TwinParser"]
+
+        # A can_parse without signatures is the weakest evidence
+        ranked = ParserRegistry.rank("nothing")
+        assert ranked == [Detection(_UnsignedParser, UNSIGNED_CONFIDENCE)]
+
+
+# Plugin entry for _SpecCardParser, as a third-party package would advertise it
+_PLUGIN_ENTRY = LazyParser(
+    f"{__name__}:_SpecCardParser",
+    signatures=[("Date,Description,Amount,Status",)],
+    header_lines=3,
+)
+
+
+@pytest.fixture
+def isolated_registry() -> Iterator[None]:
+    """Restore the parser registry after a test changes it."""
+    saved = (
+        ParserRegistry._parsers.copy(),
+        ParserRegistry._loaded.copy(),
+        ParserRegistry._plugins_loaded,
+    )
+    yield
+    ParserRegistry._parsers, ParserRegistry._loaded, ParserRegistry._plugins_loaded = saved
+    ParserRegistry._index = None
+
+
+class TestLazyLoading:
+    """Tests for lazy and plugin parser registration."""
+
+    def test_catalog_matches_classes(self) -> None:
+        """Test that built-in lazy entries carry their classes' signatures."""
+        for entry in BUILTIN_PARSERS:
+            parser_class = entry.load()
+            assert entry.target.endswith(":" + parser_class.__name__)
+            assert entry.signatures == parser_class.signatures
+            assert entry.header_lines == parser_class.header_lines
+
+    def test_imports_only_matching_modules(self, dbs_savings_file: Path) -> None:
+        """Test that detection imports only the module of the matching parser."""
+        code = (
+            "import sys\n"
+            "from pathlib import Path\n"
+            "from lunchsync_sg.parsers import ParserRegistry\n"
+            f"content = Path({str(dbs_savings_file)!r}).read_text()\n"
+            "print(ParserRegistry.detect(content).__name__)\n"
+            "print(sorted(m for m in sys.modules if m.startswith('lunchsync_sg.parsers.')))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, text=True, check=True
+        )
+        name, modules = result.stdout.splitlines()
+        assert name == "DBSSavingsParser"
+        assert "lunchsync_sg.parsers.dbs" in modules
+        for bank in ("citi", "hsbc", "ocbc", "uob"):
+            assert f"lunchsync_sg.parsers.{bank}" not in modules
+
+    def test_entry_point_plugins(
+        self, isolated_registry: None, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that parsers advertised through entry points are detected."""
+        plugin = EntryPoint(
+            name="test", value=f"{__name__}:_PLUGIN_ENTRY", group=ParserRegistry.PLUGIN_GROUP
+        )
+        broken = EntryPoint(
+            name="broken", value="no_such_module:Parser", group=ParserRegistry.PLUGIN_GROUP
+        )
+        monkeypatch.setattr(
+            "lunchsync_sg.parsers.base.entry_points", lambda group: [plugin, broken]
+        )
+        ParserRegistry._plugins_loaded = False
+        ParserRegistry._index = None
+
+        with pytest.warns(UserWarning, match="broken"):
+            parser = ParserRegistry.get_parser(TestParserSpec.CONTENT)
+        assert isinstance(parser, _SpecCardParser)
+
+    def test_register_replaces_lazy_entry(self, isolated_registry: None) -> None:
+        """Test that importing a lazily registered class does not register it twice."""
+        ParserRegistry.clear()
+        ParserRegistry.register_lazy(_PLUGIN_ENTRY)
+        ParserRegistry.register(_SpecCardParser)
+        assert ParserRegistry.get_all_parsers() == [_SpecCardParser]
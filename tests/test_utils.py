@@ -1,9 +1,41 @@
 """Tests for utility functions."""
 
+import bz2
+import codecs
+import gzip
+import io
+import lzma
+import tarfile
+import zipfile
+from collections.abc import Callable
 from datetime import date
 from decimal import Decimal
+from io import StringIO
+from pathlib import Path
 
-from lunchsync_sg.utils import clean_description, parse_amount, parse_date
+import pytest
+
+from lunchsync_sg.utils import (
+    DateParser,
+    MappedFile,
+    TextStream,
+    XlsxReader,
+    clean_description,
+    compression_kind,
+    decode_text,
+    decompress,
+    head_lines,
+    is_archive,
+    is_xlsx,
+    iter_archive,
+    iter_input_files,
+    load_file,
+    parse_amount,
+    parse_date,
+    read_file,
+    read_header,
+    rows_to_text,
+)
 
 
 class TestParseDate:
@@ -42,6 +74,50 @@ class TestParseDate:
         assert parse_date("32/01/2026") is None
 
 
+class TestDateParser:
+    """Tests for the per-file DateParser."""
+
+    def test_learns_format(self) -> None:
+        """Test that the first format that parses is locked in."""
+        parse = DateParser()
+        assert parse.format is None
+        assert parse("2026-01-30") == date(2026, 1, 30)
+        assert parse.format == "%Y-%m-%d"
+        assert parse("2025-12-01") == date(2025, 12, 1)
+        assert parse.format == "%Y-%m-%d"
+
+    def test_falls_back_when_format_changes(self) -> None:
+        """Test that rows in another format are still parsed and relearned."""
+        parse = DateParser()
+        assert parse("30 Jan 2026") == date(2026, 1, 30)
+        assert parse("30/01/2026") == date(2026, 1, 30)
+        assert parse.format == "%d/%m/%Y"
+
+    def test_invalid_keeps_format(self) -> None:
+        """Test that rows without a date leave the learned format alone."""
+        parse = DateParser()
+        parse("30/01/2026")
+        assert parse("") is None
+        assert parse("Total") is None
+        assert parse("32/01/2026") is None
+        assert parse.format == "%d/%m/%Y"
+
+    def test_matches_parse_date(self) -> None:
+        """Test that learning never changes what a string parses to."""
+        values = [
+            "30 May 2026",
+            "30 January 2026",
+            "1 May 2026",
+            '"30/01/2026"',
+            "30-01-2026",
+            "2026-01-30",
+            "31/02/2026",
+            "not a date",
+        ]
+        parse = DateParser()
+        assert [parse(v) for v in values] == [parse_date(v) for v in values]
+
+
 class TestParseAmount:
     """Tests for parse_amount function."""
 
@@ -113,3 +189,480 @@ class TestCleanDescription:
         """Test empty string handling."""
         assert clean_description("") == ""
         assert clean_description("   ") == ""
+
+
+class TestHeadLines:
+    """Tests for head_lines and read_header."""
+
+    def test_head_lines(self) -> None:
+        """Test taking a prefix of lines."""
+        assert head_lines("a\nb\nc\n", 2) == "a\nb"
+        assert head_lines("a\nb", 5) == "a\nb"
+        assert head_lines("a\nb", 0) == ""
+
+    def test_read_header_text(self, tmp_path: Path) -> None:
+        """Test that only the leading lines of a text file are returned."""
+        test_file = tmp_path / "big.csv"
+        test_file.write_text("header\n" + "row\n" * 1000)
+
+        assert read_header(test_file, 3) == "header\nrow\nrow"
+
+    def test_read_header_excel(self, uob_solitaire_file: Path) -> None:
+        """Test that Excel headers match the converted content."""
+        header = read_header(uob_solitaire_file, 10)
+        assert read_file(uob_solitaire_file).startswith(header)
+        assert header.count("\n") == 9
+
+    def test_read_header_xlsx(
+        self, make_xlsx: Callable[..., Path], monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that .xlsx headers come from the leading rows only."""
+        xlsx_file = make_xlsx([["Account", "123"], ["Date", "Amount"]] + [["x", 1.0]] * 100)
+        gz_file = xlsx_file.with_name("sheet.xlsx.gz")
+        gz_file.write_bytes(gzip.compress(xlsx_file.read_bytes()))
+        expected = load_file(xlsx_file).head(3)
+
+        def unexpected(*args: object) -> None:
+            raise AssertionError("workbook loaded whole")
+
+        monkeypatch.setattr("lunchsync_sg.utils.parsing.load_file", unexpected)
+        monkeypatch.setattr("lunchsync_sg.utils.parsing.load_bytes", unexpected)
+        assert read_header(xlsx_file, 3) == expected
+        assert read_header(gz_file, 3) == expected
+        assert expected.count("\n") == 2
+
+
+class TestDecodeText:
+    """Tests for single-pass encoding detection."""
+
+    def test_utf8(self) -> None:
+        """Test plain UTF-8 content."""
+        assert decode_text("CAFÉ,1.00".encode()) == ("CAFÉ,1.00", "utf-8")
+
+    def test_utf8_bom(self) -> None:
+        """Test UTF-8 content with a BOM."""
+        assert decode_text(b"\xef\xbb\xbfa,b") == ("a,b", "utf-8-sig")
+
+    def test_utf16_bom(self) -> None:
+        """Test UTF-16 content with a BOM."""
+        assert decode_text("a,b".encode("utf-16")) == ("a,b", "utf-16")
+
+    def test_cp1252_fallback(self) -> None:
+        """Test Windows-1252 content that is not valid UTF-8."""
+        assert decode_text("€5 CAFÉ".encode("cp1252")) == ("€5 CAFÉ", "cp1252")
+
+    def test_latin1_fallback(self) -> None:
+        """Test bytes undefined in Windows-1252 fall back to Latin-1."""
+        assert decode_text(b"a\x81b") == ("a\x81b", "latin-1")
+
+    def test_newlines_normalized(self) -> None:
+        """Test CRLF and CR line endings become LF."""
+        assert decode_text(b"a\r\nb\rc\n")[0] == "a\nb\nc\n"
+
+    def test_invalid_bom_content(self) -> None:
+        """Test undecodable content after a BOM raises ValueError."""
+        with pytest.raises(ValueError):
+            decode_text(b"\xff\xfe\x00")
+
+    def test_load_file_records_encoding(
+        self, ocbc_credit_file: Path, citi_rewards_file: Path, uob_solitaire_file: Path
+    ) -> None:
+        """Test that load_file reports the detected encoding."""
+        assert load_file(ocbc_credit_file).encoding == "utf-8"
+        assert load_file(citi_rewards_file).encoding == "utf-8-sig"
+        assert load_file(uob_solitaire_file).encoding is None
+        assert "\r" not in load_file(ocbc_credit_file).text
+
+
+class TestMappedFile:
+    """Tests for memory-mapped line iteration."""
+
+    def test_lines_match_read_file(self, fixtures_dir: Path) -> None:
+        """Test that mapped lines match iterating the decoded content."""
+        for csv_file in sorted(fixtures_dir.glob("*.csv")):
+            with MappedFile(csv_file) as mapped:
+                assert list(mapped.iter_lines()) == list(StringIO(read_file(csv_file)))
+
+    def test_head_matches_head_lines(self, fixtures_dir: Path) -> None:
+        """Test that head() matches head_lines on the full content."""
+        for csv_file in sorted(fixtures_dir.glob("*.csv")):
+            content = read_file(csv_file)
+            with MappedFile(csv_file) as mapped:
+                for max_lines in (0, 1, 5, 100):
+                    assert mapped.head(max_lines) == head_lines(content, max_lines)
+
+    def test_chunk_boundaries(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test CRLF pairs and multibyte characters split across chunks."""
+        monkeypatch.setattr("lunchsync_sg.utils.mapped.CHUNK_SIZE", 3)
+        test_file = tmp_path / "split.csv"
+        test_file.write_bytes("ab\r\nCAFÉ,€1\r\rx".encode())
+
+        with MappedFile(test_file) as mapped:
+            assert mapped.encoding == "utf-8"
+            assert list(mapped.iter_lines()) == ["ab\n", "CAFÉ,€1\n", "\n", "x"]
+
+    def test_cp1252(self, tmp_path: Path) -> None:
+        """Test encoding detection without a full decode."""
+        test_file = tmp_path / "win.csv"
+        test_file.write_bytes("€5 CAFÉ\n".encode("cp1252"))
+
+        with MappedFile(test_file) as mapped:
+            assert mapped.encoding == "cp1252"
+            assert list(mapped.iter_lines()) == ["€5 CAFÉ\n"]
+
+    def test_falls_forward_after_sniffed_prefix(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that a cp1252 line past the sniffed prefix switches encoding."""
+        monkeypatch.setattr("lunchsync_sg.utils.mapped.SNIFF_SIZE", 8)
+        monkeypatch.setattr("lunchsync_sg.utils.mapped.CHUNK_SIZE", 16)
+        content = "a,b\r\n" * 5 + "€5 CAFÉ\r\n" + "c,d\r\n"
+        test_file = tmp_path / "win.csv"
+        test_file.write_bytes(content.encode("cp1252"))
+
+        with MappedFile(test_file) as mapped:
+            assert mapped.encoding == "utf-8"
+            assert list(mapped.iter_lines()) == list(StringIO(read_file(test_file)))
+            assert mapped.encoding == "cp1252"
+
+    def test_undecodable_bom_file(self, tmp_path: Path) -> None:
+        """Test that a file not matching its BOM fails while reading lines."""
+        test_file = tmp_path / "bad.csv"
+        test_file.write_bytes(codecs.BOM_UTF16_LE + "a\n".encode("utf-16-le") + b"\x00\xdc")
+
+        with MappedFile(test_file) as mapped:
+            assert mapped.encoding == "utf-16"
+            with pytest.raises(ValueError, match="as utf-16"):
+                list(mapped.iter_lines())
+
+    def test_empty_file(self, tmp_path: Path) -> None:
+        """Test that empty files can be mapped."""
+        test_file = tmp_path / "empty.csv"
+        test_file.write_bytes(b"")
+
+        with MappedFile(test_file) as mapped:
+            assert mapped.size == 0
+            assert list(mapped.iter_lines()) == []
+
+    def test_missing_file(self) -> None:
+        """Test that missing files raise ValueError."""
+        with pytest.raises(ValueError):
+            MappedFile(Path("/nonexistent/file.csv"))
+
+
+class TestSpreadsheetRows:
+    """Tests for typed spreadsheet rows."""
+
+    def test_rows_match_text(self, uob_solitaire_file: Path) -> None:
+        """Test that Excel rows hold the cell values, not CSV-escaped text."""
+        content = load_file(uob_solitaire_file)
+        assert content.rows is not None
+
+        first_tx = content.rows[10]
+        assert first_tx[1] == "31 Jan 2026"  # UOB exports dates as text cells
+        assert "\n" in str(first_tx[2])
+        assert first_tx[-1] == "28.38"
+
+    def test_text_is_built_lazily(self, uob_solitaire_file: Path) -> None:
+        """Test that head() does not need the full CSV conversion."""
+        content = load_file(uob_solitaire_file)
+        header = content.head(10)
+        assert content._text is None
+        assert content.text.startswith(header)
+        assert header == head_lines(content.text, 10)
+
+    def test_rows_to_text(self) -> None:
+        """Test CSV conversion of typed rows."""
+        rows = [["A, B", 'say "hi"', 1.5, date(2026, 1, 30)], ["", "x"]]
+        assert rows_to_text(rows) == '"A, B","say ""hi""",1.5,30 Jan 2026\n,x'
+
+
+class TestXlsxReader:
+    """Tests for the streaming .xlsx reader."""
+
+    def test_matches_xls_rows(
+        self, uob_solitaire_file: Path, make_xlsx: Callable[..., Path]
+    ) -> None:
+        """Test that an .xlsx copy of an .xls statement yields the same rows."""
+        rows = load_file(uob_solitaire_file).rows
+        assert rows is not None
+        xlsx_file = make_xlsx(rows)
+
+        with XlsxReader(xlsx_file) as reader:
+            assert list(reader.iter_rows()) == rows
+            assert reader.head_rows(3) == rows[:3]
+
+    def test_typed_cells(self, make_xlsx: Callable[..., Path]) -> None:
+        """Test dates, numbers and padding of sparse rows."""
+        xlsx_file = make_xlsx(
+            [["Date", "Amount", "Note"], [date(2026, 1, 30), -12.5], [], ["", "", "x"]]
+        )
+
+        with XlsxReader(xlsx_file) as reader:
+            assert list(reader.iter_rows()) == [
+                ["Date", "Amount", "Note"],
+                [date(2026, 1, 30), -12.5, ""],
+                ["", "", ""],
+                ["", "", "x"],
+            ]
+
+    def test_date1904(self, make_xlsx: Callable[..., Path]) -> None:
+        """Test workbooks using the 1904 date system."""
+        xlsx_file = make_xlsx([[date(2026, 1, 30)]], date1904=True)
+
+        with XlsxReader(xlsx_file) as reader:
+            assert list(reader.iter_rows()) == [[date(2026, 1, 30)]]
+
+    def test_load_file(self, make_xlsx: Callable[..., Path]) -> None:
+        """Test that load_file reads .xlsx files, even with an .xls name."""
+        xlsx_file = make_xlsx([["a", 1.5]], name="misnamed.xls")
+
+        assert is_xlsx(xlsx_file)
+        assert load_file(xlsx_file).text == "a,1.5"
+
+    def test_invalid_file(self, tmp_path: Path) -> None:
+        """Test that broken workbooks raise ValueError."""
+        bad_file = tmp_path / "bad.xlsx"
+        bad_file.write_bytes(b"PK\x03\x04 not really a zip")
+
+        with pytest.raises(ValueError):
+            load_file(bad_file)
+
+    def test_damaged_sheet(self, make_xlsx: Callable[..., Path], tmp_path: Path) -> None:
+        """Test that a missing shared string or corrupt sheet stream raises ValueError."""
+        xlsx_file = make_xlsx([["Date", "Amount"]] + [["x", 1.0]] * 200)
+        with zipfile.ZipFile(xlsx_file) as zf:
+            parts = {name: zf.read(name) for name in zf.namelist()}
+
+        missing = tmp_path / "missing.xlsx"
+        with zipfile.ZipFile(missing, "w") as zf:
+            for name, data in parts.items():
+                zf.writestr(name, data.replace(b"<v>1</v>", b"<v>9999</v>"))
+        corrupt = tmp_path / "corrupt.xlsx"
+        with zipfile.ZipFile(corrupt, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, data in parts.items():
+                zf.writestr(name, data)
+        raw = bytearray(corrupt.read_bytes())
+        start = raw.index(b"xl/worksheets/sheet1.xml") + len("xl/worksheets/sheet1.xml")
+        raw[start + 20 : start + 60] = bytes(b ^ 0xFF for b in raw[start + 20 : start + 60])
+        corrupt.write_bytes(bytes(raw))
+
+        for path in (missing, corrupt):
+            with XlsxReader(path) as reader:
+                with pytest.raises(ValueError, match="Could not read Excel file"):
+                    reader.head_rows(10)
+                with pytest.raises(ValueError, match="Could not read Excel file"):
+                    list(reader.iter_rows())
+
+
+class TestIterInputFiles:
+    """Tests for iter_input_files."""
+
+    @pytest.fixture
+    def archive(self, tmp_path: Path) -> Path:
+        """Build an archive nested by year/bank/month."""
+        for relative in [
+            "top.csv",
+            "notes.txt",
+            "2024/dbs/01/DBS.CSV",
+            "2024/uob/01/uob.xls",
+            "2025/ocbc/02/ocbc.xlsx",
+            "2025/ocbc/02/readme.md",
+        ]:
+            path = tmp_path / relative
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("x")
+        return tmp_path
+
+    def names(self, paths: list[Path]) -> list[str]:
+        """Return file names in discovery order."""
+        return [p.name for p in paths]
+
+    def test_top_level_only(self, archive: Path) -> None:
+        """Test the default does not recurse."""
+        assert self.names(list(iter_input_files([archive]))) == ["top.csv"]
+
+    def test_recursive(self, archive: Path) -> None:
+        """Test unlimited depth finds every statement once, any case."""
+        files = list(iter_input_files([archive], max_depth=None))
+        assert self.names(files) == ["DBS.CSV", "uob.xls", "ocbc.xlsx", "top.csv"]
+
+    def test_max_depth(self, archive: Path) -> None:
+        """Test max_depth limits how far the walk descends."""
+        assert list(iter_input_files([archive], max_depth=2)) == [archive / "top.csv"]
+        assert len(list(iter_input_files([archive], max_depth=3))) == 4
+
+    def test_include_exclude(self, archive: Path) -> None:
+        """Test globs filter files and prune directories."""
+        included = iter_input_files([archive], include=["2024/*"], max_depth=None)
+        assert self.names(list(included)) == ["DBS.CSV", "uob.xls"]
+
+        excluded = iter_input_files([archive], exclude=["2024", "*.xlsx"], max_depth=None)
+        assert self.names(list(excluded)) == ["top.csv"]
+
+    def test_overlapping_inputs_yield_once(self, archive: Path) -> None:
+        """Test a file reached through several inputs is yielded once."""
+        files = list(iter_input_files([archive / "top.csv", archive, archive]))
+        assert files == [archive / "top.csv"]
+
+    def test_explicit_files_and_missing_paths(self, archive: Path) -> None:
+        """Test explicit files bypass the extension filter and missing paths are skipped."""
+        files = list(iter_input_files([archive / "notes.txt", archive / "missing.csv"]))
+        assert files == [archive / "notes.txt"]
+
+    def test_streams_lazily(self, archive: Path) -> None:
+        """Test the first path is available before the walk is complete."""
+        files = iter_input_files([archive], max_depth=None)
+        assert next(files) == archive / "2024/dbs/01/DBS.CSV"
+
+
+class TestArchives:
+    """Tests for reading exports from zip and tar archives."""
+
+    def test_zip_members(self, tmp_path: Path) -> None:
+        """Test statement members are yielded and other files are skipped."""
+        path = tmp_path / "bundle.zip"
+        with zipfile.ZipFile(path, "w") as zf:
+            zf.writestr("june/ocbc.csv", "a,b\n")
+            zf.writestr("june/UOB.XLS", b"\xd0\xcf")
+            zf.writestr("readme.txt", "ignore me")
+            zf.writestr("__MACOSX/june/._ocbc.csv", "resource fork")
+
+        assert is_archive(path)
+        members = list(iter_archive(path, (".csv", ".xls")))
+        assert members == [("june/ocbc.csv", b"a,b\n"), ("june/UOB.XLS", b"\xd0\xcf")]
+
+    def test_tar_gz_members(self, tmp_path: Path) -> None:
+        """Test compressed tar archives are streamed member by member."""
+        source = tmp_path / "dbs.csv"
+        source.write_text("x,y\n")
+        path = tmp_path / "bundle.tar.gz"
+        with tarfile.open(path, "w:gz") as tf:
+            tf.add(source, arcname="2025/dbs.csv")
+
+        assert is_archive(path)
+        assert list(iter_archive(path, (".csv",))) == [("2025/dbs.csv", b"x,y\n")]
+
+    def test_xlsx_is_not_an_archive(
+        self, make_xlsx: Callable[..., Path], fixtures_dir: Path
+    ) -> None:
+        """Test workbooks and plain exports are not mistaken for archives."""
+        assert not is_archive(make_xlsx([["a", "b"]]))
+        assert not is_archive(fixtures_dir / "ocbc_credit_1.csv")
+        assert not is_archive(fixtures_dir / "uob_solitaire.xls")
+
+    def test_corrupt_archive(self, tmp_path: Path) -> None:
+        """Test an unreadable archive raises ValueError."""
+        path = tmp_path / "bundle.tar.gz"
+        path.write_bytes(b"\x1f\x8b not really gzip")
+        with pytest.raises(ValueError):
+            list(iter_archive(path, (".csv",)))
+
+
+class TestTextStream:
+    """Tests for TextStream."""
+
+    def test_lines_match_decode_text(self, fixtures_dir: Path) -> None:
+        """Test streamed lines join to the same text as a whole-file decode."""
+        for path in sorted(fixtures_dir.glob("*.csv")):
+            data = path.read_bytes()
+            stream = TextStream(io.BytesIO(data))
+            header = stream.head(10)
+            text, encoding = decode_text(data)
+            assert header == head_lines(text, 10)
+            assert "".join(stream.iter_lines()) == text
+            assert stream.encoding == encoding
+
+    def test_head_reads_only_leading_lines(self) -> None:
+        """Test detection does not consume the whole stream."""
+        source = io.BytesIO(b"".join(b"line %d\r\n" % i for i in range(1000)))
+        stream = TextStream(source)
+        assert stream.head(3) == "line 0\nline 1\nline 2"
+        assert source.tell() < 100
+        lines = list(stream.iter_lines())
+        assert len(lines) == 1000
+        assert lines[3] == "line 3\n"
+
+    def test_falls_back_after_invalid_utf8(self) -> None:
+        """Test a line that is not UTF-8 switches to the next encoding."""
+        stream = TextStream(io.BytesIO(b"caf\xc3\xa9\nna\xefve\n"))
+        assert list(stream.iter_lines()) == ["caf\u00e9\n", "na\u00efve\n"]
+        assert stream.encoding == "cp1252"
+
+    def test_utf16_bom(self) -> None:
+        """Test UTF-16 input is decoded despite not splitting on newline bytes."""
+        data = "a,b\r\nc,d\r\n".encode("utf-16")
+        assert list(TextStream(io.BytesIO(data)).iter_lines()) == ["a,b\n", "c,d\n"]
+
+    def test_excel_is_read_whole(self, fixtures_dir: Path) -> None:
+        """Test spreadsheet magic bytes are sniffed and the bytes returned intact."""
+        data = (fixtures_dir / "uob_solitaire.xls").read_bytes()
+        stream = TextStream(io.BytesIO(data))
+        assert stream.excel_kind == "xls"
+        assert stream.read_bytes() == data
+
+
+class TestCompression:
+    """Tests for transparent decompression."""
+
+    @pytest.mark.parametrize(
+        ("suffix", "compress"),
+        [(".gz", gzip.compress), (".bz2", bz2.compress), (".xz", lzma.compress)],
+    )
+    def test_compressed_matches_plain(
+        self,
+        fixtures_dir: Path,
+        tmp_path: Path,
+        suffix: str,
+        compress: Callable[[bytes], bytes],
+    ) -> None:
+        """Test compressed text and Excel files load like the originals."""
+        for name in ["dbs_savings.csv", "uob_solitaire.xls"]:
+            source = fixtures_dir / name
+            path = tmp_path / f"{name}{suffix}"
+            path.write_bytes(compress(source.read_bytes()))
+
+            assert compression_kind(path) is not None
+            assert load_file(path).text == load_file(source).text
+            assert read_header(path, 5) == read_header(source, 5)
+
+    def test_plain_files_are_not_compressed(self, fixtures_dir: Path) -> None:
+        """Test exports and text that merely starts like a magic number pass through."""
+        assert compression_kind(fixtures_dir / "ocbc_credit_1.csv") is None
+        assert decompress(b"BZh,Amount\n", Path("x.csv")) == b"BZh,Amount\n"
+
+    def test_corrupt_data(self, tmp_path: Path) -> None:
+        """Test corrupt compressed data raises ValueError."""
+        path = tmp_path / "broken.csv.gz"
+        path.write_bytes(b"\x1f\x8b\x08\x00garbage")
+        with pytest.raises(ValueError):
+            load_file(path)
+        with pytest.raises(ValueError):
+            decompress(path.read_bytes(), path)
+
+    def test_corrupt_body(self, fixtures_dir: Path, tmp_path: Path) -> None:
+        """Test a valid gzip header followed by damaged deflate data raises ValueError."""
+        data = gzip.compress((fixtures_dir / "dbs_savings.csv").read_bytes())
+        path = tmp_path / "broken.csv.gz"
+        path.write_bytes(data[:20] + bytes(b ^ 0xFF for b in data[20:60]) + data[60:])
+        with pytest.raises(ValueError, match="decompress"):
+            load_file(path)
+        with pytest.raises(ValueError, match="decompress"):
+            decompress(path.read_bytes(), path)
+
+    def test_zstd(self, fixtures_dir: Path, tmp_path: Path) -> None:
+        """Test .zst files load, or fail clearly without the zstandard package."""
+        data = (fixtures_dir / "dbs_savings.csv").read_bytes()
+        path = tmp_path / "dbs_savings.csv.zst"
+        try:
+            import zstandard
+        except ImportError:
+            path.write_bytes(b"\x28\xb5\x2f\xfd" + b"\x00" * 8)
+            with pytest.raises(ValueError, match="zstandard is required"):
+                load_file(path)
+            return
+
+        path.write_bytes(zstandard.ZstdCompressor().compress(data))
+        assert load_file(path).text == load_file(fixtures_dir / "dbs_savings.csv").text